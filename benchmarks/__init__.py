@@ -0,0 +1,3 @@
+# INÍCIO DO ARQUIVO benchmarks/__init__.py
+"""Benchmarks dos caminhos críticos do engine (python -m benchmarks --help)."""
+# FIM DO ARQUIVO benchmarks/__init__.py
\ No newline at end of file
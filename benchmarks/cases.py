@@ -0,0 +1,158 @@
+# INÍCIO DO ARQUIVO benchmarks/cases.py
+"""Casos medidos pelos benchmarks: cada um prepara seus dados e devolve a função cronometrada.
+
+O preparo (`setup(ctx)`) fica fora da medição. `ctx` guarda o histórico sintético
+('store', 'df', 'masks') e recursos compartilhados entre casos, como o servidor local da API.
+"""
+import tempfile
+
+import numpy as np
+
+from engine.core import masks_to_draws
+from engine.stats import frequency_counts
+
+PARAMS_BACKTEST = {'top_n_freq': 18, 'top_n_atraso': 18}
+ESTRATEGIAS_BACKTEST = ["Frequência", "Atraso"]
+CONCURSOS_FALTANDO = 50  # concursos buscados um a um na sincronização incremental
+
+# --- ESTRATÉGIAS ---
+def _strategy_case(func_name, **kwargs):
+    def setup(ctx):
+        from engine import strategies
+
+        func, df = getattr(strategies, func_name), ctx['df']
+        return lambda: func(df, **kwargs)
+    return setup
+
+# --- GERAÇÃO DE JOGOS E BACKTEST ---
+def setup_gerar_jogos(ctx):
+    """10 mil jogos de um pool de 20 dezenas, como `utils.generate_games` (sem as mensagens na tela)."""
+    from engine.backtest import generate_game_masks
+    from engine.strategies import pool_frequencia
+
+    pool = pool_frequencia(frequency_counts(ctx['df']), top_n=20)
+    return lambda: masks_to_draws(generate_game_masks(pool, 10_000, rng=np.random.default_rng(0))).tolist()
+
+def setup_backtest_walk_forward(ctx):
+    """Laço das páginas Backtest/Comparador: 200 concursos, 50 jogos por concurso."""
+    from engine.backtest import backtest_history
+
+    df = ctx['df']
+    return lambda: backtest_history(df, ESTRATEGIAS_BACKTEST, PARAMS_BACKTEST, 50, 200, rng=np.random.default_rng(0))
+
+def setup_backtest_varredura(ctx):
+    """Varredura de parâmetros em 2 processos (a memória medida é só a do processo principal)."""
+    from engine.backtest import build_sweep_grid, run_parameter_sweep
+
+    configs = build_sweep_grid([ESTRATEGIAS_BACKTEST], {'top_n_freq': range(16, 20), 'top_n_atraso': range(16, 20)})
+    masks = ctx['masks']
+    return lambda: run_parameter_sweep(masks, configs, 20, 100, seed=0, max_workers=2)
+
+# --- MONTE CARLO ---
+def setup_monte_carlo_simulacao(ctx):
+    from engine.montecarlo import hypergeometric_hit_rates, simulate_prize_histogram
+
+    hit_rates = hypergeometric_hit_rates()
+    return lambda: simulate_prize_histogram(hit_rates, 100_000, 50, rng=np.random.default_rng(0))
+
+def setup_monte_carlo_exato(ctx):
+    from engine.montecarlo import exact_prize_distribution, hypergeometric_hit_rates
+
+    hit_rates = hypergeometric_hit_rates()
+    return lambda: exact_prize_distribution(hit_rates, 50)
+
+def setup_monte_carlo_exato_faixas_zeradas(ctx):
+    # Faixas de taxa zero com prêmio alto não podem ir para a grade densa (antes: k=200 não terminava)
+    from engine.montecarlo import exact_prize_distribution
+
+    hit_rates = {11: 0.05, 12: 0.01, 13: 0.002, 14: 0.0, 15: 0.0}
+    return lambda: exact_prize_distribution(hit_rates, 200)
+
+# --- ANÁLISES ---
+def _analysis_case(func_name):
+    def setup(ctx):
+        from engine import analysis
+
+        func, df = getattr(analysis, func_name), ctx['df']
+        return lambda: func(df)
+    return setup
+
+# --- CARGA DE DADOS (API SUBSTITUÍDA PELO SERVIDOR LOCAL) ---
+def _stub_api(ctx):
+    """Sobe (uma vez por execução) o servidor local com o histórico sintético e aponta o engine para ele."""
+    if 'servidor' not in ctx:
+        from benchmarks.synthetic import store_to_results
+        from engine import data
+        from tools.stub_api import start_stub_server
+
+        ctx['servidor'], _, data.API_URL = start_stub_server(store_to_results(ctx['store']))
+    return ctx['servidor']
+
+def setup_carga_sync_completo(ctx):
+    """Primeira execução: histórico local vazio, download completo em uma requisição."""
+    from engine.data import sync_history_store
+
+    _stub_api(ctx)
+
+    def run():
+        with tempfile.TemporaryDirectory() as data_dir:
+            return sync_history_store(data_dir)
+    return run
+
+def setup_carga_sync_incremental(ctx):
+    """Sincronização do dia a dia: faltam os últimos concursos, buscados em paralelo."""
+    from engine.data import save_history_store, sync_history_store
+
+    _stub_api(ctx)
+    partial = {name: np.asarray(array[:-CONCURSOS_FALTANDO]) for name, array in ctx['store'].items()}
+
+    def run():
+        with tempfile.TemporaryDirectory() as data_dir:
+            save_history_store(partial, data_dir)
+            return sync_history_store(data_dir, bulk_threshold=None)
+    return run
+
+def setup_carga_historico_local(ctx):
+    """Abertura offline: .npy mapeados em memória -> DataFrame -> Historico."""
+    from engine.data import load_history, save_history_store
+
+    ctx.setdefault('diretorios', []).append(tempfile.TemporaryDirectory())
+    data_dir = ctx['diretorios'][-1].name
+    save_history_store(ctx['store'], data_dir)
+    return lambda: load_history(data_dir, sync=False)
+
+# Nome do caso -> preparo(ctx) que devolve a função cronometrada
+CASOS = {
+    'estrategia_frequencia': _strategy_case('estrategia_frequencia'),
+    'estrategia_atraso': _strategy_case('estrategia_atraso'),
+    'estrategia_finais': _strategy_case('estrategia_finais'),
+    'estrategia_primos': _strategy_case('estrategia_primos'),
+    'estrategia_fibonacci': _strategy_case('estrategia_fibonacci'),
+    'estrategia_linhas': _strategy_case('estrategia_linhas_colunas', mode='row'),
+    'estrategia_colunas': _strategy_case('estrategia_linhas_colunas', mode='col'),
+    'estrategia_alpha_envolve': _strategy_case('estrategia_alpha_envolve'),
+    'gerar_jogos': setup_gerar_jogos,
+    'backtest_walk_forward': setup_backtest_walk_forward,
+    'backtest_varredura': setup_backtest_varredura,
+    'monte_carlo_simulacao': setup_monte_carlo_simulacao,
+    'monte_carlo_exato': setup_monte_carlo_exato,
+    'monte_carlo_exato_faixas_zeradas': setup_monte_carlo_exato_faixas_zeradas,
+    'analise_pares': _analysis_case('analyze_pairs'),
+    'analise_trincas': _analysis_case('analyze_triplets'),
+    'analise_quadras': _analysis_case('analyze_quads'),
+    'carga_sync_completo': setup_carga_sync_completo,
+    'carga_sync_incremental': setup_carga_sync_incremental,
+    'carga_historico_local': setup_carga_historico_local,
+}
+
+# Casos cujo tempo depende da quantidade de CPUs (a referência, de um só núcleo, não compensa isso)
+CASOS_PARALELOS = {'backtest_varredura'}
+
+def release(ctx):
+    """Encerra o servidor local e apaga os diretórios temporários criados pelos casos."""
+    if 'servidor' in ctx:
+        ctx.pop('servidor').shutdown()
+    for directory in ctx.pop('diretorios', []):
+        directory.cleanup()
+
+# FIM DO ARQUIVO benchmarks/cases.py
\ No newline at end of file
@@ -0,0 +1,182 @@
+# INÍCIO DO ARQUIVO benchmarks/run.py
+"""Executa os benchmarks, grava o resultado em JSON e compara com a linha de base.
+
+Uso (na raiz do repositório):
+    python -m benchmarks                              # 3.500 concursos, compara com benchmarks/baseline.json
+    python -m benchmarks --contests 1000000 --cases 'estrategia_|carga_'
+    python -m benchmarks --output resultado.json --save-baseline benchmarks/baseline.json
+
+Cada caso é cronometrado ao menos `--repeat` vezes (vale o menor tempo) e executado mais uma vez sob
+`tracemalloc` para o pico de memória. Os tempos também são registrados em múltiplos de uma carga
+de referência (só numpy) medida na mesma execução; é esse tempo relativo, e não o absoluto, que
+a comparação usa, então a linha de base vale em máquinas de velocidades diferentes. Sai com
+código 1 se algum caso piorar mais que `--threshold` em relação à linha de base de mesmo
+tamanho de histórico.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# Diferenças abaixo destes pisos são ruído de medição, não regressão
+MIN_DELTA_SECONDS = 0.005
+MIN_DELTA_MB = 1.0
+# Casos rápidos repetem até somar este tempo (ou MAX_REPEAT execuções), para estabilizar o mínimo
+MIN_CASE_SECONDS = 0.5
+MAX_REPEAT = 50
+# Tamanho da carga de referência (ordenação e contagem de 2M inteiros, sem o engine)
+REFERENCE_SIZE = 2_000_000
+
+
+def build_context(num_contests, seed):
+    """Histórico sintético nos três formatos usados pelos casos (armazenamento, DataFrame, máscaras)."""
+    from benchmarks.synthetic import synthetic_store
+    from engine.data import store_to_dataframe
+
+    store = synthetic_store(num_contests, seed)
+    return {'store': store, 'df': store_to_dataframe(store), 'masks': store['mascaras']}
+
+
+def measure(run, repeat):
+    """Retorna (menor tempo, mediana dos tempos, pico de memória em MB) de `run`."""
+    timings = []
+    while len(timings) < repeat or (sum(timings) < MIN_CASE_SECONDS and len(timings) < MAX_REPEAT):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), float(np.median(timings)), peak / (1024 * 1024)
+
+
+def reference_kernel():
+    """Carga fixa que mede a velocidade da máquina: não depende do engine, então não muda com ele."""
+    values = np.random.default_rng(0).integers(0, 1 << 25, size=REFERENCE_SIZE, dtype=np.uint32)
+    return lambda: (np.sort(values), np.bincount(values & 0xFFFF, minlength=1 << 16))
+
+
+def run_cases(names, num_contests, seed, repeat):
+    """Mede a referência e os casos: retorna (tempo da referência, resultados por caso)."""
+    from benchmarks.cases import CASOS, release
+
+    # Referência medida antes e depois dos casos (vale a menor), para não depender de um instante ruidoso
+    kernel = reference_kernel()
+    reference = measure(kernel, repeat)[0]
+    ctx = build_context(num_contests, seed)
+    results = {}
+    try:
+        for name in names:
+            run = CASOS[name](ctx)
+            seconds, median, peak_mb = measure(run, repeat)
+            results[name] = {'segundos': round(seconds, 6), 'segundos_mediana': round(median, 6), 'pico_mb': round(peak_mb, 3)}
+    finally:
+        release(ctx)
+    reference = min(reference, measure(kernel, repeat)[0])
+    print(f"{'(referência)':<32} {reference * 1000:10.1f} ms", file=sys.stderr)
+    for name, result in results.items():
+        result['relativo'] = round(result['segundos'] / reference, 6)
+        print(f"{name:<32} {result['segundos'] * 1000:10.1f} ms {result['relativo']:8.3f}x {result['pico_mb']:10.1f} MB",
+              file=sys.stderr)
+    return round(reference, 6), results
+
+
+def compare_with_baseline(report, baseline, threshold):
+    """Lista de regressões (caso, métrica, linha de base, atual) acima do limite relativo.
+
+    Tempos são comparados em múltiplos da referência. Casos que usam vários processos só têm
+    o tempo comparado se a linha de base veio de uma máquina com a mesma quantidade de CPUs.
+    """
+    from benchmarks.cases import CASOS_PARALELOS
+
+    if baseline['meta']['concursos'] != report['meta']['concursos']:
+        print(f"Linha de base com {baseline['meta']['concursos']} concursos; comparação ignorada.", file=sys.stderr)
+        return []
+    if 'referencia_segundos' not in baseline['meta']:
+        print("Linha de base sem tempo de referência (formato antigo); comparação ignorada.", file=sys.stderr)
+        return []
+    same_cpus = baseline['meta'].get('cpus') == report['meta']['cpus']
+    if not same_cpus:
+        print(f"Linha de base com {baseline['meta'].get('cpus')} CPUs; tempos de {', '.join(sorted(CASOS_PARALELOS))} "
+              "não são comparados.", file=sys.stderr)
+    # O piso de ruído em segundos vira piso relativo pela referência desta execução
+    time_floor = MIN_DELTA_SECONDS / report['meta']['referencia_segundos']
+    regressions = []
+    for name, current in report['casos'].items():
+        base = baseline['casos'].get(name)
+        if base is None:
+            continue
+        metrics = [('pico_mb', MIN_DELTA_MB)]
+        if same_cpus or name not in CASOS_PARALELOS:
+            metrics.insert(0, ('relativo', time_floor))
+        for metric, floor in metrics:
+            if current[metric] > base[metric] * (1 + threshold) and current[metric] - base[metric] > floor:
+                regressions.append((name, metric, base[metric], current[metric]))
+    return regressions
+
+
+def build_parser():
+    from benchmarks.cases import CASOS
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmarks dos caminhos críticos do engine.")
+    parser.add_argument('--contests', type=int, default=3500, help="Tamanho do histórico sintético (até 1.000.000).")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="Mínimo de execuções cronometradas por caso.")
+    parser.add_argument('--cases', default=None, help=f"Expressão regular dos casos a executar ({len(CASOS)} no total).")
+    parser.add_argument('--output', default=None, help="Arquivo JSON do resultado (padrão: saída padrão).")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Linha de base para comparação.")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Piora relativa tolerada (0.25 = 25%%).")
+    parser.add_argument('--save-baseline', default=None, metavar='ARQUIVO', help="Grava o resultado como nova linha de base.")
+    return parser
+
+
+def main(argv=None):
+    from benchmarks.cases import CASOS
+
+    args = build_parser().parse_args(argv)
+    names = [name for name in CASOS if args.cases is None or re.search(args.cases, name)]
+    if not names:
+        raise SystemExit(f"Nenhum caso corresponde a {args.cases!r}.")
+
+    reference, results = run_cases(names, args.contests, args.seed, args.repeat)
+    report = {
+        'meta': {
+            'concursos': args.contests, 'seed': args.seed, 'repeticoes': args.repeat,
+            'python': platform.python_version(), 'numpy': np.__version__, 'plataforma': platform.platform(),
+            'cpus': os.cpu_count(), 'referencia_segundos': reference,
+        },
+        'casos': results,
+    }
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload)
+    else:
+        print(payload)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"Sem linha de base em {args.baseline}; comparação ignorada.", file=sys.stderr)
+        return
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(report, baseline, args.threshold)
+    for name, metric, base, current in regressions:
+        print(f"REGRESSÃO {name}: {metric} {base} -> {current} (+{(current / base - 1) * 100:.0f}%)", file=sys.stderr)
+    if regressions:
+        raise SystemExit(1)
+
+# FIM DO ARQUIVO benchmarks/run.py
\ No newline at end of file
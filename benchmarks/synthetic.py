@@ -0,0 +1,42 @@
+# INÍCIO DO ARQUIVO benchmarks/synthetic.py
+"""Histórico sintético determinístico para os benchmarks (de ~3,5 mil até 1 milhão de concursos)."""
+import numpy as np
+
+from engine.core import NUM_DEZENAS, DEZENAS_POR_JOGO, BITS_DEZENAS
+
+CHUNK_CONTESTS = 100_000  # concursos gerados por bloco (memória constante para 1M)
+# Sorteios a cada 3 dias; após ~80 anos as datas recomeçam, para caber no datetime64[ns] do pandas
+DATAS_CICLO = 10_000
+
+
+def synthetic_store(num_contests, seed=0):
+    """Histórico no formato do armazenamento local: concursos, datas e máscaras uint32.
+
+    Cada sorteio é uniforme (15 de 25). A mesma semente gera sempre o mesmo histórico,
+    e os blocos usam sementes derivadas, então o prefixo não depende do tamanho pedido.
+    """
+    masks = np.empty(num_contests, dtype=np.uint32)
+    seeds = np.random.SeedSequence(seed).spawn(max(1, -(-num_contests // CHUNK_CONTESTS)))
+    for block, block_seed in zip(range(0, num_contests, CHUNK_CONTESTS), seeds):
+        size = min(CHUNK_CONTESTS, num_contests - block)
+        rng = np.random.default_rng(block_seed)
+        chosen = np.argsort(rng.random((size, NUM_DEZENAS)), axis=1)[:, :DEZENAS_POR_JOGO]
+        masks[block:block + size] = np.bitwise_or.reduce(BITS_DEZENAS[chosen], axis=1)
+    return {
+        'concursos': np.arange(1, num_contests + 1, dtype=np.int32),
+        'datas': np.datetime64('2003-09-29', 'D') + (np.arange(num_contests) % DATAS_CICLO) * 3,
+        'mascaras': masks,
+    }
+
+
+def store_to_results(store):
+    """Converte o histórico para a lista JSON da API (usada pelo servidor local, tools/stub_api.py)."""
+    from engine.core import masks_to_draws
+
+    datas = np.datetime_as_string(store['datas'], unit='D')
+    return [
+        {'loteria': 'lotofacil', 'concurso': int(concurso), 'data': f'{data[8:10]}/{data[5:7]}/{data[:4]}', 'dezenas': [f'{num:02d}' for num in draw]}
+        for concurso, data, draw in zip(store['concursos'].tolist(), datas.tolist(), masks_to_draws(store['mascaras']).tolist())
+    ]
+
+# FIM DO ARQUIVO benchmarks/synthetic.py
\ No newline at end of file
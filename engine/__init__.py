@@ -0,0 +1,88 @@
+# INÍCIO DO ARQUIVO engine/__init__.py
+"""Motor de cálculo da Lotofácil, independente do Streamlit.
+
+Pode ser usado em páginas, scripts, tarefas agendadas e processos de trabalho:
+
+    from engine import load_history, backtest_history
+    python -m engine backtest --estrategias Frequência --jogos 10 --concursos 100
+
+Os submódulos são importados sob demanda (PEP 562): `import engine` não carrega numpy,
+pandas nem requests até que um nome seja usado.
+"""
+import importlib
+
+_SUBMODULES = {
+    'core': (
+        'BITS_DEZENAS', 'BOLAS', 'CUSTO_JOGO', 'DEZENAS_POR_JOGO', 'NUM_DEZENAS', 'PREMIOS',
+        'SCORE_CHUNK_CELLS', 'as_draw_masks', 'count_hits', 'count_numbers', 'draws_to_masks',
+        'get_draw_masks', 'get_draws_array', 'get_incidence_matrix', 'mask_to_numbers', 'masks_to_draws',
+        'masks_to_incidence', 'numbers_to_mask', 'popcount', 'prize_from_histogram', 'rank_combinations',
+        'score_histogram', 'score_hits', 'score_tiers_per_game', 'unrank_combinations',
+    ),
+    'data': (
+        'API_URL', 'DATA_DIR', 'LATEST_TIMEOUT', 'STORE_FILES', 'SYNC_BACKOFF', 'SYNC_BULK_THRESHOLD', 'SYNC_RETRIES',
+        'SYNC_TIMEOUT', 'SYNC_WORKERS', 'Historico', 'fetch_concursos', 'fetch_latest_concurso',
+        'load_history', 'load_history_store', 'make_session', 'merge_stores', 'missing_concursos',
+        'results_to_store', 'save_history_store', 'store_to_dataframe', 'sync_history_store',
+    ),
+    'stats': (
+        'GRUPOS_FREQUENCIA', 'build_delay_table', 'build_frequency_index', 'delays_at', 'frequency_counts',
+        'get_all_numbers', 'get_delays', 'summarize_counts', 'window_counts',
+    ),
+    'strategies': (
+        'ESTRATEGIAS', 'FIBONACCI', 'PRIMOS', 'build_pool', 'estrategia_alpha_envolve', 'estrategia_atraso',
+        'estrategia_fibonacci', 'estrategia_finais', 'estrategia_frequencia', 'estrategia_linhas_colunas',
+        'estrategia_primos', 'pool_alpha_envolve', 'pool_atraso', 'pool_fibonacci', 'pool_finais',
+        'pool_frequencia', 'pool_linhas_colunas', 'pool_primos',
+    ),
+    'backtest': (
+        'backtest_history', 'build_optimizer_candidates', 'build_sweep_grid', 'common_random_games', 'compare_strategies',
+        'count_distinct_games', 'expected_value_backtest', 'pool_hit_table',
+        'generate_game_masks', 'optimizer_windows', 'run_parameter_sweep', 'stored_walk_forward_pools', 'successive_halving',
+        'walk_forward', 'walk_forward_states',
+    ),
+    'montecarlo': (
+        'EXACT_GRID_LIMIT', 'EXACT_TAIL_TOL', 'MC_CHUNK_SCENARIOS', 'exact_prize_distribution',
+        'histogram_quantile', 'hit_rates_from_histogram', 'hypergeometric_hit_rates',
+        'simulate_prize_histogram', 'summarize_profit_distribution',
+    ),
+    'tickets': (
+        'parse_tickets', 'verify_tickets',
+    ),
+    'analysis': (
+        'COOCORRENCIA_CHUNK', 'MINER_MEMORY_CAP', 'analyze_number_trend', 'analyze_pairs', 'analyze_positional_frequencies',
+        'analyze_quads', 'analyze_sum_and_range', 'analyze_triplets', 'combination_counts', 'mine_top_tuples',
+        'pair_cooccurrence', 'top_combinations',
+    ),
+    'alerts': (
+        'advance_alert_index', 'alert_condition', 'alert_features', 'build_alert_index', 'delete_stored_alerts',
+        'evaluate_alerts', 'load_alert_registry', 'new_alert_registry', 'store_alert', 'update_alert_index',
+    ),
+    'poolstore': (
+        'POOL_STORE_FILE', 'connect', 'delete_strategy_config', 'load_strategy_configs', 'open_pool_store', 'prefix_fingerprints', 'read_pool_masks',
+        'save_strategy_config', 'strategy_params_key', 'write_pool_masks',
+    ),
+    'watcher': ('WATCH_INTERVAL', 'HistoryWatcher'),
+    'tracing': (
+        'TRACE_CAPACITY', 'cache_miss', 'clear_traces', 'export_traces', 'set_tracing', 'stage_summary',
+        'trace', 'trace_records', 'traced', 'tracing_enabled',
+    ),
+}
+_EXPORTS = {name: module for module, names in _SUBMODULES.items() for name in names}
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'engine.{name}')
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'engine.{_EXPORTS[name]}'), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'engine' has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
+
+# FIM DO ARQUIVO engine/__init__.py
\ No newline at end of file
@@ -0,0 +1,134 @@
+# INÍCIO DO ARQUIVO engine/alerts.py
+"""Alertas: índice incremental do último concurso e registro compacto avaliado em lote.
+
+O índice guarda só o necessário para qualquer condição (máscaras do último e do penúltimo
+concurso e o atraso de cada dezena) e avança em O(25) por concurso novo. Cada condição vira
+um intervalo [mínimo, máximo] sobre uma coluna do vetor de características do índice, então
+milhares de alertas são avaliados com uma indexação e duas comparações. Os alertas ficam na
+tabela `alertas` do armazenamento SQLite (engine.poolstore), separados por dono.
+"""
+import numpy as np
+
+from engine.core import NUM_DEZENAS, BITS_DEZENAS, popcount, masks_to_incidence
+from engine.poolstore import connect
+from engine.stats import _current_delays
+
+# --- ÍNDICE INCREMENTAL ---
+def build_alert_index(concursos, masks):
+    """Índice após o último concurso de `masks` (uma passada vetorizada sobre o histórico)."""
+    masks = np.asarray(masks, dtype=np.uint32)
+    return {
+        'concurso': int(concursos[-1]) if len(concursos) else 0,
+        'num_concursos': len(masks),
+        'mascara': int(masks[-1]) if len(masks) else 0,
+        'mascara_anterior': int(masks[-2]) if len(masks) > 1 else 0,
+        'atrasos': _current_delays(masks_to_incidence(masks)),
+    }
+
+def update_alert_index(index, concurso, mask):
+    """Novo índice após o concurso `concurso` (O(25)); o índice recebido não é alterado."""
+    drawn = (int(mask) & BITS_DEZENAS) != 0
+    return {
+        'concurso': int(concurso),
+        'num_concursos': index['num_concursos'] + 1,
+        'mascara': int(mask),
+        'mascara_anterior': index['mascara'],
+        'atrasos': np.where(drawn, 0, index['atrasos'] + 1).astype(np.int32),
+    }
+
+def advance_alert_index(index, concursos, masks):
+    """Aplica `update_alert_index` aos concursos posteriores ao do índice (os novos de uma sincronização)."""
+    concursos = np.asarray(concursos)
+    start = int(np.searchsorted(concursos, index['concurso'], side='right'))
+    for concurso, mask in zip(concursos[start:].tolist(), np.asarray(masks)[start:].tolist()):
+        index = update_alert_index(index, concurso, mask)
+    return index
+
+# --- CONDIÇÕES ---
+# Colunas do vetor de características: sorteada (25), atraso (25), soma, pares, ímpares, repetidas
+COL_SORTEADA = 0
+COL_ATRASO = NUM_DEZENAS
+COL_SOMA = 2 * NUM_DEZENAS
+COL_PARES = COL_SOMA + 1
+COL_IMPARES = COL_SOMA + 2
+COL_REPETIDAS = COL_SOMA + 3
+SEM_LIMITE = np.iinfo(np.int32).max
+
+def alert_features(index):
+    """Vetor de características do último concurso indexado (uma entrada por coluna de condição)."""
+    drawn = ((index['mascara'] & BITS_DEZENAS) != 0).astype(np.int64)
+    numbers = np.arange(1, NUM_DEZENAS + 1)
+    evens = int(drawn[1::2].sum())
+    return np.concatenate([
+        drawn,
+        index['atrasos'].astype(np.int64),
+        [int(drawn @ numbers), evens, int(drawn.sum()) - evens, int(popcount(np.uint32(index['mascara'] & index['mascara_anterior'])))],
+    ])
+
+def alert_condition(tipo, dezena=None, minimo=None, maximo=None):
+    """Traduz uma condição para (coluna, mínimo, máximo).
+
+    Tipos: 'sorteada' e 'nao_sorteada' (dezena), 'atraso' (dezena com atraso >= mínimo),
+    'soma' (soma das dezenas), 'pares' e 'impares' (quantidade de dezenas pares/ímpares) e
+    'repetidas' (dezenas repetidas do concurso anterior), estes com faixa [mínimo, máximo].
+    """
+    if tipo in ('sorteada', 'nao_sorteada', 'atraso'):
+        if dezena is None or not 1 <= int(dezena) <= NUM_DEZENAS:
+            raise ValueError(f"Dezena inválida para o alerta '{tipo}': {dezena!r}")
+    if tipo == 'sorteada':
+        return COL_SORTEADA + int(dezena) - 1, 1, 1
+    if tipo == 'nao_sorteada':
+        return COL_SORTEADA + int(dezena) - 1, 0, 0
+    if tipo == 'atraso':
+        return COL_ATRASO + int(dezena) - 1, int(minimo), SEM_LIMITE
+    columns = {'soma': COL_SOMA, 'pares': COL_PARES, 'impares': COL_IMPARES, 'repetidas': COL_REPETIDAS}
+    if tipo not in columns:
+        raise ValueError(f"Tipo de alerta desconhecido: {tipo!r}")
+    return columns[tipo], int(minimo), int(maximo)
+
+# --- REGISTRO COMPACTO ---
+# Um array por campo: id, nome e tipo (texto), dezena (0 se não se aplica), coluna e faixa [minimo, maximo]
+_REGISTRY_DTYPES = {'id': np.int64, 'nome': np.str_, 'tipo': np.str_, 'dezena': np.int8, 'coluna': np.int16, 'minimo': np.int32, 'maximo': np.int32}
+
+def new_alert_registry():
+    return {name: np.zeros(0, dtype=dtype) for name, dtype in _REGISTRY_DTYPES.items()}
+
+def _alert_row(nome, tipo, dezena, minimo, maximo):
+    """Valida nome e condição e devolve os campos do alerta (sem o id)."""
+    nome = (nome or '').strip()
+    if not nome:
+        raise ValueError("O alerta precisa de um nome.")
+    coluna, minimo, maximo = alert_condition(tipo, dezena, minimo, maximo)
+    return {'nome': nome, 'tipo': tipo, 'dezena': int(dezena or 0), 'coluna': coluna, 'minimo': minimo, 'maximo': maximo}
+
+def _registry_from_rows(rows):
+    columns = list(zip(*rows)) if rows else [[] for _ in _REGISTRY_DTYPES]
+    return {name: np.array(values, dtype=None if dtype is np.str_ else dtype) if len(values) else np.zeros(0, dtype=dtype)
+            for (name, dtype), values in zip(_REGISTRY_DTYPES.items(), columns)}
+
+def evaluate_alerts(index, registry):
+    """Avalia todos os alertas de uma vez: retorna (disparados, valor observado de cada alerta)."""
+    values = alert_features(index)[registry['coluna']]
+    return (values >= registry['minimo']) & (values <= registry['maximo']), values
+
+# --- PERSISTÊNCIA (TABELA `alertas` DO ARMAZENAMENTO SQLITE, POR DONO) ---
+# Cada operação é uma única instrução SQL (transação atômica): dois usuários criando alertas
+# ao mesmo tempo não se sobrescrevem, e cada um só enxerga e remove os do próprio `dono`.
+def store_alert(store, dono, nome, tipo, dezena=None, minimo=None, maximo=None):
+    """Grava um alerta de `dono` no armazenamento (valida nome e condição antes)."""
+    row = _alert_row(nome, tipo, dezena, minimo, maximo)
+    with connect(store) as conn, conn:
+        conn.execute('INSERT INTO alertas (dono, nome, tipo, dezena, coluna, minimo, maximo) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                     (dono, *(row[name] for name in list(_REGISTRY_DTYPES)[1:])))
+
+def delete_stored_alerts(store, dono, ids):
+    with connect(store) as conn, conn:
+        conn.executemany('DELETE FROM alertas WHERE dono = ? AND id = ?', [(dono, int(alert_id)) for alert_id in ids])
+
+def load_alert_registry(store, dono):
+    """Registro com os alertas de `dono`, na ordem de criação."""
+    with connect(store) as conn:
+        rows = conn.execute(f"SELECT {', '.join(_REGISTRY_DTYPES)} FROM alertas WHERE dono = ? ORDER BY id", (dono,)).fetchall()
+    return _registry_from_rows(rows)
+
+# FIM DO ARQUIVO engine/alerts.py
\ No newline at end of file
@@ -0,0 +1,120 @@
+# INÍCIO DO ARQUIVO engine/analysis.py
+"""Análises avançadas: posições, soma/amplitude e coocorrência de pares, trincas, quadras e k-uplas."""
+import math
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from engine.core import (
+    NUM_DEZENAS, DEZENAS_POR_JOGO, get_draws_array, as_draw_masks, masks_to_incidence, masks_to_draws,
+    _binomial_table, rank_combinations, unrank_combinations
+)
+
+# --- FUNÇÕES DE ANÁLISE AVANÇADA ---
+def analyze_positional_frequencies(df):
+    draws = get_draws_array(df)
+    pos_freq = {}
+    for i in range(DEZENAS_POR_JOGO):
+        freq = np.bincount(draws[:, i], minlength=NUM_DEZENAS + 1)
+        pos_freq[f'Posição {i + 1}'] = {num: int(freq[num]) for num in range(1, 26)}
+    return pd.DataFrame(pos_freq).fillna(0).astype(int)
+
+def analyze_sum_and_range(df):
+    draws = get_draws_array(df)
+    return pd.DataFrame({
+        'Soma': draws.sum(axis=1),
+        'Faixa': draws.max(axis=1, initial=0) - draws.min(axis=1, initial=NUM_DEZENAS),
+    }, index=df.index)
+
+def analyze_number_trend(df, number, window=20):
+    """Ocorrência de uma dezena por concurso e sua média móvel de `window` concursos."""
+    trend = pd.DataFrame({'Concurso': df['Concurso'].to_numpy(), 'Apareceu': masks_to_incidence(as_draw_masks(df))[:, number - 1].astype(int)})
+    trend[f'Media Movel ({window} concursos)'] = trend['Apareceu'].rolling(window=window).mean()
+    return trend
+
+# --- COOCORRÊNCIA (MATRIZ DE INCIDÊNCIA) ---
+COOCORRENCIA_CHUNK = 1 << 22  # postos calculados por lote (concursos x combinações do sorteio)
+
+def pair_cooccurrence(history):
+    """Matriz 25x25 de coocorrência: [i, j] = concursos em que as dezenas i+1 e j+1 saíram juntas."""
+    incidence = masks_to_incidence(as_draw_masks(history)).astype(np.int64)
+    return incidence.T @ incidence
+
+def _combination_rank_blocks(history, k, chunk_cells=COOCORRENCIA_CHUNK):
+    """Gera, por bloco de concursos, os postos colexicográficos de todas as k-uplas de cada sorteio.
+
+    Cada sorteio ordenado gera suas C(15, k) k-uplas por um gabarito fixo de índices;
+    os postos são somados em lote via tabela binomial. O bloco tem cerca de `chunk_cells` postos.
+    """
+    draws = masks_to_draws(as_draw_masks(history)).astype(np.intp) - 1
+    template = np.array(list(combinations(range(DEZENAS_POR_JOGO), k)), dtype=np.intp).reshape(-1, k)
+    table = _binomial_table(NUM_DEZENAS, k).astype(np.intp)
+    step = max(1, chunk_cells // max(len(template), 1))
+    for start in range(0, len(draws), step):
+        block = draws[start:start + step]
+        yield sum(table[i + 1][block][:, template[:, i]] for i in range(k)).ravel()
+
+def combination_counts(history, k):
+    """Frequência de cada k-upla, indexada pelo posto colexicográfico (vetor de C(25, k) posições)."""
+    counts = np.zeros(math.comb(NUM_DEZENAS, k), dtype=np.int64)
+    for ranks in _combination_rank_blocks(history, k):
+        counts += np.bincount(ranks, minlength=len(counts))
+    return counts
+
+MINER_MEMORY_CAP = 64 * 1024 * 1024  # bytes para contadores + lote de postos no minerador de k-uplas
+
+def mine_top_tuples(history, k, top_n=20, memory_cap=MINER_MEMORY_CAP):
+    """Top-`top_n` exato das k-uplas mais frequentes (k até 15), respeitando `memory_cap` bytes.
+
+    Se o contador denso de C(25, k) posições cabe no limite, é uma única passada. Caso
+    contrário o espaço de postos é dividido em faixas que cabem no limite e cada passada
+    conta só a sua faixa, mantendo os melhores candidatos; o resultado continua exato.
+    """
+    total = math.comb(NUM_DEZENAS, k)
+    counter_bytes = 16  # contador acumulado + resultado temporário do bincount
+    # Metade do limite vai para o lote de postos (postos e temporários da soma), metade para o contador
+    chunk_cells = max(math.comb(DEZENAS_POR_JOGO, k), memory_cap // (2 * 4 * np.dtype(np.intp).itemsize))
+    span = max(1, min(total, (memory_cap // 2) // counter_bytes))
+    best_ranks = np.zeros(0, dtype=np.int64)
+    best_counts = np.zeros(0, dtype=np.int64)
+    for lo in range(0, total, span):
+        hi = min(lo + span, total)
+        counts = np.zeros(hi - lo, dtype=np.int64)
+        for ranks in _combination_rank_blocks(history, k, chunk_cells):
+            if lo > 0 or hi < total:
+                ranks = ranks[(ranks >= lo) & (ranks < hi)] - lo
+            counts += np.bincount(ranks, minlength=hi - lo)
+        keep = np.argsort(-counts, kind='stable')[:top_n]
+        best_ranks = np.concatenate([best_ranks, keep + lo])
+        best_counts = np.concatenate([best_counts, counts[keep]])
+        order = np.lexsort((best_ranks, -best_counts))[:top_n]
+        best_ranks, best_counts = best_ranks[order], best_counts[order]
+    keep = best_counts > 0
+    combos = unrank_combinations(best_ranks[keep], NUM_DEZENAS, k).astype(np.int64) + 1
+    return [(tuple(combo), int(count)) for combo, count in zip(combos.tolist(), best_counts[keep].tolist())]
+
+def top_combinations(counts, k, top_n=20):
+    """As `top_n` k-uplas mais frequentes como [(tupla de dezenas, frequência)]; empates pelo menor posto."""
+    order = np.argsort(-counts, kind='stable')[:top_n]
+    order = order[counts[order] > 0]
+    combos = unrank_combinations(order, NUM_DEZENAS, k).astype(np.int64) + 1
+    return [(tuple(combo), int(count)) for combo, count in zip(combos.tolist(), counts[order].tolist())]
+
+def analyze_pairs(df, top_n=20):
+    """Analisa os pares mais frequentes (produto X^T X da matriz de incidência)."""
+    matrix = pair_cooccurrence(df)
+    i, j = np.triu_indices(NUM_DEZENAS, k=1)
+    counts = np.zeros(math.comb(NUM_DEZENAS, 2), dtype=np.int64)
+    counts[rank_combinations(np.column_stack([i, j]))] = matrix[i, j]
+    return top_combinations(counts, 2, top_n)
+
+def analyze_triplets(df, top_n=20):
+    """Analisa as trincas mais frequentes."""
+    return top_combinations(combination_counts(df, 3), 3, top_n)
+
+def analyze_quads(df, top_n=20):
+    """Analisa as quadras mais frequentes."""
+    return top_combinations(combination_counts(df, 4), 4, top_n)
+
+# FIM DO ARQUIVO engine/analysis.py
\ No newline at end of file
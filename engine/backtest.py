@@ -0,0 +1,395 @@
+# INÍCIO DO ARQUIVO engine/backtest.py
+"""Backtest walk-forward, geração de jogos e varredura de parâmetros em processos paralelos."""
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, product
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from engine.core import (
+    NUM_DEZENAS, DEZENAS_POR_JOGO, CUSTO_JOGO, PREMIOS, BITS_DEZENAS, popcount, numbers_to_mask, mask_to_numbers, as_draw_masks, masks_to_incidence,
+    score_histogram, prize_from_histogram, unrank_combinations
+)
+from engine.poolstore import strategy_params_key, prefix_fingerprints, read_pool_masks, write_pool_masks
+from engine.stats import summarize_counts, _current_delays
+from engine.strategies import ESTRATEGIAS, build_pool
+from engine.tracing import traced
+
+# --- BACKTEST WALK-FORWARD ---
+def walk_forward_states(history, num_draws_to_test):
+    """Percorre os últimos `num_draws_to_test` concursos, mantendo o estado do histórico anterior a cada um.
+
+    `history` é o DataFrame de resultados ou diretamente o vetor de máscaras.
+    O estado inicial é calculado em uma passada vetorizada; depois cada concurso atualiza
+    contagens (dezenas, finais, linhas, colunas) e atrasos de forma incremental, em O(25).
+    Gera (posição do alvo, máscara do alvo, contagens, atrasos) sem copiar o DataFrame.
+    """
+    masks = as_draw_masks(history)
+    incidence = masks_to_incidence(masks)
+    start_pos = max(len(masks) - num_draws_to_test, 0)
+    counts = summarize_counts(incidence[:start_pos].sum(axis=0, dtype=np.int64))
+    delays = _current_delays(incidence[:start_pos])
+    for target_pos in range(start_pos, len(masks)):
+        yield target_pos, masks[target_pos], counts, delays
+        drawn = incidence[target_pos]
+        increments = summarize_counts(drawn.astype(np.int64))
+        counts = {name: counts[name] + increments[name] for name in counts}
+        delays = np.where(drawn == 1, 0, delays + 1).astype(np.int32)
+
+def stored_walk_forward_pools(history, strategy_names, params, num_draws_to_test, pool_store):
+    """Máscaras dos pools do walk-forward lidas de `pool_store` e completadas sob demanda.
+
+    `history` é o DataFrame do intervalo (a chave usa o seu primeiro concurso e a impressão
+    digital do prefixo de cada alvo, então lacunas preenchidas invalidam os pools afetados).
+    Só os pools que faltam são calculados, num walk-forward que começa no primeiro concurso ausente: quando
+    chega um concurso novo, apenas ele é calculado e gravado.
+    Retorna (posições dos alvos, máscaras dos pools combinados).
+    """
+    masks = as_draw_masks(history)
+    concursos = np.asarray(history['Concurso'], dtype=np.int64)
+    start_pos = max(len(masks) - num_draws_to_test, 0)
+    targets = concursos[start_pos:]
+    prefixes = prefix_fingerprints(concursos, masks)[start_pos:]
+    strategy_names = list(dict.fromkeys(strategy_names))
+    if not len(targets) or not strategy_names:
+        return np.arange(start_pos, len(masks)), np.zeros(len(targets), dtype=np.uint32)
+    inicio = int(concursos[0])
+    keys = {name: strategy_params_key(name, params) for name in strategy_names}
+    stored = {name: read_pool_masks(pool_store, name, keys[name], inicio, targets, prefixes) for name in strategy_names}
+    missing = [name for name in strategy_names if not stored[name][0].all()]
+    if missing:
+        first = min(int(np.argmin(stored[name][0])) for name in missing)
+        computed = {name: np.zeros(len(targets) - first, dtype=np.uint32) for name in missing}
+        for i, (_, _, counts, delays) in enumerate(walk_forward_states(masks, len(targets) - first)):
+            for name in missing:
+                computed[name][i] = numbers_to_mask(build_pool([name], params, counts, delays))
+        for name in missing:
+            found, pool_masks = stored[name]
+            new = ~found[first:]
+            write_pool_masks(pool_store, name, keys[name], inicio, targets[first:][new], prefixes[first:][new], computed[name][new])
+            pool_masks[first:] = computed[name]
+    return np.arange(start_pos, len(masks)), np.bitwise_or.reduce([stored[name][1] for name in strategy_names], axis=0)
+
+def walk_forward(history, strategy_names, params, num_draws_to_test, pool_store=None):
+    """Gera (posição do alvo, máscara do alvo, pool) para cada concurso testado no backtest.
+
+    Com `pool_store` (e `history` como DataFrame), os pools vêm do armazenamento persistente.
+    """
+    if pool_store is not None and hasattr(history, 'columns'):
+        target_masks = as_draw_masks(history)
+        positions, pool_masks = stored_walk_forward_pools(history, strategy_names, params, num_draws_to_test, pool_store)
+        for target_pos, pool_mask in zip(positions.tolist(), pool_masks.tolist()):
+            yield target_pos, target_masks[target_pos], mask_to_numbers(pool_mask)
+        return
+    for target_pos, target_mask, counts, delays in walk_forward_states(history, num_draws_to_test):
+        yield target_pos, target_mask, build_pool(strategy_names, params, counts, delays)
+
+# --- GERAÇÃO DE JOGOS ---
+def count_distinct_games(pool):
+    """Quantidade de jogos distintos de 15 dezenas que o pool permite."""
+    return math.comb(len(set(int(num) for num in pool)), DEZENAS_POR_JOGO)
+
+@traced('geracao', rows=len)
+def generate_game_masks(pool, num_games, rng=None):
+    """Gera jogos distintos do pool como máscaras uint32, sem laço por jogo.
+
+    Cada jogo do pool corresponde a um posto no sistema combinatório (as dezenas de fora
+    do jogo); sortear postos distintos com `rng.choice(..., replace=False)` e decodificá-los
+    em lote dá jogos uniformes e já deduplicados. Se `num_games` atingir a quantidade de
+    combinações possíveis, todas são enumeradas (retornando menos jogos que o pedido).
+    """
+    pool = np.unique(np.asarray(pool, dtype=np.int64))
+    if len(pool) < DEZENAS_POR_JOGO or num_games <= 0:
+        return np.zeros(0, dtype=np.uint32)
+    rng = rng if rng is not None else np.random.default_rng()
+    pool_bits = BITS_DEZENAS[pool - 1]
+    num_excluded = len(pool) - DEZENAS_POR_JOGO
+    total = math.comb(len(pool), num_excluded)
+    if num_games >= total:
+        ranks = rng.permutation(total)
+    else:
+        ranks = rng.choice(total, size=num_games, replace=False)
+    excluded = unrank_combinations(ranks, len(pool), num_excluded)
+    excluded_masks = np.bitwise_or.reduce(pool_bits[excluded], axis=1) if num_excluded else np.zeros(len(ranks), dtype=np.uint32)
+    return np.bitwise_or.reduce(pool_bits) ^ excluded_masks
+
+@traced('backtest')
+def backtest_history(history, strategy_names, params, num_games_per_draw, num_draws_to_test, rng=None, pool_store=None,
+                     progress=None):
+    """Backtest sem interface: retorna (acertos por quantidade de pontos 0-15, custo, prêmio).
+
+    `progress`, se dado, é chamado como progress(concursos testados, total, pool) após cada concurso.
+    """
+    hit_counts = np.zeros(DEZENAS_POR_JOGO + 1, dtype=np.int64)
+    total_cost = 0.0
+    for step, (target_pos, target_mask, pool) in enumerate(
+            walk_forward(history, strategy_names, params, num_draws_to_test, pool_store), 1):
+        game_masks = generate_game_masks(pool, num_games_per_draw, rng=rng)
+        total_cost += len(game_masks) * CUSTO_JOGO
+        hit_counts += score_histogram(game_masks, [target_mask])
+        if progress is not None:
+            progress(step, num_draws_to_test, pool)
+    return hit_counts, total_cost, prize_from_histogram(hit_counts)
+
+# --- BACKTEST POR VALOR ESPERADO (SEM SORTEIO DE JOGOS) ---
+_POOL_HIT_TABLE = None
+
+def pool_hit_table():
+    """Tabela [tamanho do pool, dezenas do sorteio no pool, acertos] da distribuição hipergeométrica.
+
+    Um jogo uniforme de 15 dezenas de um pool com p dezenas, das quais k saíram no sorteio,
+    acerta h com probabilidade C(k, h) * C(p - k, 15 - h) / C(p, 15). Pools com menos de
+    15 dezenas não formam jogo e têm probabilidade zero.
+    """
+    global _POOL_HIT_TABLE
+    if _POOL_HIT_TABLE is None:
+        table = np.zeros((NUM_DEZENAS + 1, NUM_DEZENAS + 1, DEZENAS_POR_JOGO + 1), dtype=np.float64)
+        for size in range(DEZENAS_POR_JOGO, NUM_DEZENAS + 1):
+            total = math.comb(size, DEZENAS_POR_JOGO)
+            for overlap in range(size + 1):
+                for hits in range(DEZENAS_POR_JOGO + 1):
+                    table[size, overlap, hits] = math.comb(overlap, hits) * math.comb(size - overlap, DEZENAS_POR_JOGO - hits) / total
+        table.flags.writeable = False
+        _POOL_HIT_TABLE = table
+    return _POOL_HIT_TABLE
+
+@traced('backtest_valor_esperado')
+def expected_value_backtest(history, strategy_names, params, num_games_per_draw, num_draws_to_test, pool_store=None):
+    """Backtest exato por valor esperado: nenhum jogo é gerado.
+
+    Os jogos distintos de `generate_game_masks` são, cada um, uniformes no pool; então a
+    distribuição de acertos só depende do tamanho do pool e de quantas dezenas do sorteio
+    caíram nele. O walk-forward produz uma máscara de pool por concurso e o resto é uma
+    consulta vetorizada em `pool_hit_table`.
+    Retorna (acertos esperados 0-15, custo, prêmio esperado, detalhes por concurso), em que os
+    detalhes têm 'posicao', 'tamanho_pool', 'acertos_pool', 'jogos', 'probabilidades' (por
+    jogo, C x 16) e 'premio_esperado'.
+    """
+    if pool_store is not None and hasattr(history, 'columns'):
+        positions, pool_masks = stored_walk_forward_pools(history, strategy_names, params, num_draws_to_test, pool_store)
+        target_masks = as_draw_masks(history)[positions]
+    else:
+        positions, pool_masks, target_masks = [], [], []
+        for target_pos, target_mask, pool in walk_forward(history, strategy_names, params, num_draws_to_test):
+            positions.append(target_pos)
+            pool_masks.append(numbers_to_mask(pool))
+            target_masks.append(target_mask)
+    pool_masks = np.array(pool_masks, dtype=np.uint32)
+    sizes = popcount(pool_masks).astype(np.intp)
+    overlaps = popcount(pool_masks & np.array(target_masks, dtype=np.uint32)).astype(np.intp)
+    probabilities = pool_hit_table()[sizes, overlaps]
+    max_games = np.array([math.comb(int(size), DEZENAS_POR_JOGO) for size in sizes], dtype=np.int64)
+    games = np.minimum(max_games, num_games_per_draw)
+    prize_table = np.zeros(DEZENAS_POR_JOGO + 1, dtype=np.float64)
+    prize_table[list(PREMIOS)] = list(PREMIOS.values())
+    contest_prizes = games * (probabilities @ prize_table)
+    details = {'posicao': np.array(positions, dtype=np.int64), 'tamanho_pool': sizes, 'acertos_pool': overlaps,
+               'jogos': games, 'probabilidades': probabilities, 'premio_esperado': contest_prizes}
+    expected_hits = (games[:, None] * probabilities).sum(axis=0)
+    return expected_hits, float(games.sum() * CUSTO_JOGO), float(contest_prizes.sum()), details
+
+# --- COMPARAÇÃO DE ESTRATÉGIAS (NÚMEROS ALEATÓRIOS COMUNS) ---
+def common_random_games(pool, keys, num_games=None):
+    """Jogos do pool a partir de chaves aleatórias compartilhadas (uma linha de 25 chaves por jogo).
+
+    Cada jogo são as 15 dezenas do pool com as maiores chaves, o que dá jogos uniformes. Com as
+    mesmas chaves, pools que se sobrepõem geram jogos que se sobrepõem: é o que correlaciona os
+    resultados das estratégias comparadas. Jogos repetidos são trocados por jogos de novas
+    linhas de chaves, derivadas deterministicamente de `keys` (as mesmas para todos os pools),
+    até completar `num_games` jogos distintos (padrão: `len(keys)`), como em `generate_game_masks`;
+    se o pool permite no máximo isso, todos os jogos são usados.
+    """
+    pool = np.unique(np.asarray(pool, dtype=np.int64))
+    num_games = len(keys) if num_games is None else num_games
+    if len(pool) < DEZENAS_POR_JOGO or num_games <= 0:
+        return np.zeros(0, dtype=np.uint32)
+    if math.comb(len(pool), DEZENAS_POR_JOGO) <= num_games:
+        return generate_game_masks(pool, num_games, rng=np.random.default_rng(0))
+    num_excluded = len(pool) - DEZENAS_POR_JOGO
+    extra_keys = np.random.default_rng(np.ascontiguousarray(keys[0]).view(np.uint32))
+    games = np.zeros(0, dtype=np.uint32)
+    while True:
+        chosen = np.argpartition(keys[:, pool - 1], num_excluded, axis=1)[:, num_excluded:]
+        games = np.concatenate([games, np.bitwise_or.reduce(BITS_DEZENAS[pool[chosen] - 1], axis=1)])
+        _, first = np.unique(games, return_index=True)
+        if len(first) >= num_games:
+            return games[np.sort(first)[:num_games]]
+        keys = extra_keys.random((max(num_games - len(first), 16), NUM_DEZENAS))
+
+@traced('comparacao')
+def compare_strategies(history, entries, num_games_per_draw, num_draws_to_test, rng=None, pool_store=None):
+    """Backtest simultâneo de várias estratégias com números aleatórios comuns.
+
+    `entries` é uma lista de (nomes das estratégias, parâmetros). Um único walk-forward fornece
+    contagens e atrasos a todas; a cada concurso as mesmas chaves aleatórias geram os jogos de
+    cada pool (`common_random_games`) e todos os jogos são pontuados numa só passada.
+    Com `pool_store` (e `history` como DataFrame), os pools vêm do armazenamento persistente.
+    Retorna (acertos 0-15 por estratégia, custos, prêmios, lucro por concurso e estratégia).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    num_entries = len(entries)
+    prize_table = np.zeros(DEZENAS_POR_JOGO + 1, dtype=np.float64)
+    prize_table[list(PREMIOS)] = list(PREMIOS.values())
+    hit_counts = np.zeros((num_entries, DEZENAS_POR_JOGO + 1), dtype=np.int64)
+    profits = []
+    if pool_store is not None and hasattr(history, 'columns'):
+        target_masks = as_draw_masks(history)
+        stored = [stored_walk_forward_pools(history, names, params, num_draws_to_test, pool_store) for names, params in entries]
+        contests = ((target_masks[target_pos], [mask_to_numbers(pool_masks[i]) for _, pool_masks in stored])
+                    for i, target_pos in enumerate(stored[0][0].tolist()))
+    else:
+        contests = ((target_mask, [build_pool(names, params, counts, delays) for names, params in entries])
+                    for _, target_mask, counts, delays in walk_forward_states(history, num_draws_to_test))
+    for target_mask, pools in contests:
+        keys = rng.random((num_games_per_draw, NUM_DEZENAS))
+        batch = [common_random_games(pool, keys) for pool in pools]
+        sizes = np.array([len(game_masks) for game_masks in batch])
+        labels = np.repeat(np.arange(num_entries), sizes)
+        hits = popcount(np.concatenate(batch) & target_mask).astype(np.intp)
+        contest_counts = np.bincount(labels * (DEZENAS_POR_JOGO + 1) + hits, minlength=num_entries * (DEZENAS_POR_JOGO + 1))
+        contest_counts = contest_counts.reshape(num_entries, DEZENAS_POR_JOGO + 1)
+        hit_counts += contest_counts
+        profits.append(contest_counts @ prize_table - sizes * CUSTO_JOGO)
+    profits = np.array(profits).reshape(-1, num_entries)
+    costs = (hit_counts.sum(axis=1) * CUSTO_JOGO).astype(np.float64)
+    return hit_counts, costs, costs + profits.sum(axis=0), profits
+
+# --- VARREDURA DE PARÂMETROS (PROCESSOS EM PARALELO) ---
+def build_sweep_grid(strategy_subsets, param_ranges):
+    """Combina subconjuntos de estratégias com as faixas de parâmetros, variando só os parâmetros usados."""
+    configs = []
+    for strategy_names in strategy_subsets:
+        used_keys = [key for name in strategy_names for key, _, _ in ESTRATEGIAS[name][1] if key in param_ranges]
+        used_keys = list(dict.fromkeys(used_keys))
+        for values in product(*(param_ranges[key] for key in used_keys)):
+            configs.append({'strategies': list(strategy_names), 'params': dict(zip(used_keys, (int(v) for v in values)))})
+    return configs
+
+_SWEEP_SHM = None
+_SWEEP_MASKS = None
+
+def _attach_shared_memory(name):
+    """Abre um bloco de memória compartilhada existente sem registrá-lo no resource_tracker.
+
+    Só o processo que criou o bloco o remove (`unlink`); se o worker também o registrasse, o
+    rastreador avisaria de vazamento ou tentaria removê-lo de novo quando o worker terminasse.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None  # antes do 3.13 o registro é incondicional
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def _sweep_worker_init(shm_name, num_concursos):
+    """Inicializa o processo de trabalho apontando para o histórico em memória compartilhada."""
+    global _SWEEP_SHM, _SWEEP_MASKS
+    _SWEEP_SHM = _attach_shared_memory(shm_name)
+    _SWEEP_MASKS = np.ndarray((num_concursos,), dtype=np.uint32, buffer=_SWEEP_SHM.buf)
+
+def _sweep_task(task):
+    config, num_games_per_draw, num_draws_to_test, seed_sequence = task
+    rng = np.random.default_rng(seed_sequence)
+    hit_counts, cost, prize = backtest_history(_SWEEP_MASKS, config['strategies'], config['params'], num_games_per_draw, num_draws_to_test, rng=rng)
+    return hit_counts, cost, prize
+
+def run_parameter_sweep(history, configs, num_games_per_draw, num_draws_to_test, seed=0, max_workers=None):
+    """Executa o backtest de cada configuração em um pool de processos.
+
+    O histórico é publicado uma única vez em memória compartilhada (máscaras uint32) e cada
+    tarefa recebe uma semente derivada de `seed`, então o resultado não depende da ordem de
+    execução nem da quantidade de processos. Retorna um DataFrame com uma linha por configuração.
+    """
+    masks = as_draw_masks(history)
+    seeds = np.random.SeedSequence(seed).spawn(len(configs))
+    tasks = [(config, num_games_per_draw, num_draws_to_test, task_seed) for config, task_seed in zip(configs, seeds)]
+    max_workers = max_workers or os.cpu_count() or 1
+    shm = shared_memory.SharedMemory(create=True, size=max(masks.nbytes, 1))
+    try:
+        np.ndarray(masks.shape, dtype=np.uint32, buffer=shm.buf)[:] = masks
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_sweep_worker_init, initargs=(shm.name, len(masks))) as executor:
+            chunksize = max(1, len(tasks) // (max_workers * 4))
+            outcomes = list(executor.map(_sweep_task, tasks, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    import pandas as pd  # só no processo principal: os workers não precisam do pandas
+
+    rows = []
+    for config, (hit_counts, cost, prize) in zip(configs, outcomes):
+        row = {'Estratégias': ', '.join(config['strategies']), **config['params'],
+               'Custo (R$)': cost, 'Prêmio (R$)': prize, 'Lucro (R$)': prize - cost}
+        row.update({f"{points} Pontos": int(hit_counts[points]) for points in PREMIOS})
+        rows.append(row)
+    param_cols = list(dict.fromkeys(key for config in configs for key in config['params']))
+    results = pd.DataFrame(rows, columns=['Estratégias'] + param_cols + ['Custo (R$)', 'Prêmio (R$)', 'Lucro (R$)'] + [f"{points} Pontos" for points in PREMIOS])
+    return results.astype({col: 'Int64' for col in param_cols})
+
+# --- OTIMIZADOR (SUCCESSIVE HALVING) ---
+def build_optimizer_candidates(strategy_names, param_ranges, max_strategies=None, max_candidates=None, seed=0):
+    """Candidatos do otimizador: subconjuntos das estratégias (até `max_strategies`) x faixas de parâmetros.
+
+    Se houver mais de `max_candidates`, uma amostra uniforme (determinada por `seed`) é mantida.
+    """
+    max_strategies = max_strategies or len(strategy_names)
+    subsets = [list(subset) for size in range(1, max_strategies + 1) for subset in combinations(strategy_names, size)]
+    configs = build_sweep_grid(subsets, param_ranges)
+    if max_candidates and len(configs) > max_candidates:
+        keep = np.sort(np.random.default_rng(seed).choice(len(configs), size=max_candidates, replace=False))
+        configs = [configs[i] for i in keep]
+    return configs
+
+def optimizer_windows(min_draws, max_draws, eta=3):
+    """Janelas de cada etapa: `min_draws`, multiplicada por `eta` a cada etapa, terminando em `max_draws`."""
+    windows = []
+    window = max(1, min(min_draws, max_draws))
+    while window < max_draws:
+        windows.append(window)
+        window *= eta
+    return windows + [max_draws]
+
+def successive_halving(history, configs, num_games_per_draw, min_draws, max_draws, eta=3, seed=0, max_workers=None):
+    """Otimizador por successive halving sobre a varredura de parâmetros.
+
+    Todos os candidatos são testados nos `min_draws` concursos mais recentes; só o melhor
+    1/`eta` segue para a etapa seguinte, com janela `eta` vezes maior, até a última etapa com
+    `max_draws` concursos. Cada etapa roda em paralelo (`run_parameter_sweep`). A ordem é pelo
+    retorno por real gasto (prêmio / custo - 1), não pelo lucro absoluto: com custos diferentes,
+    quem joga menos perde menos e venceria; candidatos sem jogos vão para o fim.
+    Retorna (ranking, configurações na ordem do ranking): finalistas primeiro e, depois, os
+    eliminados pela etapa em que pararam e pelo retorno nessa etapa.
+    """
+    import pandas as pd
+
+    masks = as_draw_masks(history)
+    windows = optimizer_windows(min_draws, min(max_draws, len(masks) - 1), eta)
+    alive = list(range(len(configs)))
+    reached = {}
+    for stage, window in enumerate(windows, start=1):
+        results = run_parameter_sweep(masks, [configs[i] for i in alive], num_games_per_draw, window, seed=seed, max_workers=max_workers)
+        cost, prize = results['Custo (R$)'].to_numpy(dtype=np.float64), results['Prêmio (R$)'].to_numpy(dtype=np.float64)
+        # Candidatos cujo pool não forma jogo (custo zero) ficam atrás de todos os demais
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.where(cost > 0, prize / cost - 1, -np.inf)
+        for i, row, value in zip(alive, results.to_dict('records'), score.tolist()):
+            reached[i] = dict(row, **{'Retorno por R$': value if value > -np.inf else np.nan, 'Etapa': stage, 'Concursos Avaliados': window})
+        order = np.argsort(-score, kind='stable')
+        if stage < len(windows):
+            alive = [alive[j] for j in order[:max(1, math.ceil(len(alive) / eta))]]
+
+    ranking = sorted(reached, key=lambda i: (-reached[i]['Etapa'], reached[i]['Custo (R$)'] == 0, -np.nan_to_num(reached[i]['Retorno por R$'], nan=-np.inf)))
+    param_cols = list(dict.fromkeys(key for config in configs for key in config['params']))
+    leaderboard = pd.DataFrame([reached[i] for i in ranking],
+                               columns=['Estratégias'] + param_cols + ['Etapa', 'Concursos Avaliados', 'Custo (R$)', 'Prêmio (R$)', 'Lucro (R$)', 'Retorno por R$'] + [f"{points} Pontos" for points in PREMIOS])
+    leaderboard.insert(0, 'Posição', range(1, len(leaderboard) + 1))
+    return leaderboard.astype({col: 'Int64' for col in param_cols}), [configs[i] for i in ranking]
+
+# FIM DO ARQUIVO engine/backtest.py
\ No newline at end of file
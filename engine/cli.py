@@ -0,0 +1,241 @@
+# INÍCIO DO ARQUIVO engine/cli.py
+"""Linha de comando do motor (python -m engine ...), para tarefas agendadas e execuções em lote.
+
+Cada subcomando importa só os módulos de que precisa; a saída é JSON (ou um jogo por linha em `gerar`).
+"""
+import argparse
+import json
+import sys
+
+
+def _parse_params(items):
+    """Converte ['top_n_freq=20', ...] em {'top_n_freq': 20, ...}."""
+    params = {}
+    for item in items or []:
+        key, _, value = item.partition('=')
+        if not value:
+            raise SystemExit(f"Parâmetro inválido: {item!r} (use chave=valor)")
+        params[key.strip()] = int(value)
+    return params
+
+
+def _load_window(args):
+    """Histórico (sincronizado, exceto com --offline) e o intervalo [--inicio, --fim] pedido."""
+    from engine.data import load_history
+
+    history, _, error = load_history(args.data_dir, sync=not args.offline)
+    if error is not None:
+        print(f"API indisponível ({error}); usando o histórico local.", file=sys.stderr)
+    if len(history) == 0:
+        raise SystemExit("Nenhum concurso no histórico local. Rode `python -m engine sync` com acesso à API.")
+    fim = args.fim if args.fim is not None else int(history.concursos[-1])
+    return history.range(args.inicio, fim)
+
+
+def _pool_store(args):
+    """Armazenamento de pools no diretório do histórico, ou None com --sem-cache."""
+    if args.sem_cache:
+        return None
+    from engine.poolstore import open_pool_store
+
+    return open_pool_store(args.data_dir)
+
+
+def _print_json(payload):
+    print(json.dumps(payload, ensure_ascii=False, indent=2))
+
+
+def cmd_sync(args):
+    from engine.data import sync_history_store
+
+    store, metrics = sync_history_store(args.data_dir, max_workers=args.workers)
+    metrics['total_concursos'] = 0 if store is None else len(store['concursos'])
+    _print_json(metrics)
+
+
+def cmd_gerar(args):
+    import numpy as np
+    from engine.backtest import generate_game_masks
+    from engine.core import masks_to_draws
+    from engine.stats import frequency_counts, get_delays
+    from engine.strategies import build_pool
+
+    df = _load_window(args)
+    pool = build_pool(args.estrategias, _parse_params(args.param), frequency_counts(df), get_delays(df))
+    game_masks = generate_game_masks(pool, args.jogos, rng=np.random.default_rng(args.seed))
+    for draw in masks_to_draws(game_masks).tolist():
+        print(' '.join(f'{num:02d}' for num in draw))
+
+
+def cmd_backtest(args):
+    import numpy as np
+    from engine.backtest import backtest_history
+
+    df = _load_window(args)
+    pool_store = _pool_store(args)
+    if args.valor_esperado:
+        from engine.backtest import expected_value_backtest
+
+        hit_counts, cost, prize, _ = expected_value_backtest(df, args.estrategias, _parse_params(args.param), args.jogos, args.concursos,
+                                                             pool_store=pool_store)
+    else:
+        hit_counts, cost, prize = backtest_history(df, args.estrategias, _parse_params(args.param), args.jogos,
+                                                   args.concursos, rng=np.random.default_rng(args.seed), pool_store=pool_store)
+    _print_json({
+        'estrategias': args.estrategias, 'custo': cost, 'premio': prize, 'lucro': prize - cost,
+        'acertos': {str(points): (float(hit_counts[points]) if args.valor_esperado else int(hit_counts[points])) for points in range(11, 16)},
+    })
+
+
+def cmd_otimizar(args):
+    from engine.backtest import build_optimizer_candidates, successive_halving
+
+    df = _load_window(args)
+    param_ranges = {}
+    for item in args.faixa or []:
+        key, _, bounds = item.partition('=')
+        low, _, high = bounds.partition(':')
+        if not high:
+            raise SystemExit(f"Faixa inválida: {item!r} (use chave=min:max)")
+        param_ranges[key.strip()] = range(int(low), int(high) + 1, args.passo)
+    configs = build_optimizer_candidates(args.estrategias, param_ranges, args.max_estrategias, args.max_candidatos, seed=args.seed)
+    leaderboard, _ = successive_halving(df, configs, args.jogos, args.concursos_iniciais, args.concursos,
+                                        eta=args.eta, seed=args.seed, max_workers=args.workers)
+    print(leaderboard.head(args.top).to_json(orient='records', force_ascii=False, indent=2))
+
+def cmd_simular(args):
+    import numpy as np
+    from engine.core import CUSTO_JOGO
+    from engine.montecarlo import (
+        exact_prize_distribution, hit_rates_from_histogram, hypergeometric_hit_rates,
+        simulate_prize_histogram, summarize_profit_distribution
+    )
+
+    rng = np.random.default_rng(args.seed)
+    if args.estrategias:
+        from engine.backtest import backtest_history
+
+        df = _load_window(args)
+        hit_counts, _, _ = backtest_history(df, args.estrategias, _parse_params(args.param), args.jogos_backtest,
+                                            args.concursos, rng=rng, pool_store=_pool_store(args))
+        hit_rates = hit_rates_from_histogram(hit_counts)
+    else:
+        hit_rates = hypergeometric_hit_rates()
+    if args.modo == 'exato':
+        values, weights = exact_prize_distribution(hit_rates, args.jogos)
+    else:
+        values, weights = simulate_prize_histogram(hit_rates, args.cenarios, args.jogos, rng=rng)
+    summary = summarize_profit_distribution(values, weights, args.jogos * CUSTO_JOGO)
+    _print_json({'modo': args.modo, 'taxas': {str(points): rate for points, rate in hit_rates.items()}, **summary})
+
+
+def cmd_analisar(args):
+    from engine.analysis import MINER_MEMORY_CAP, mine_top_tuples
+
+    df = _load_window(args)
+    memory_cap = args.memoria_mb * 1024 * 1024 if args.memoria_mb else MINER_MEMORY_CAP
+    top = mine_top_tuples(df, args.k, top_n=args.top, memory_cap=memory_cap)
+    _print_json([{'dezenas': list(combo), 'frequencia': count} for combo, count in top])
+
+
+def cmd_vigiar(args):
+    import time
+    from engine.watcher import HistoryWatcher
+
+    def report(history, metrics):
+        print(json.dumps({'concurso': int(history.concursos[-1]), 'total_concursos': len(history), **metrics}, ensure_ascii=False), flush=True)
+
+    watcher = HistoryWatcher(args.data_dir, args.intervalo, on_update=report).start()
+    try:
+        while True:
+            time.sleep(args.intervalo)
+            if watcher.last_error is not None:
+                print(f"Falha na verificação: {watcher.last_error}", file=sys.stderr, flush=True)
+    except KeyboardInterrupt:
+        watcher.stop()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m engine', description="Motor de análise da Lotofácil (sem interface).")
+    parser.add_argument('--data-dir', default=None, help="Diretório do histórico local (padrão: LOTOFACIL_DATA_DIR ou ./data).")
+    parser.add_argument('--offline', action='store_true', help="Não consulta a API; usa só o histórico local.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    def window_args(sub):
+        sub.add_argument('--inicio', type=int, default=1, help="Concurso inicial do intervalo.")
+        sub.add_argument('--fim', type=int, default=None, help="Concurso final do intervalo (padrão: o último).")
+
+    def strategy_args(sub, required=True):
+        sub.add_argument('--estrategias', nargs='+', required=required, help="Nomes das estratégias (como nas páginas).")
+        sub.add_argument('--param', nargs='*', metavar='CHAVE=VALOR', help="Parâmetros, ex.: top_n_freq=20 alpha_atraso_n=8.")
+
+    sub = subparsers.add_parser('sync', help="Completa o histórico local com os concursos que faltam.")
+    sub.add_argument('--workers', type=int, default=8)
+    sub.set_defaults(func=cmd_sync)
+
+    sub = subparsers.add_parser('vigiar', help="Verifica concursos novos periodicamente (uma linha JSON por atualização).")
+    sub.add_argument('--intervalo', type=float, default=300, help="Segundos entre verificações.")
+    sub.set_defaults(func=cmd_vigiar)
+
+    sub = subparsers.add_parser('gerar', help="Gera jogos a partir das estratégias (um por linha).")
+    window_args(sub)
+    strategy_args(sub)
+    sub.add_argument('--jogos', type=int, default=10)
+    sub.add_argument('--seed', type=int, default=None)
+    sub.set_defaults(func=cmd_gerar)
+
+    sub = subparsers.add_parser('backtest', help="Backtest walk-forward das estratégias.")
+    window_args(sub)
+    strategy_args(sub)
+    sub.add_argument('--jogos', type=int, default=10, help="Jogos por concurso.")
+    sub.add_argument('--concursos', type=int, default=100, help="Concursos testados (os últimos do intervalo).")
+    sub.add_argument('--valor-esperado', action='store_true', help="Custo e prêmio esperados exatos, sem sortear jogos.")
+    sub.add_argument('--sem-cache', action='store_true', help="Recalcula os pools sem ler nem gravar o armazenamento de pools.")
+    sub.add_argument('--seed', type=int, default=None)
+    sub.set_defaults(func=cmd_backtest)
+
+    sub = subparsers.add_parser('otimizar', help="Otimização de estratégias e parâmetros por successive halving.")
+    window_args(sub)
+    sub.add_argument('--estrategias', nargs='+', required=True, help="Estratégias cujas combinações serão exploradas.")
+    sub.add_argument('--faixa', nargs='*', metavar='CHAVE=MIN:MAX', help="Faixas de parâmetros, ex.: top_n_freq=15:22.")
+    sub.add_argument('--passo', type=int, default=1, help="Passo das faixas.")
+    sub.add_argument('--max-estrategias', type=int, default=None, help="Máximo de estratégias por combinação.")
+    sub.add_argument('--max-candidatos', type=int, default=200)
+    sub.add_argument('--jogos', type=int, default=10, help="Jogos por concurso.")
+    sub.add_argument('--concursos-iniciais', type=int, default=20, help="Concursos da primeira etapa.")
+    sub.add_argument('--concursos', type=int, default=300, help="Concursos da etapa final.")
+    sub.add_argument('--eta', type=int, default=3, help="Só o melhor 1/eta passa para a etapa seguinte.")
+    sub.add_argument('--workers', type=int, default=None)
+    sub.add_argument('--top', type=int, default=20)
+    sub.add_argument('--seed', type=int, default=0)
+    sub.set_defaults(func=cmd_otimizar)
+
+    sub = subparsers.add_parser('simular', help="Distribuição do lucro (Monte Carlo ou exata).")
+    window_args(sub)
+    strategy_args(sub, required=False)
+    sub.add_argument('--modo', choices=['exato', 'monte-carlo'], default='exato')
+    sub.add_argument('--jogos', type=int, default=50, help="Jogos por cenário.")
+    sub.add_argument('--cenarios', type=int, default=100_000, help="Cenários no modo monte-carlo.")
+    sub.add_argument('--sem-cache', action='store_true', help="Recalcula os pools sem ler nem gravar o armazenamento de pools.")
+    sub.add_argument('--jogos-backtest', type=int, default=50, help="Jogos por concurso no backtest das taxas.")
+    sub.add_argument('--concursos', type=int, default=100, help="Concursos do backtest das taxas.")
+    sub.add_argument('--seed', type=int, default=None)
+    sub.set_defaults(func=cmd_simular)
+
+    sub = subparsers.add_parser('analisar', help="K-uplas de dezenas mais frequentes no intervalo.")
+    window_args(sub)
+    sub.add_argument('--k', type=int, default=4)
+    sub.add_argument('--top', type=int, default=20)
+    sub.add_argument('--memoria-mb', type=int, default=None)
+    sub.set_defaults(func=cmd_analisar)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.data_dir is None:
+        from engine.data import DATA_DIR
+        args.data_dir = DATA_DIR
+    args.func(args)
+
+# FIM DO ARQUIVO engine/cli.py
\ No newline at end of file
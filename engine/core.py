@@ -0,0 +1,207 @@
+# INÍCIO DO ARQUIVO engine/core.py
+"""Núcleo numérico: constantes, máscaras de bits, pontuação em lote e sistema combinatório.
+
+Só depende do numpy; DataFrames são aceitos por duck typing (sem importar o pandas).
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from engine.tracing import traced
+
+# --- CONSTANTES ---
+NUM_DEZENAS = 25
+DEZENAS_POR_JOGO = 15
+PREMIOS = {11: 10, 12: 25, 13: 100, 14: 2000, 15: 2000000}
+CUSTO_JOGO = 2.5
+BOLAS = [f'Bola{i}' for i in range(1, DEZENAS_POR_JOGO + 1)]
+# Bit (n - 1) da máscara representa a dezena n (25 bits cabem em um uint32)
+BITS_DEZENAS = np.left_shift(np.uint32(1), np.arange(NUM_DEZENAS, dtype=np.uint32))
+
+# --- REPRESENTAÇÃO COMPACTA (MÁSCARAS DE BITS) ---
+if hasattr(np, 'bitwise_count'):
+    def popcount(values):
+        """Conta os bits ligados de cada elemento (quantidade de dezenas da máscara)."""
+        return np.bitwise_count(np.asarray(values, dtype=np.uint32))
+else:
+    _POPCOUNT_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(values):
+        """Conta os bits ligados de cada elemento (quantidade de dezenas da máscara)."""
+        values = np.ascontiguousarray(values, dtype=np.uint32)
+        as_bytes = values.view(np.uint8).reshape(values.shape + (4,))
+        return _POPCOUNT_BYTE[as_bytes].sum(axis=-1, dtype=np.uint8)
+
+def numbers_to_mask(numbers):
+    """Converte uma coleção de dezenas (1-25) em uma máscara de 25 bits."""
+    mask = 0
+    for num in numbers:
+        mask |= 1 << (int(num) - 1)
+    return mask
+
+def mask_to_numbers(mask):
+    """Converte uma máscara de 25 bits na lista ordenada de dezenas."""
+    mask = int(mask)
+    return [num for num in range(1, NUM_DEZENAS + 1) if mask >> (num - 1) & 1]
+
+def draws_to_masks(draws):
+    """Converte uma matriz (concursos x dezenas) em um vetor uint32 de máscaras."""
+    draws = np.asarray(draws, dtype=np.int64)
+    if draws.size == 0:
+        return np.zeros(len(draws), dtype=np.uint32)
+    return np.bitwise_or.reduce(BITS_DEZENAS[draws - 1], axis=1)
+
+def masks_to_incidence(masks):
+    """Expande máscaras em uma matriz de incidência uint8 (concursos x 25)."""
+    masks = np.asarray(masks, dtype=np.uint32)
+    return ((masks[:, None] & BITS_DEZENAS) != 0).astype(np.uint8)
+
+def get_draws_array(df):
+    """Retorna as dezenas sorteadas como uma matriz numpy (concursos x 15)."""
+    if df.empty:
+        return np.zeros((0, DEZENAS_POR_JOGO), dtype=np.int64)
+    return df[BOLAS].to_numpy(dtype=np.int64)
+
+def get_draw_masks(df):
+    """Retorna a máscara de cada concurso, usando a coluna 'Mascara' quando disponível."""
+    if 'Mascara' in df.columns:
+        return df['Mascara'].to_numpy(dtype=np.uint32)
+    return draws_to_masks(get_draws_array(df))
+
+def as_draw_masks(history):
+    """Aceita um DataFrame de resultados, o Historico ou um vetor de máscaras e retorna as máscaras."""
+    if hasattr(history, 'columns'):
+        return get_draw_masks(history)
+    if hasattr(history, 'mascaras'):
+        return history.mascaras
+    return np.asarray(history, dtype=np.uint32)
+
+def get_incidence_matrix(df):
+    """Retorna a matriz de incidência (concursos x 25): 1 se a dezena saiu no concurso."""
+    return masks_to_incidence(get_draw_masks(df))
+
+def count_numbers(df):
+    """Frequência de cada dezena (índice 0 = dezena 1) no DataFrame."""
+    return get_incidence_matrix(df).sum(axis=0, dtype=np.int64)
+
+def count_hits(game_masks, draw_mask):
+    """Quantidade de acertos de cada jogo (máscara) contra um sorteio (máscara)."""
+    return popcount(np.asarray(game_masks, dtype=np.uint32) & np.uint32(draw_mask))
+
+def masks_to_draws(masks):
+    """Converte máscaras com 15 dezenas em uma matriz ordenada (jogos x 15)."""
+    incidence = masks_to_incidence(masks)
+    return (np.nonzero(incidence)[1].reshape(-1, DEZENAS_POR_JOGO) + 1).astype(np.int64)
+
+# --- PONTUAÇÃO EM LOTE (JOGOS x CONCURSOS) ---
+# Quantidade máxima de pares jogo x concurso processados por bloco (memória limitada)
+SCORE_CHUNK_CELLS = 1 << 22
+
+def _score_chunks(game_masks, contest_masks, chunk_cells):
+    """Percorre a matriz de acertos em blocos de linhas: gera (início, bloco uint8)."""
+    game_masks = np.asarray(game_masks, dtype=np.uint32)
+    contest_masks = np.asarray(contest_masks, dtype=np.uint32)
+    rows_per_chunk = max(1, chunk_cells // max(len(contest_masks), 1))
+    for start in range(0, len(game_masks), rows_per_chunk):
+        block = game_masks[start:start + rows_per_chunk, None] & contest_masks[None, :]
+        yield start, popcount(block).astype(np.uint8)
+
+def score_hits(game_masks, contest_masks, chunk_cells=SCORE_CHUNK_CELLS):
+    """Matriz completa de acertos (jogos x concursos), calculada com AND + popcount."""
+    hits = np.empty((len(game_masks), len(contest_masks)), dtype=np.uint8)
+    for start, block in _score_chunks(game_masks, contest_masks, chunk_cells):
+        hits[start:start + len(block)] = block
+    return hits
+
+@traced('pontuacao', rows=lambda histogram: int(histogram.sum()))
+def score_histogram(game_masks, contest_masks, chunk_cells=SCORE_CHUNK_CELLS):
+    """Histograma de acertos (0-15) de todos os pares jogo x concurso, sem materializar a matriz."""
+    histogram = np.zeros(DEZENAS_POR_JOGO + 1, dtype=np.int64)
+    for _, block in _score_chunks(game_masks, contest_masks, chunk_cells):
+        histogram += np.bincount(block.ravel(), minlength=DEZENAS_POR_JOGO + 1)
+    return histogram
+
+def score_tiers_per_game(game_masks, contest_masks, chunk_cells=SCORE_CHUNK_CELLS):
+    """Para cada jogo, quantas vezes fez 0-15 pontos nos concursos (matriz jogos x 16)."""
+    tiers = np.zeros((len(game_masks), DEZENAS_POR_JOGO + 1), dtype=np.int64)
+    for start, block in _score_chunks(game_masks, contest_masks, chunk_cells):
+        # Desloca cada linha para uma faixa própria e conta tudo em um único bincount
+        offsets = np.arange(len(block))[:, None] * (DEZENAS_POR_JOGO + 1)
+        counts = np.bincount((block + offsets).ravel(), minlength=len(block) * (DEZENAS_POR_JOGO + 1))
+        tiers[start:start + len(block)] = counts.reshape(len(block), -1)
+    return tiers
+
+def prize_from_histogram(hit_counts):
+    """Valor total dos prêmios (PREMIOS) para um histograma de acertos."""
+    return float(sum(prize * int(hit_counts[points]) for points, prize in PREMIOS.items()))
+
+# --- SISTEMA NUMÉRICO COMBINATÓRIO ---
+# Ordem colexicográfica: a combinação c_1 < ... < c_k (base 0) tem posto sum(C(c_i, i)).
+def _binomial_table(n, k):
+    """Tabela table[i, c] = C(c, i) para 0 <= i <= k e 0 <= c <= n."""
+    return np.array([[math.comb(c, i) for c in range(n + 1)] for i in range(k + 1)], dtype=np.int64)
+
+def rank_combinations(combos):
+    """Posto colexicográfico de cada linha (índices base 0 em ordem crescente)."""
+    combos = np.asarray(combos, dtype=np.int64)
+    if combos.ndim == 1:
+        combos = combos[None, :]
+    k = combos.shape[1]
+    table = _binomial_table(int(combos.max(initial=0)) + 1, k)
+    return sum(table[i + 1][combos[:, i]] for i in range(k)) if k else np.zeros(len(combos), dtype=np.int64)
+
+_UNRANK_LUT_BITS = 16  # entradas por linha da tabela de busca: 2^16
+_UNRANK_MAX_STEPS = 4  # acima disso a linha usa busca binária
+
+@lru_cache(maxsize=None)
+def _unrank_lookup(n, k):
+    """Por linha i da tabela binomial: (deslocamento, índice inicial por faixa, passos de correção).
+
+    O posto é dividido por 2^deslocamento e vira índice de uma tabela com a maior coluna c tal
+    que C(c, i) <= início da faixa; dentro da faixa o índice correto fica no máximo `passos`
+    colunas adiante. Linhas com faixas muito densas (passos demais) recebem None.
+    """
+    table = _binomial_table(n, k)
+    rows = [None]
+    for i in range(1, k + 1):
+        top = int(table[i, n])
+        shift = max(0, top.bit_length() - _UNRANK_LUT_BITS)
+        starts = np.arange((top >> shift) + 1, dtype=np.int64) << shift
+        first = np.searchsorted(table[i], starts, side='right') - 1
+        last = np.searchsorted(table[i], np.minimum(starts + ((1 << shift) - 1), top), side='right') - 1
+        steps = int((last - first).max())
+        rows.append((shift, first.astype(np.intp), steps) if steps <= _UNRANK_MAX_STEPS else None)
+    # Sentinela no fim de cada linha: a correção pode olhar a coluna n + 1 sem sair da tabela
+    padded = np.concatenate([table, np.full((k + 1, 1), np.iinfo(np.int64).max)], axis=1)
+    return padded, rows
+
+def unrank_combinations(ranks, n, k):
+    """Inverso de rank_combinations: matriz (postos x k) de índices base 0 em ordem crescente.
+
+    Cada posição é decodificada para todos os postos de uma vez; a busca da coluna usa uma
+    tabela por faixas de posto (consulta direta mais poucas comparações) em vez de busca binária.
+    """
+    ranks = np.array(ranks, dtype=np.int64)
+    table, rows = _unrank_lookup(n, k)
+    combos = np.empty((len(ranks), k), dtype=np.int8 if n <= 127 else np.int64)
+    for i in range(k, 0, -1):
+        if rows[i] is None:
+            index = np.searchsorted(table[i, :n + 1], ranks, side='right') - 1
+        else:
+            shift, first, steps = rows[i]
+            index = first.take(ranks >> shift)
+            for _ in range(steps):
+                index += table[i].take(index + 1) <= ranks
+        ranks -= table[i].take(index)
+        combos[:, i - 1] = index
+    return combos
+
+# --- INTERVALOS DE CONCURSOS ---
+def _concurso_bounds(concursos, start_concurso, end_concurso):
+    """Posições [início, fim) do intervalo de concursos em um vetor ordenado."""
+    lo = int(np.searchsorted(concursos, start_concurso, side='left'))
+    hi = int(np.searchsorted(concursos, end_concurso, side='right'))
+    return lo, max(lo, hi)
+
+# FIM DO ARQUIVO engine/core.py
\ No newline at end of file
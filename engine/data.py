@@ -0,0 +1,229 @@
+# INÍCIO DO ARQUIVO engine/data.py
+"""Dados: histórico local em .npy mapeado em memória, sincronização com a API e o Historico imutável."""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from engine.core import BOLAS, draws_to_masks, masks_to_draws, get_draw_masks, _concurso_bounds
+
+# O Historico entrega visões sem cópia e só o Copy-on-Write impede que a alteração de uma
+# página chegue ao histórico compartilhado: padrão no pandas 3, precisa ser ligado no 2.x
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# --- CONSTANTES ---
+API_URL = os.environ.get('LOTOFACIL_API_URL', "https://loteriascaixa-api.herokuapp.com/api")
+# Diretório do histórico local (arquivos .npy); pode ser trocado pela variável de ambiente
+DATA_DIR = os.environ.get('LOTOFACIL_DATA_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'))
+# --- HISTÓRICO LOCAL (ARQUIVOS .NPY MAPEADOS EM MEMÓRIA) ---
+STORE_FILES = {'concursos': 'concursos.npy', 'datas': 'datas.npy', 'mascaras': 'mascaras.npy'}
+
+def load_history_store(data_dir=DATA_DIR):
+    """Carrega o histórico local como arrays mapeados em memória (somente leitura).
+
+    Retorna dict com 'concursos' (int32), 'datas' (datetime64[D]) e 'mascaras' (uint32),
+    ou None se o histórico não existir ou estiver inconsistente.
+    """
+    try:
+        store = {name: np.load(os.path.join(data_dir, filename), mmap_mode='r') for name, filename in STORE_FILES.items()}
+    except (OSError, ValueError):
+        return None
+    if len({len(array) for array in store.values()}) != 1:
+        return None
+    return store
+
+def save_history_store(store, data_dir=DATA_DIR):
+    """Grava o histórico local; cada arquivo é escrito em um temporário e renomeado (troca atômica)."""
+    os.makedirs(data_dir, exist_ok=True)
+    for name, filename in STORE_FILES.items():
+        path = os.path.join(data_dir, filename)
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, np.ascontiguousarray(store[name]))
+        os.replace(path + '.tmp', path)
+
+def results_to_store(results):
+    """Converte a lista JSON da API em arrays do histórico (ordenados por concurso), sem laço por campo."""
+    if not results:
+        return {'concursos': np.zeros(0, dtype=np.int32), 'datas': np.zeros(0, dtype='datetime64[D]'), 'mascaras': np.zeros(0, dtype=np.uint32)}
+    concursos = np.array([int(result['concurso']) for result in results], dtype=np.int32)
+    datas = pd.to_datetime([result['data'] for result in results], format='%d/%m/%Y').to_numpy().astype('datetime64[D]')
+    mascaras = draws_to_masks(np.array([result['dezenas'] for result in results], dtype=np.int64))
+    order = np.argsort(concursos, kind='stable')
+    return {'concursos': concursos[order], 'datas': datas[order], 'mascaras': mascaras[order]}
+
+def merge_stores(store, new_store):
+    """Une ao histórico os concursos de `new_store` que ainda não estão nele, mantendo a ordem por concurso."""
+    if store is None or len(store['concursos']) == 0:
+        return new_store
+    new_only = ~np.isin(new_store['concursos'], store['concursos'])
+    merged = {name: np.concatenate([store[name], new_store[name][new_only]]) for name in STORE_FILES}
+    order = np.argsort(merged['concursos'], kind='stable')
+    return {name: array[order] for name, array in merged.items()}
+
+def store_to_dataframe(store):
+    """DataFrame de resultados (Concurso, Data, Bola1..Bola15, Mascara) a partir do histórico."""
+    mascaras = np.asarray(store['mascaras'], dtype=np.uint32)
+    df = pd.DataFrame(masks_to_draws(mascaras).astype(np.int64), columns=BOLAS)
+    df.insert(0, 'Concurso', np.asarray(store['concursos'], dtype=np.int64))
+    df.insert(1, 'Data', pd.to_datetime(np.asarray(store['datas'])).astype('datetime64[ns]'))
+    df['Mascara'] = mascaras
+    return df
+
+# --- SINCRONIZAÇÃO COM A API (SESSÃO, CONCORRÊNCIA E RETENTATIVAS) ---
+SYNC_TIMEOUT = (3.05, 30)     # (conexão, leitura) em segundos
+LATEST_TIMEOUT = (2, 5)       # consulta do último concurso: uma tentativa curta, sem retentativas
+SYNC_RETRIES = 4              # tentativas extras por requisição, com espera exponencial
+SYNC_BACKOFF = 0.5            # espera base: 0.5s, 1s, 2s, 4s...
+SYNC_WORKERS = 8              # requisições simultâneas (e conexões no pool da sessão)
+SYNC_BULK_THRESHOLD = 500     # acima de tantos concursos faltando, baixa o histórico completo de uma vez
+
+def make_session(max_workers=SYNC_WORKERS, retries=SYNC_RETRIES, backoff=SYNC_BACKOFF):
+    """Sessão HTTP com pool de conexões e retentativas com espera exponencial (erros 429/5xx e de conexão)."""
+    retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET']), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _get_json(session, path):
+    """GET em `{API_URL}/lotofacil{path}`; retorna (JSON, bytes recebidos)."""
+    response = session.get(f"{API_URL}/lotofacil{path}", timeout=SYNC_TIMEOUT)
+    response.raise_for_status()
+    return response.json(), len(response.content)
+
+def _count_request(metrics, nbytes):
+    metrics['requisicoes'] += 1
+    metrics['bytes'] += nbytes
+
+def fetch_latest_concurso(metrics):
+    """Número do concurso mais recente na API (uma requisição pequena).
+
+    Fica fora da sessão com retentativas: sem rede, a falha aparece em segundos e quem chamou
+    segue com o histórico local; as retentativas ficam para a busca dos concursos que faltam.
+    """
+    response = requests.get(f"{API_URL}/lotofacil/latest", timeout=LATEST_TIMEOUT)
+    response.raise_for_status()
+    _count_request(metrics, len(response.content))
+    return int(response.json()['concurso'])
+
+def missing_concursos(concursos, latest_concurso):
+    """Concursos de 1 a `latest_concurso` que não estão no histórico local (inclui lacunas internas)."""
+    return np.setdiff1d(np.arange(1, latest_concurso + 1), np.asarray(concursos, dtype=np.int64))
+
+def fetch_concursos(session, concursos, metrics, max_workers=SYNC_WORKERS):
+    """Busca os concursos informados em paralelo (pool limitado de threads sobre a mesma sessão).
+
+    Concursos que falham mesmo após as retentativas são contados em `metrics['falhas']` e
+    ficam para a próxima sincronização; os demais resultados são devolvidos.
+    """
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_get_json, session, f'/{int(concurso)}') for concurso in concursos]
+        for future in as_completed(futures):
+            try:
+                result, nbytes = future.result()
+            except (requests.exceptions.RequestException, ValueError):
+                metrics['falhas'] += 1
+                continue
+            _count_request(metrics, nbytes)
+            results.append(result)
+    return results
+
+def sync_history_store(data_dir=DATA_DIR, max_workers=SYNC_WORKERS, bulk_threshold=SYNC_BULK_THRESHOLD, session=None):
+    """Completa o histórico local com os concursos que faltam e devolve (histórico, métricas).
+
+    Consulta só o número do último concurso, calcula o que falta localmente e busca apenas
+    isso. Se faltarem mais de `bulk_threshold` concursos (ex.: primeira execução), baixa o
+    histórico completo numa única requisição. Se a API não responder, propaga
+    `requests.exceptions.RequestException`.
+    """
+    metrics = {'faltando': 0, 'baixados': 0, 'falhas': 0, 'requisicoes': 0, 'bytes': 0, 'segundos': 0.0, 'concursos_por_segundo': 0.0}
+    started = time.perf_counter()
+    session = session if session is not None else make_session(max_workers)
+    store = load_history_store(data_dir)
+    stored = store['concursos'] if store is not None else np.zeros(0, dtype=np.int32)
+    missing = missing_concursos(stored, fetch_latest_concurso(metrics))
+    metrics['faltando'] = len(missing)
+    if bulk_threshold is not None and len(missing) > bulk_threshold:
+        new_results, nbytes = _get_json(session, '')
+        _count_request(metrics, nbytes)
+    else:
+        new_results = fetch_concursos(session, missing, metrics, max_workers)
+    new_store = results_to_store(new_results)
+    new_store = {name: array[np.isin(new_store['concursos'], missing)] for name, array in new_store.items()}
+    metrics['baixados'] = len(new_store['concursos'])
+    if metrics['baixados']:
+        save_history_store(merge_stores(store, new_store), data_dir)
+        store = load_history_store(data_dir)
+    metrics['segundos'] = time.perf_counter() - started
+    metrics['concursos_por_segundo'] = metrics['baixados'] / metrics['segundos'] if metrics['segundos'] else 0.0
+    return store, metrics
+
+# --- HISTÓRICO IMUTÁVEL ---
+class Historico:
+    """Histórico completo, imutável e compartilhado por todas as sessões e páginas.
+
+    Guarda o DataFrame e os vetores somente leitura de concursos e máscaras. Consultas por
+    intervalo fazem busca binária em `concursos` e devolvem fatias (visões, sem cópia);
+    com o Copy-on-Write do pandas (ligado na importação deste módulo), alterar uma fatia
+    nunca altera o histórico.
+    """
+    __slots__ = ('df', 'concursos', 'mascaras', 'versao')
+
+    def __init__(self, df):
+        self.df = df
+        self.concursos = self._read_only(df['Concurso'] if not df.empty else np.zeros(0, dtype=np.int64))
+        self.mascaras = self._read_only(get_draw_masks(df) if not df.empty else np.zeros(0, dtype=np.uint32))
+        # Identifica o conteúdo: muda sempre que novos concursos são incorporados
+        self.versao = (int(self.concursos[-1]), len(self.concursos)) if len(self.concursos) else (0, 0)
+
+    @staticmethod
+    def _read_only(values):
+        array = np.asarray(values)
+        array.flags.writeable = False
+        return array
+
+    def __len__(self):
+        return len(self.concursos)
+
+    def bounds(self, start_concurso, end_concurso):
+        return _concurso_bounds(self.concursos, start_concurso, end_concurso)
+
+    def range(self, start_concurso, end_concurso):
+        """DataFrame do intervalo [start_concurso, end_concurso] como visão do histórico."""
+        lo, hi = self.bounds(start_concurso, end_concurso)
+        return self.df.iloc[lo:hi]
+
+    def range_masks(self, start_concurso, end_concurso):
+        """Máscaras do intervalo [start_concurso, end_concurso] (visão somente leitura)."""
+        lo, hi = self.bounds(start_concurso, end_concurso)
+        return self.mascaras[lo:hi]
+
+def load_history(data_dir=DATA_DIR, sync=True):
+    """Carrega o histórico local como Historico, completando-o pela API quando `sync`.
+
+    Retorna (historico, métricas da sincronização, erro de rede). Se a API falhar e houver
+    histórico local, ele é usado e o erro é devolvido; sem histórico local, o erro é propagado.
+    """
+    store, metrics, error = None, None, None
+    if sync:
+        try:
+            store, metrics = sync_history_store(data_dir)
+        except requests.exceptions.RequestException as e:
+            error = e
+    if store is None:
+        store = load_history_store(data_dir)
+        if store is None and error is not None:
+            raise error
+    df = store_to_dataframe(store) if store is not None and len(store['concursos']) else pd.DataFrame()
+    return Historico(df), metrics, error
+
+# FIM DO ARQUIVO engine/data.py
\ No newline at end of file
@@ -0,0 +1,138 @@
+# INÍCIO DO ARQUIVO engine/montecarlo.py
+"""Monte Carlo vetorizado e distribuição exata do prêmio total."""
+import math
+from itertools import product
+
+import numpy as np
+
+from engine.core import NUM_DEZENAS, DEZENAS_POR_JOGO, PREMIOS
+from engine.tracing import traced
+
+# --- SIMULAÇÃO DE MONTE CARLO (VETORIZADA) ---
+MC_CHUNK_SCENARIOS = 100_000  # cenários sorteados por lote; limita a memória em execuções de milhões
+
+def hit_rates_from_histogram(hit_counts):
+    """Taxas de acerto por faixa premiada (11-15) a partir do histograma de um backtest."""
+    hit_counts = np.asarray(hit_counts, dtype=np.int64)
+    total = hit_counts.sum()
+    return {points: (hit_counts[points] / total if total else 0.0) for points in PREMIOS}
+
+@traced('monte_carlo')
+def simulate_prize_histogram(hit_rates, num_simulations, games_per_simulation, rng=None, chunk_size=MC_CHUNK_SCENARIOS):
+    """Simula o prêmio total de cada cenário e devolve o histograma exato (valores, contagens).
+
+    Cada cenário sorteia, de uma vez, quantos jogos caíram em cada faixa (amostragem
+    multinomial). Os cenários são processados em lotes de `chunk_size` e cada lote é
+    fundido ao histograma acumulado, então a memória não cresce com `num_simulations`.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    rates = np.array([hit_rates.get(points, 0.0) for points in PREMIOS], dtype=np.float64)
+    if rates.sum() > 1:
+        rates = rates / rates.sum()
+    pvals = np.append(rates, max(0.0, 1.0 - rates.sum()))
+    prize_values = np.array(list(PREMIOS.values()) + [0], dtype=np.int64)
+    values = np.zeros(0, dtype=np.int64)
+    counts = np.zeros(0, dtype=np.int64)
+    for start in range(0, num_simulations, chunk_size):
+        size = min(chunk_size, num_simulations - start)
+        tier_counts = rng.multinomial(games_per_simulation, pvals, size=size)
+        chunk_values, chunk_counts = np.unique(tier_counts @ prize_values, return_counts=True)
+        values, inverse = np.unique(np.concatenate([values, chunk_values]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([counts, chunk_counts]), minlength=len(values)).astype(np.int64)
+    return values, counts
+
+def hypergeometric_hit_rates():
+    """Probabilidade exata de cada faixa premiada para um jogo qualquer contra um sorteio uniforme.
+
+    Para um sorteio uniforme de 15 entre 25, os acertos de um jogo fixo seguem a distribuição
+    hipergeométrica; o tamanho do pool de onde o jogo saiu não altera essa distribuição.
+    """
+    total = math.comb(NUM_DEZENAS, DEZENAS_POR_JOGO)
+    return {points: math.comb(DEZENAS_POR_JOGO, points) * math.comb(NUM_DEZENAS - DEZENAS_POR_JOGO, DEZENAS_POR_JOGO - points) / total
+            for points in PREMIOS}
+
+EXACT_GRID_LIMIT = 1_000_000  # maior soma (em unidades do MDC dos prêmios) tratada em grade densa
+EXACT_TAIL_TOL = 1e-15        # massa máxima descartada na cauda das faixas de prêmio alto (~resolução do float64)
+
+@traced('monte_carlo_exato')
+def exact_prize_distribution(hit_rates, games_per_simulation, prizes=PREMIOS, tail_tol=EXACT_TAIL_TOL):
+    """Distribuição exata do prêmio total de `games_per_simulation` jogos independentes.
+
+    As faixas de prêmio baixo são convoluídas numa grade densa (múltiplos do MDC dos prêmios),
+    um jogo por vez, com deslocamentos esparsos. As faixas de prêmio alto (cuja grade seria
+    grande demais) entram condicionando nas suas contagens, enumeradas até a massa
+    restante ficar abaixo de `tail_tol`. Faixas com taxa zero não entram em nenhuma das duas.
+    Retorna (valores do prêmio, probabilidades).
+    """
+    k = int(games_per_simulation)
+    rates = {points: float(hit_rates.get(points, 0.0)) for points in prizes}
+    tiers = sorted((points for points in prizes if rates[points] > 0), key=lambda points: prizes[points])
+    unit = math.gcd(*(int(prizes[points]) for points in tiers)) or 1
+    high = [points for points in tiers if prizes[points] // unit * k > EXACT_GRID_LIMIT]
+    low = [points for points in tiers if points not in high]
+    p_high = sum(rates[points] for points in high)
+    p_none = max(0.0, 1.0 - sum(rates.values()))
+
+    # Contagens possíveis das faixas altas, truncadas na cauda binomial de cada uma
+    caps = []
+    for points in high:
+        p, cum, pmf, cap = rates[points], 0.0, (1 - rates[points]) ** k, 0
+        while cap < k and 1.0 - (cum + pmf) > tail_tol:
+            cum += pmf
+            pmf *= (k - cap) / (cap + 1) * p / (1 - p)
+            cap += 1
+        caps.append(cap)
+    high_counts = [c for c in product(*(range(cap + 1) for cap in caps)) if sum(c) <= k]
+    needed = {k - sum(c) for c in high_counts}
+
+    # Potências da distribuição condicional de um jogo nas faixas baixas (0 = sem prêmio)
+    offsets = [0] + [prizes[points] // unit for points in low]
+    weights = np.array([p_none] + [rates[points] for points in low]) / max(1.0 - p_high, np.finfo(float).tiny)
+    low_powers = {}
+    dist = np.ones(1)
+    for m in range(k + 1):
+        if m in needed:
+            low_powers[m] = dist
+        if m == k:
+            break
+        grown = np.zeros(len(dist) + max(offsets))
+        for offset, weight in zip(offsets, weights):
+            grown[offset:offset + len(dist)] += weight * dist
+        dist = grown
+
+    values, probs = [], []
+    for counts in high_counts:
+        rest = k - sum(counts)
+        log_prob = math.lgamma(k + 1) - math.lgamma(rest + 1)
+        for points, c in zip(high, counts):
+            log_prob += c * math.log(rates[points]) - math.lgamma(c + 1)
+        log_prob += rest * math.log(1.0 - p_high) if rest else 0.0
+        dist = low_powers[rest]
+        values.append(np.arange(len(dist), dtype=np.int64) * unit + sum(c * prizes[points] for points, c in zip(high, counts)))
+        probs.append(math.exp(log_prob) * dist)
+    values, probs = np.concatenate(values), np.concatenate(probs)
+    keep = probs > 0
+    values, inverse = np.unique(values[keep], return_inverse=True)
+    return values, np.bincount(inverse, weights=probs[keep], minlength=len(values))
+
+def histogram_quantile(values, weights, q):
+    """Quantil(is) `q` de uma distribuição discreta dada por valores ordenados e pesos."""
+    cumulative = np.cumsum(weights, dtype=np.float64)
+    idx = np.searchsorted(cumulative, np.asarray(q) * cumulative[-1], side='left')
+    return values[np.minimum(idx, len(values) - 1)]
+
+def summarize_profit_distribution(prize_values, weights, cost):
+    """Resumo do lucro (prêmio - custo): percentis 5/50/95, probabilidade de lucro, média e desvio."""
+    profits = np.asarray(prize_values, dtype=np.float64) - cost
+    weights = np.asarray(weights, dtype=np.float64)
+    total = weights.sum()
+    mean = float((profits * weights).sum() / total)
+    p5, median, p95 = histogram_quantile(profits, weights, [0.05, 0.5, 0.95])
+    return {
+        'p5': float(p5), 'mediana': float(median), 'p95': float(p95),
+        'prob_lucro': float(weights[profits > 0].sum() / total),
+        'media': mean,
+        'desvio': float(np.sqrt((weights * (profits - mean) ** 2).sum() / total)),
+    }
+
+# FIM DO ARQUIVO engine/montecarlo.py
\ No newline at end of file
@@ -0,0 +1,147 @@
+# INÍCIO DO ARQUIVO engine/poolstore.py
+"""Armazenamento persistente (SQLite) dos pools do walk-forward, das estratégias salvas e dos alertas.
+
+Cada linha de `pools` é o pool de UMA estratégia, como máscara de 25 bits, para a chave
+(estratégia, parâmetros, primeiro concurso do intervalo, concurso alvo). O pool depende dos
+concursos de `inicio` até o anterior ao alvo, e esse prefixo pode mudar (a sincronização
+preenche lacunas internas): cada linha guarda a impressão digital do prefixo e só vale se
+ela for igual à do histórico atual; senão o pool é recalculado e sobrescrito. Pools de
+estratégias combinadas são a união (OR) das máscaras, então combinações diferentes
+reaproveitam as mesmas linhas. O arquivo fica no diretório do histórico local e é
+compartilhado por páginas, sessões, processos e reinícios; cada operação abre a própria
+conexão. Estratégias salvas e alertas pertencem a um dono (o identificador da sessão) e
+toda leitura ou gravação é filtrada por ele.
+"""
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import numpy as np
+
+from engine.strategies import ESTRATEGIAS
+
+POOL_STORE_FILE = 'pools.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pools (
+    estrategia TEXT NOT NULL,
+    parametros TEXT NOT NULL,
+    inicio INTEGER NOT NULL,
+    concurso INTEGER NOT NULL,
+    prefixo INTEGER NOT NULL,
+    mascara INTEGER NOT NULL,
+    PRIMARY KEY (estrategia, parametros, inicio, concurso)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS estrategias_salvas (
+    dono TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    config TEXT NOT NULL,
+    salva_em TEXT NOT NULL,
+    PRIMARY KEY (dono, nome)
+);
+CREATE TABLE IF NOT EXISTS alertas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dono TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    dezena INTEGER NOT NULL,
+    coluna INTEGER NOT NULL,
+    minimo INTEGER NOT NULL,
+    maximo INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alertas_dono ON alertas (dono, id);
+"""
+
+def connect(store):
+    """Conexão própria com o armazenamento, fechada ao sair do `with` (use `with connect(s) as conn, conn:` para gravar)."""
+    return closing(sqlite3.connect(store, timeout=30))
+
+def open_pool_store(data_dir):
+    """Cria (se preciso) o banco em `data_dir` e retorna o caminho, que identifica o armazenamento."""
+    os.makedirs(data_dir, exist_ok=True)
+    store = os.path.join(data_dir, POOL_STORE_FILE)
+    with connect(store) as conn:
+        conn.execute('PRAGMA journal_mode=WAL')  # leitores não esperam a gravação de pools novos
+        # Arquivos anteriores à impressão digital do prefixo: a tabela é só cache, então é refeita
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(pools)')]
+        if columns and 'prefixo' not in columns:
+            conn.execute('DROP TABLE pools')
+        # Estratégias salvas antes de haver dono ficam com dono vazio, que nenhuma sessão usa
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(estrategias_salvas)')]
+        if columns and 'dono' not in columns:
+            conn.execute('ALTER TABLE estrategias_salvas RENAME TO estrategias_salvas_sem_dono')
+            conn.executescript(_SCHEMA)
+            conn.execute("INSERT INTO estrategias_salvas SELECT '', nome, config, salva_em FROM estrategias_salvas_sem_dono")
+            conn.execute('DROP TABLE estrategias_salvas_sem_dono')
+            conn.commit()
+        conn.executescript(_SCHEMA)
+    return store
+
+# --- POOLS POR CONCURSO ---
+def strategy_params_key(strategy_name, params):
+    """Parâmetros que afetam `strategy_name` (com os padrões preenchidos), como texto canônico."""
+    _, param_spec = ESTRATEGIAS[strategy_name]
+    return json.dumps({key: int(params.get(key, default)) for key, _, default in param_spec}, sort_keys=True)
+
+def prefix_fingerprints(concursos, masks):
+    """Impressão digital de 64 bits do prefixo de cada posição (concursos antes dela no intervalo).
+
+    Soma acumulada (módulo 2^64) de um embaralhamento de (concurso, máscara): preencher uma
+    lacuna ou trocar um resultado muda a impressão de todas as posições seguintes.
+    """
+    mixed = (np.asarray(concursos, dtype=np.uint64) << np.uint64(32)) | np.asarray(masks, dtype=np.uint64)
+    mixed *= np.uint64(0x9E3779B97F4A7C15)
+    mixed ^= mixed >> np.uint64(29)
+    prefixes = np.zeros(len(mixed), dtype=np.uint64)
+    np.cumsum(mixed[:-1], out=prefixes[1:])
+    return prefixes.view(np.int64)
+
+def read_pool_masks(store, strategy_name, params_key, inicio, concursos, prefixos):
+    """Pools guardados para os concursos alvo `concursos` (crescentes) cujo prefixo tem a impressão
+    `prefixos`: retorna (encontrados, máscaras). Linhas de um prefixo diferente contam como ausentes."""
+    concursos = np.asarray(concursos, dtype=np.int64)
+    prefixos = np.asarray(prefixos, dtype=np.int64)
+    found = np.zeros(len(concursos), dtype=bool)
+    masks = np.zeros(len(concursos), dtype=np.uint32)
+    if not len(concursos):
+        return found, masks
+    with connect(store) as conn:
+        rows = conn.execute(
+            'SELECT concurso, prefixo, mascara FROM pools WHERE estrategia = ? AND parametros = ? AND inicio = ? AND concurso BETWEEN ? AND ?',
+            (strategy_name, params_key, int(inicio), int(concursos[0]), int(concursos[-1]))).fetchall()
+    if rows:
+        stored = np.array(rows, dtype=np.int64)
+        positions = np.searchsorted(concursos, stored[:, 0])
+        valid = positions < len(concursos)
+        valid[valid] = (concursos[positions[valid]] == stored[valid, 0]) & (prefixos[positions[valid]] == stored[valid, 1])
+        found[positions[valid]] = True
+        masks[positions[valid]] = stored[valid, 2]
+    return found, masks
+
+def write_pool_masks(store, strategy_name, params_key, inicio, concursos, prefixos, masks):
+    """Grava (ou sobrescreve, se o prefixo mudou) os pools dos concursos alvo."""
+    rows = zip(np.asarray(concursos).tolist(), np.asarray(prefixos, dtype=np.int64).tolist(), np.asarray(masks).tolist())
+    with connect(store) as conn, conn:
+        conn.executemany('INSERT OR REPLACE INTO pools VALUES (?, ?, ?, ?, ?, ?)',
+                         [(strategy_name, params_key, int(inicio), concurso, prefixo, mask) for concurso, prefixo, mask in rows])
+
+# --- ESTRATÉGIAS SALVAS (POR DONO) ---
+def save_strategy_config(store, dono, name, config):
+    with connect(store) as conn, conn:
+        conn.execute('INSERT OR REPLACE INTO estrategias_salvas VALUES (?, ?, ?, ?)',
+                     (dono, name, json.dumps(config, ensure_ascii=False, default=int), datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+
+def load_strategy_configs(store, dono):
+    """Estratégias salvas de `dono`, na ordem em que foram salvas: {nome: {'config': ..., 'saved_at': ...}}."""
+    with connect(store) as conn:
+        rows = conn.execute('SELECT nome, config, salva_em FROM estrategias_salvas WHERE dono = ? ORDER BY salva_em, nome',
+                            (dono,)).fetchall()
+    return {name: {'config': json.loads(config), 'saved_at': saved_at} for name, config, saved_at in rows}
+
+def delete_strategy_config(store, dono, name):
+    with connect(store) as conn, conn:
+        conn.execute('DELETE FROM estrategias_salvas WHERE dono = ? AND nome = ?', (dono, name))
+
+# FIM DO ARQUIVO engine/poolstore.py
\ No newline at end of file
@@ -0,0 +1,91 @@
+# INÍCIO DO ARQUIVO engine/stats.py
+"""Estatísticas do histórico: motor de atrasos e índice de frequências por somas acumuladas."""
+import numpy as np
+
+from engine.core import NUM_DEZENAS, get_draws_array, get_incidence_matrix, count_numbers
+
+# --- MOTOR DE ATRASOS ---
+def build_delay_table(df):
+    """Calcula, em uma única passada vetorizada, a tabela de atrasos do histórico.
+
+    Retorna (last_seen, delays), matrizes int32 (concursos x 25): last_seen[i, n - 1] é a
+    posição da última aparição da dezena n até o concurso i (-1 se ainda não saiu) e
+    delays[i, n - 1] é o atraso da dezena n logo após o concurso i.
+    """
+    incidence = get_incidence_matrix(df)
+    positions = np.arange(len(incidence), dtype=np.int32)[:, None]
+    last_seen = np.maximum.accumulate(np.where(incidence == 1, positions, np.int32(-1)), axis=0)
+    return last_seen, positions - last_seen
+
+def delays_at(delays, end_pos, start_pos=0):
+    """Atrasos após a posição end_pos, contando apenas a janela iniciada em start_pos (O(1))."""
+    if end_pos < start_pos:
+        return np.zeros(NUM_DEZENAS, dtype=np.int32)
+    return np.minimum(delays[end_pos], end_pos - start_pos + 1)
+
+def _current_delays(incidence):
+    """Atraso de cada dezena após a última linha da matriz de incidência."""
+    num_rows = len(incidence)
+    if num_rows == 0:
+        return np.zeros(NUM_DEZENAS, dtype=np.int32)
+    last_seen = np.where(incidence.any(axis=0), num_rows - 1 - np.argmax(incidence[::-1], axis=0), -1)
+    return (num_rows - 1 - last_seen).astype(np.int32)
+
+def get_delays(df):
+    """Atraso atual (em concursos) de cada dezena no DataFrame (índice 0 = dezena 1)."""
+    return _current_delays(get_incidence_matrix(df))
+
+# --- FUNÇÕES AUXILIARES ---
+def get_all_numbers(df):
+    """Retorna uma lista com todas as dezenas sorteadas em um DataFrame."""
+    if df.empty:
+        return []
+    return np.sort(get_draws_array(df), axis=None).tolist()
+
+def _top_indices(scores, top_n, only_positive=False):
+    """Índices dos maiores scores (maior primeiro; empate favorece o menor índice)."""
+    scores = np.asarray(scores)
+    order = np.argsort(-scores, kind='stable')
+    if only_positive:
+        order = order[scores[order] > 0]
+    return order[:top_n]
+
+def _rank_numbers(scores, top_n, only_positive=False):
+    """Ordena as dezenas pelo score (índice 0 = dezena 1)."""
+    return (_top_indices(scores, top_n, only_positive) + 1).tolist()
+
+# --- ÍNDICE DE FREQUÊNCIAS (SOMAS ACUMULADAS) ---
+# Grupo de cada dezena (índice 0 = dezena 1) nos agregados derivados
+GRUPOS_FREQUENCIA = {
+    'finais': (np.arange(1, NUM_DEZENAS + 1) % 10, 10),
+    'linhas': (np.arange(NUM_DEZENAS) // 5, 5),
+    'colunas': (np.arange(NUM_DEZENAS) % 5, 5),
+}
+
+def summarize_counts(dezenas_counts):
+    """Monta o dicionário de contagens (dezenas, finais, linhas e colunas) a partir das dezenas."""
+    dezenas_counts = np.asarray(dezenas_counts)
+    counts = {'dezenas': dezenas_counts}
+    for name, (groups, size) in GRUPOS_FREQUENCIA.items():
+        counts[name] = dezenas_counts @ np.eye(size, dtype=dezenas_counts.dtype)[groups]
+    return counts
+
+def build_frequency_index(df):
+    """Constrói as contagens acumuladas por concurso ((concursos + 1) x grupos, primeira linha zerada).
+
+    A frequência de qualquer janela de posições [lo, hi) é index[k][hi] - index[k][lo].
+    """
+    incidence = get_incidence_matrix(df)
+    dezenas = np.zeros((len(incidence) + 1, NUM_DEZENAS), dtype=np.int32)
+    np.cumsum(incidence, axis=0, dtype=np.int32, out=dezenas[1:])
+    return summarize_counts(dezenas)
+
+def window_counts(index, start_pos, end_pos):
+    """Contagens das posições [start_pos, end_pos) do índice (uma subtração por agregado)."""
+    return {name: cumulative[end_pos] - cumulative[start_pos] for name, cumulative in index.items()}
+
+def frequency_counts(df):
+    """Contagens (dezenas, finais, linhas e colunas) de todo o DataFrame."""
+    return summarize_counts(count_numbers(df))
+
+# FIM DO ARQUIVO engine/stats.py
\ No newline at end of file
@@ -0,0 +1,105 @@
+# INÍCIO DO ARQUIVO engine/strategies.py
+"""Estratégias (protocolos de análise): pools de dezenas a partir de contagens e atrasos."""
+import numpy as np
+
+from engine.core import NUM_DEZENAS
+from engine.stats import _top_indices, _rank_numbers, frequency_counts, get_delays
+from engine.tracing import traced
+
+# --- ESTRATÉGIAS / PROTOCOLOS DE ANÁLISE ---
+# As funções pool_* trabalham sobre contagens/atrasos já calculados (índices acima);
+# as funções estrategia_* recebem um DataFrame e delegam para elas.
+PRIMOS = [2, 3, 5, 7, 11, 13, 17, 19, 23]
+FIBONACCI = [1, 2, 3, 5, 8, 13, 21]
+
+def pool_frequencia(counts, top_n=25):
+    return sorted(_rank_numbers(counts['dezenas'], top_n, only_positive=True))
+
+def pool_atraso(delays, top_n=25):
+    return _rank_numbers(delays, top_n)
+
+def pool_finais(counts, top_n_finais=5):
+    selected_finais = _top_indices(counts['finais'], top_n_finais, only_positive=True).tolist()
+    return [num for num in range(1, NUM_DEZENAS + 1) if num % 10 in selected_finais]
+
+def pool_primos(counts):
+    outros = pool_frequencia(counts, top_n=25 - len(PRIMOS))
+    return sorted(set(PRIMOS + outros))
+
+def pool_fibonacci(counts):
+    outros = pool_frequencia(counts, top_n=25 - len(FIBONACCI))
+    return sorted(set(FIBONACCI + outros))
+
+def pool_linhas_colunas(counts, mode='row'):
+    if not counts['dezenas'].any(): return []
+    # Cartão 5x5: linha = (n - 1) // 5, coluna = (n - 1) % 5
+    if mode == 'row':
+        most_frequent_row = int(np.argmax(counts['linhas']))
+        return list(range(most_frequent_row * 5 + 1, most_frequent_row * 5 + 6))
+    else:
+        most_frequent_col = int(np.argmax(counts['colunas']))
+        return list(range(most_frequent_col + 1, NUM_DEZENAS + 1, 5))
+
+def pool_alpha_envolve(counts, delays, freq_n=15, atraso_n=10):
+    freq_nums = set(pool_frequencia(counts, top_n=freq_n))
+    atraso_nums = set(pool_atraso(delays, top_n=atraso_n))
+    return sorted(freq_nums.union(atraso_nums))[:25]
+
+def estrategia_frequencia(df, top_n=25):
+    if df.empty: return []
+    return pool_frequencia(frequency_counts(df), top_n)
+
+def estrategia_atraso(df, top_n=25):
+    if df.empty:
+        return list(range(1, NUM_DEZENAS + 1))
+    return pool_atraso(get_delays(df), top_n)
+
+def estrategia_finais(df, top_n_finais=5):
+    if df.empty: return []
+    return pool_finais(frequency_counts(df), top_n_finais)
+
+def estrategia_primos(df):
+    if df.empty: return sorted(PRIMOS)
+    return pool_primos(frequency_counts(df))
+
+def estrategia_fibonacci(df):
+    if df.empty: return sorted(FIBONACCI)
+    return pool_fibonacci(frequency_counts(df))
+
+def estrategia_linhas_colunas(df, mode='row'):
+    if df.empty: return []
+    return pool_linhas_colunas(frequency_counts(df), mode)
+
+def estrategia_alpha_envolve(df, freq_n=15, atraso_n=10):
+    if df.empty:
+        return sorted(set(estrategia_atraso(df, top_n=atraso_n)))[:25]
+    return pool_alpha_envolve(frequency_counts(df), get_delays(df), freq_n, atraso_n)
+
+# Nomes exibidos nas páginas -> função pool_* e parâmetros (chave em `params`, argumento, padrão)
+ESTRATEGIAS = {
+    "Frequência": (pool_frequencia, [('top_n_freq', 'top_n', 25)]),
+    "Atraso": (pool_atraso, [('top_n_atraso', 'top_n', 25)]),
+    "Finais (Último Dígito)": (pool_finais, [('top_n_finais', 'top_n_finais', 5)]),
+    "Números Primos": (pool_primos, []),
+    "Sequência de Fibonacci": (pool_fibonacci, []),
+    "Linhas do Cartão": (lambda counts: pool_linhas_colunas(counts, mode='row'), []),
+    "Colunas do Cartão": (lambda counts: pool_linhas_colunas(counts, mode='col'), []),
+    "Alpha Envolve (Híbrido)": (pool_alpha_envolve, [('alpha_freq_n', 'freq_n', 15), ('alpha_atraso_n', 'atraso_n', 10)]),
+}
+
+@traced('pool', rows=len)
+def build_pool(strategy_names, params, counts, delays):
+    """Une os pools das estratégias selecionadas a partir de contagens e atrasos pré-calculados."""
+    combined_pool = set()
+    for strategy_name in strategy_names:
+        pool_func, param_spec = ESTRATEGIAS[strategy_name]
+        kwargs = {arg: params.get(key, default) for key, arg, default in param_spec}
+        if strategy_name == "Atraso":
+            combined_pool.update(pool_func(delays, **kwargs))
+        elif strategy_name == "Alpha Envolve (Híbrido)":
+            combined_pool.update(pool_func(counts, delays, **kwargs))
+        else:
+            combined_pool.update(pool_func(counts, **kwargs))
+    return sorted(combined_pool)
+
+# FIM DO ARQUIVO engine/strategies.py
\ No newline at end of file
@@ -0,0 +1,81 @@
+# INÍCIO DO ARQUIVO engine/tickets.py
+"""Conferência de bilhetes em massa (leitura vetorizada de arquivos CSV/TXT)."""
+import re
+
+import numpy as np
+import pandas as pd
+
+from engine.core import (
+    NUM_DEZENAS, DEZENAS_POR_JOGO, PREMIOS, BITS_DEZENAS, popcount, masks_to_draws, score_tiers_per_game
+)
+from engine.tracing import traced
+
+# --- CONFERÊNCIA DE BILHETES EM MASSA ---
+_TICKET_SEPARATORS = re.compile(r'[,; \t]+')
+_TICKET_TOKENS = {spelling: num for num in range(1, NUM_DEZENAS + 1) for spelling in (str(num), f'{num:02d}')}
+
+def parse_tickets(content):
+    """Lê bilhetes de um CSV/texto (um por linha, dezenas separadas por vírgula, ';' ou espaço).
+
+    A validação é feita em lote sobre o vetor de todas as dezenas do arquivo. Linhas sem
+    nenhum número (cabeçalho, linhas em branco) são ignoradas. Retorna (máscaras dos bilhetes
+    válidos, número da linha de cada um, lista de (linha, motivo) dos inválidos).
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig', errors='replace')
+    # O mesmo split() conta e extrai as dezenas de cada linha (qualquer espaço em branco separa)
+    lines = [line.split() for line in _TICKET_SEPARATORS.sub(' ', content).splitlines()]
+    sizes = np.array([len(line) for line in lines], dtype=np.int64)
+    tokens = [token for line in lines for token in line]
+    values = np.fromiter((_TICKET_TOKENS.get(token, 0) for token in tokens), dtype=np.int64, count=len(tokens))
+    numeric = np.fromiter((token.isdigit() for token in tokens), dtype=bool, count=len(tokens))
+    line_ids = np.repeat(np.arange(len(lines)), sizes)
+
+    in_range = values > 0
+    has_number = np.bincount(line_ids, weights=numeric, minlength=len(lines)) > 0
+    all_valid = np.bincount(line_ids, weights=~in_range, minlength=len(lines)) == 0
+    bits = np.where(in_range, BITS_DEZENAS[np.maximum(values, 1) - 1], np.uint32(0))
+    masks = np.zeros(len(lines), dtype=np.uint32)
+    non_empty = sizes > 0
+    if non_empty.any():
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])[non_empty]
+        masks[non_empty] = np.bitwise_or.reduceat(bits, starts)
+    distinct = popcount(masks)
+
+    valid = has_number & all_valid & (sizes == DEZENAS_POR_JOGO) & (distinct == DEZENAS_POR_JOGO)
+    invalid = []
+    for line in np.flatnonzero(has_number & ~valid).tolist():
+        if not all_valid[line]:
+            reason = "contém valores fora de 1-25 ou não numéricos"
+        elif sizes[line] != DEZENAS_POR_JOGO:
+            reason = f"tem {sizes[line]} dezenas (esperado 15)"
+        else:
+            reason = "tem dezenas repetidas"
+        invalid.append((line + 1, reason))
+    return masks[valid], np.flatnonzero(valid) + 1, invalid
+
+@traced('conferencia', rows=lambda result: len(result[0]))
+def verify_tickets(ticket_masks, contest_masks, line_numbers=None):
+    """Confere cada bilhete contra todos os concursos informados.
+
+    Retorna (DataFrame por bilhete, total de ocorrências por faixa 0-15). Com um único
+    concurso o DataFrame traz os acertos; com vários, as faixas premiadas por bilhete.
+    """
+    ticket_masks = np.asarray(ticket_masks, dtype=np.uint32)
+    tiers = score_tiers_per_game(ticket_masks, contest_masks)
+    if line_numbers is None:
+        line_numbers = np.arange(1, len(ticket_masks) + 1)
+    results = pd.DataFrame({
+        'Linha': line_numbers,
+        'Dezenas': [' '.join(f'{num:02d}' for num in draw) for draw in masks_to_draws(ticket_masks).tolist()],
+    })
+    if len(contest_masks) == 1:
+        results['Acertos'] = tiers.argmax(axis=1)
+    else:
+        results['Melhor Acerto'] = DEZENAS_POR_JOGO - np.argmax(tiers[:, ::-1] > 0, axis=1)
+        for points in PREMIOS:
+            results[f"{points} Pontos"] = tiers[:, points]
+    results['Prêmio (R$)'] = tiers[:, list(PREMIOS)] @ np.array(list(PREMIOS.values()), dtype=np.float64)
+    return results, tiers.sum(axis=0)
+
+# FIM DO ARQUIVO engine/tickets.py
\ No newline at end of file
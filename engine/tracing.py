@@ -0,0 +1,139 @@
+# INÍCIO DO ARQUIVO engine/tracing.py
+"""Instrumentação leve: duração, linhas e acertos de cache por etapa, num buffer circular.
+
+Ligada pela variável de ambiente LOTOFACIL_TRACE=1 (ou `set_tracing(True)`). Desligada,
+`trace()` devolve um contexto vazio compartilhado e `traced` chama a função direto, então o
+custo é uma leitura de variável global por chamada. O buffer é do processo (todas as sessões).
+"""
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+TRACE_CAPACITY = 20_000  # registros mantidos; os mais antigos são descartados
+PERCENTIS = (50, 90, 99)
+
+_enabled = os.environ.get('LOTOFACIL_TRACE', '').lower() in ('1', 'true', 'sim')
+# Cada registro: (início em segundos desde a época, etapa, duração em segundos, linhas, 'hit'/'miss'/None)
+_records = deque(maxlen=TRACE_CAPACITY)
+_local = threading.local()
+
+# --- LIGAR / DESLIGAR ---
+def tracing_enabled():
+    return _enabled
+
+def set_tracing(enabled):
+    """Liga ou desliga a coleta (os registros já feitos são mantidos)."""
+    global _enabled
+    _enabled = bool(enabled)
+
+# --- MEDIÇÃO ---
+class _Span:
+    """Etapa em andamento; `rows` e `cache` podem ser preenchidos dentro do bloco."""
+    __slots__ = ('stage', 'rows', 'cache', 'started', 'wall')
+
+    def __init__(self, stage, rows=None, cached=False):
+        self.stage, self.rows, self.cache = stage, rows, 'hit' if cached else None
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.wall, self.started = time.time(), time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        _local.stack.pop()
+        _records.append((self.wall, self.stage, elapsed, self.rows, self.cache))
+        return False
+
+
+class _NoSpan:
+    """Contexto vazio usado quando a coleta está desligada."""
+    __slots__ = ()
+    rows = cache = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+def trace(stage, rows=None, cached=False):
+    """Contexto que mede o bloco como `stage`.
+
+    Com `cached=True` o registro conta como acerto de cache, a menos que `cache_miss()`
+    seja chamado dentro do bloco (no corpo da função em cache, que só roda quando falta).
+    """
+    return _Span(stage, rows, cached) if _enabled else _NO_SPAN
+
+def cache_miss():
+    """Marca a etapa em cache mais interna desta thread como falta de cache."""
+    if _enabled:
+        for span in reversed(getattr(_local, 'stack', ())):
+            if span.cache is not None:
+                span.cache = 'miss'
+                return
+
+def traced(stage, rows=None):
+    """Decorador de `trace`; `rows(resultado)` opcional dá a quantidade de linhas do registro."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(stage) as span:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    span.rows = rows(result)
+                return result
+        return wrapper
+    return decorator
+
+# --- CONSULTA E EXPORTAÇÃO ---
+def trace_records():
+    """Cópia dos registros do buffer, do mais antigo ao mais recente, como dicts."""
+    return [
+        {'inicio': wall, 'etapa': stage, 'ms': seconds * 1000, 'linhas': rows, 'cache': cache}
+        for wall, stage, seconds, rows, cache in list(_records)
+    ]
+
+def clear_traces():
+    _records.clear()
+
+def stage_summary(records=None):
+    """Uma linha por etapa: chamadas, percentis e máximo (ms), total, acertos/faltas de cache e linhas."""
+    import numpy as np
+
+    records = trace_records() if records is None else records
+    by_stage = {}
+    for record in records:
+        by_stage.setdefault(record['etapa'], []).append(record)
+    summary = []
+    for stage, stage_records in sorted(by_stage.items()):
+        durations = np.array([record['ms'] for record in stage_records])
+        row = {'etapa': stage, 'chamadas': len(stage_records)}
+        row.update({f'p{q}_ms': float(value) for q, value in zip(PERCENTIS, np.percentile(durations, PERCENTIS))})
+        row['max_ms'] = float(durations.max())
+        row['total_ms'] = float(durations.sum())
+        row['cache_hit'] = sum(record['cache'] == 'hit' for record in stage_records)
+        row['cache_miss'] = sum(record['cache'] == 'miss' for record in stage_records)
+        row['linhas'] = sum(record['linhas'] or 0 for record in stage_records)
+        summary.append(row)
+    return summary
+
+def export_traces():
+    """Resumo por etapa e registros brutos, prontos para `json.dumps`."""
+    records = trace_records()
+    return {'capacidade': TRACE_CAPACITY, 'resumo': stage_summary(records), 'registros': records}
+
+# FIM DO ARQUIVO engine/tracing.py
\ No newline at end of file
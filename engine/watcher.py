@@ -0,0 +1,91 @@
+# INÍCIO DO ARQUIVO engine/watcher.py
+"""Vigia de concursos: thread de fundo que mantém o histórico atualizado sem bloquear leitores.
+
+Leitores usam sempre `watcher.history` (o Historico atual, imutável). A cada `interval`
+segundos a thread consulta o último concurso na API; se houver concursos novos, eles são
+gravados no histórico local e um novo Historico substitui o anterior numa única atribuição.
+Como `Historico.versao` muda, todo cache indexado por ela é invalidado na hora certa; até
+lá os leitores continuam recebendo o histórico anterior (stale-while-revalidate).
+
+Para testar contra o servidor local: LOTOFACIL_API_URL=http://127.0.0.1:8765/api e
+`python tools/stub_api.py --latest 3400 --publish-every 10`, depois `python -m engine vigiar --intervalo 5`.
+"""
+import os
+import threading
+import time
+
+import requests
+
+from engine.data import DATA_DIR, Historico, load_history, make_session, store_to_dataframe, sync_history_store
+from engine.tracing import trace
+
+WATCH_INTERVAL = float(os.environ.get('LOTOFACIL_WATCH_INTERVAL', 300))  # segundos entre verificações
+
+
+class HistoryWatcher:
+    """Dono do histórico compartilhado do processo e da thread que o revalida."""
+
+    def __init__(self, data_dir=DATA_DIR, interval=WATCH_INTERVAL, on_update=None):
+        self.data_dir = data_dir
+        self.interval = interval
+        self.on_update = on_update  # chamado como on_update(historico, métricas) quando chegam concursos
+        self.history = load_history(data_dir, sync=False)[0]
+        self.last_check = None
+        self.last_error = None
+        self.last_metrics = None
+        self._session = make_session()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll_once(self):
+        """Uma verificação síncrona; retorna True se o histórico foi substituído.
+
+        Falhas de rede ficam em `last_error` e o histórico atual continua valendo.
+        """
+        with self._lock:
+            try:
+                with trace('vigia') as span:
+                    store, metrics = sync_history_store(self.data_dir, session=self._session)
+                    span.rows = metrics['baixados']
+            except requests.exceptions.RequestException as e:
+                self.last_error, self.last_check = e, time.time()
+                return False
+            self.last_error, self.last_metrics, self.last_check = None, metrics, time.time()
+            stored = 0 if store is None else len(store['concursos'])
+            if stored == len(self.history):
+                return False
+            self.history = Historico(store_to_dataframe(store))
+        if self.on_update is not None:
+            self.on_update(self.history, metrics)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:  # a thread não pode morrer por um erro inesperado (ex.: disco)
+                self.last_error, self.last_check = e, time.time()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def start(self):
+        """Inicia a thread (a primeira verificação é imediata); chamadas repetidas não duplicam a thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='lotofacil-vigia', daemon=True)
+            self._thread.start()
+        return self
+
+    def refresh(self):
+        """Antecipa a próxima verificação (não espera por ela)."""
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+# FIM DO ARQUIVO engine/watcher.py
\ No newline at end of file
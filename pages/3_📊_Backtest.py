@@ -1,104 +1,203 @@
-# pages/3_📊_Backtest.py
-
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import (
-    fetch_data_from_api, estrategia_frequencia, estrategia_atraso,
-    estrategia_finais, estrategia_primos, estrategia_fibonacci,
-    estrategia_linhas_colunas, estrategia_alpha_envolve,
-    generate_games
-)
-
-st.set_page_config(page_title="Backtest", page_icon="📊", layout="wide")
-
-st.title("📊 Backtest de Estratégias")
-st.markdown("Teste o desempenho de combinações de estratégias em concursos passados.")
-
-st.sidebar.header("⚙️ Configurações de Backtest")
-start_concurso_bt = st.sidebar.number_input("Concurso Inicial", min_value=1, value=2000, key="bt_start")
-end_concurso_bt = st.sidebar.number_input("Concurso Final", min_value=1, value=2200, key="bt_end")
-df_bt = fetch_data_from_api(start_concurso_bt, end_concurso_bt)
-
-if not df_bt.empty:
-    st.sidebar.success(f"Carregados {len(df_bt)} concursos para o backtest!")
-    
-    strategy_map = {
-        "Frequência": estrategia_frequencia, "Atraso": estrategia_atraso,
-        "Finais (Último Dígito)": estrategia_finais, "Números Primos": estrategia_primos,
-        "Sequência de Fibonacci": estrategia_fibonacci, "Linhas do Cartão": lambda df: estrategia_linhas_colunas(df, mode='row'),
-        "Colunas do Cartão": lambda df: estrategia_linhas_colunas(df, mode='col'), "Alpha Envolve (Híbrido)": estrategia_alpha_envolve
-    }
-    
-    selected_strategy_names_bt = st.sidebar.multiselect("Escolha as estratégias para o backtest:", list(strategy_map.keys()), default=["Frequência"])
-    
-    params_bt = {}
-    with st.sidebar.expander("🔧 Refinar Parâmetros do Backtest"):
-        if "Frequência" in selected_strategy_names_bt:
-            params_bt['top_n_freq'] = st.slider("Top N Frequência:", 10, 25, 20, key="bt_freq")
-        if "Atraso" in selected_strategy_names_bt:
-            params_bt['top_n_atraso'] = st.slider("Top N Atraso:", 5, 25, 15, key="bt_atraso")
-        if "Alpha Envolve (Híbrido)" in selected_strategy_names_bt:
-            params_bt['alpha_freq_n'] = st.slider("Alpha Envolve (N Frequência):", 5, 20, 15, key="bt_alpha_freq")
-            params_bt['alpha_atraso_n'] = st.slider("Alpha Envolve (N Atraso):", 5, 20, 10, key="bt_alpha_atraso")
-
-    num_games_per_draw = st.sidebar.number_input("Jogos por Concurso:", min_value=1, max_value=100, value=10)
-    max_draws_for_test = len(df_bt) - 1
-    num_draws_to_test = st.sidebar.slider("Quantos concursos analisar:", 10, max_draws_for_test, min(100, max_draws_for_test))
-    run_backtest_btn = st.sidebar.button("Executar Backtest", key="run_bt")
-
-    def run_backtest(df, strategy_names, params, num_games_per_draw, num_draws_to_test):
-        if len(df) < num_draws_to_test + 1:
-            st.error(f"Não há dados suficientes. Necessário pelo menos {num_draws_to_test + 1} concursos.")
-            return {}, 0, 0
-        st.info(f"Executando backtest para os últimos {num_draws_to_test} concursos...")
-        results = {f"{i} Pontos": 0 for i in range(11, 16)}
-        total_cost, total_prize = 0, 0
-        prizes = {11: 10, 12: 25, 13: 100, 14: 2000, 15: 2000000}
-        
-        for i in range(num_draws_to_test):
-            historical_df = df.iloc[:-(num_draws_to_test - i)]
-            target_draw = df.iloc[-(num_draws_to_test - i)]
-            target_numbers = set(target_draw[[f'Bola{j}' for j in range(1, 16)]].values)
-            
-            combined_pool = set()
-            for strategy_name in strategy_names:
-                strategy_func = strategy_map[strategy_name]
-                if strategy_name == "Frequência":
-                    pool_from_strategy = set(strategy_func(historical_df.copy(), top_n=params.get('top_n_freq', 25)))
-                elif strategy_name == "Atraso":
-                    pool_from_strategy = set(strategy_func(historical_df.copy(), top_n=params.get('top_n_atraso', 25)))
-                elif strategy_name == "Alpha Envolve (Híbrido)":
-                    pool_from_strategy = set(strategy_func(historical_df.copy(), freq_n=params.get('alpha_freq_n', 15), atraso_n=params.get('alpha_atraso_n', 10)))
-                else:
-                    pool_from_strategy = set(strategy_func(historical_df.copy()))
-                combined_pool.update(pool_from_strategy)
-            pool = sorted(list(combined_pool))
-            
-            generated_games = generate_games(pool, num_games_per_draw)
-            total_cost += len(generated_games) * 2.5
-            for game in generated_games:
-                hits = len(set(game) & target_numbers)
-                if hits >= 11:
-                    results[f"{hits} Pontos"] += 1
-                    total_prize += prizes.get(hits, 0)
-        return results, total_cost, total_prize
-
-    if run_backtest_btn and selected_strategy_names_bt:
-        st.header("📈 Resultados do Backtest")
-        results, cost, prize = run_backtest(df_bt, selected_strategy_names_bt, params_bt, num_games_per_draw, num_draws_to_test)
-        if results:
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Custo Total (R$)", f"R$ {cost:.2f}")
-            col2.metric("Prêmio Estimado (R$)", f"R$ {prize:.2f}")
-            col3.metric("Resultado Líquido (R$)", f"R$ {prize - cost:.2f}", delta=f"R$ {prize - cost:.2f}")
-            st.subheader("Distribuição de Acertos")
-            if not any(results.values()):
-                st.warning("Nenhuma premiação encontrada no período testado.")
-            else:
-                results_df = pd.DataFrame(list(results.items()), columns=['Faixa de Acerto', 'Vezes'])
-                fig_results = px.bar(results_df, x='Faixa de Acerto', y='Vezes', title='Quantidade de Prêmios por Faixa')
-                st.plotly_chart(fig_results, use_container_width=True)
\ No newline at end of file
+# pages/3_📊_Backtest.py
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import sys
+import os
+from itertools import combinations
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import (
+    fetch_data_from_api, ESTRATEGIAS, PREMIOS, CUSTO_JOGO, backtest_history,
+    expected_value_backtest, build_sweep_grid, run_parameter_sweep, build_optimizer_candidates, optimizer_windows, successive_halving,
+    save_strategy, get_pool_store, show_chart
+)
+
+st.set_page_config(page_title="Backtest", page_icon="📊", layout="wide")
+
+st.title("📊 Backtest de Estratégias")
+st.markdown("Teste o desempenho de combinações de estratégias em concursos passados.")
+
+st.sidebar.header("⚙️ Configurações de Backtest")
+start_concurso_bt = st.sidebar.number_input("Concurso Inicial", min_value=1, value=2000, key="bt_start")
+end_concurso_bt = st.sidebar.number_input("Concurso Final", min_value=1, value=2200, key="bt_end")
+df_bt = fetch_data_from_api(start_concurso_bt, end_concurso_bt)
+
+if not df_bt.empty:
+    st.sidebar.success(f"Carregados {len(df_bt)} concursos para o backtest!")
+    
+    selected_strategy_names_bt = st.sidebar.multiselect("Escolha as estratégias para o backtest:", list(ESTRATEGIAS.keys()), default=["Frequência"])
+    
+    bt_mode = st.sidebar.radio("Modo de Execução:", ["Backtest Único", "Valor Esperado (Exato)", "Varredura de Parâmetros", "Otimização Automática"], key="bt_mode")
+    expected_mode = bt_mode == "Valor Esperado (Exato)"
+    optimizer_mode = bt_mode == "Otimização Automática"
+    sweep_mode = bt_mode in ("Varredura de Parâmetros", "Otimização Automática")  # usam faixas de parâmetros
+
+    def param_slider(label, min_value, max_value, value, key):
+        """No modo de varredura cada parâmetro vira uma faixa (mínimo, máximo)."""
+        if sweep_mode:
+            return st.slider(f"Faixa {label}", min_value, max_value, (value, min(value + 4, max_value)), key=f"{key}_range")
+        return st.slider(label, min_value, max_value, value, key=key)
+
+    params_bt = {}
+    with st.sidebar.expander("🔧 Refinar Parâmetros do Backtest"):
+        if "Frequência" in selected_strategy_names_bt:
+            params_bt['top_n_freq'] = param_slider("Top N Frequência:", 10, 25, 20, key="bt_freq")
+        if "Atraso" in selected_strategy_names_bt:
+            params_bt['top_n_atraso'] = param_slider("Top N Atraso:", 5, 25, 15, key="bt_atraso")
+        if "Alpha Envolve (Híbrido)" in selected_strategy_names_bt:
+            params_bt['alpha_freq_n'] = param_slider("Alpha Envolve (N Frequência):", 5, 20, 15, key="bt_alpha_freq")
+            params_bt['alpha_atraso_n'] = param_slider("Alpha Envolve (N Atraso):", 5, 20, 10, key="bt_alpha_atraso")
+
+    if sweep_mode:
+        with st.sidebar.expander("🧮 Opções da Otimização" if optimizer_mode else "🧮 Opções da Varredura", expanded=True):
+            if optimizer_mode:
+                opt_max_strategies = st.number_input("Máximo de estratégias combinadas:", min_value=1, max_value=max(1, len(selected_strategy_names_bt)), value=min(3, max(1, len(selected_strategy_names_bt))), key="bt_opt_max_strategies")
+                opt_max_candidates = st.number_input("Máximo de candidatos:", min_value=3, max_value=2000, value=200, key="bt_opt_max_candidates")
+                opt_min_draws = st.number_input("Concursos na 1ª etapa:", min_value=5, max_value=200, value=20, key="bt_opt_min_draws")
+                opt_eta = st.number_input("Fator de corte por etapa (mantém 1/N):", min_value=2, max_value=5, value=3, key="bt_opt_eta")
+            else:
+                sweep_subsets = st.checkbox("Testar todos os subconjuntos das estratégias escolhidas", value=False, key="bt_sweep_subsets")
+            sweep_step = st.number_input("Passo das faixas:", min_value=1, max_value=5, value=1, key="bt_sweep_step")
+            max_workers = os.cpu_count() or 1
+            sweep_workers = st.number_input("Processos em paralelo:", min_value=1, max_value=max_workers, value=max_workers, key="bt_sweep_workers")
+            sweep_seed = st.number_input("Semente aleatória:", min_value=0, value=42, key="bt_sweep_seed")
+
+    num_games_per_draw = st.sidebar.number_input("Jogos por Concurso:", min_value=1, max_value=100, value=10)
+    max_draws_for_test = len(df_bt) - 1
+    num_draws_to_test = st.sidebar.slider("Quantos concursos analisar:", 10, max_draws_for_test, min(100, max_draws_for_test))
+    run_label = "Executar Otimização" if optimizer_mode else "Executar Varredura" if sweep_mode else "Executar Backtest"
+    if expected_mode:
+        st.sidebar.caption("Sem sorteio de jogos: custo, prêmio e probabilidades de cada faixa são calculados de forma exata "
+                           "a partir do tamanho do pool e de quantas dezenas sorteadas caíram nele.")
+    run_backtest_btn = st.sidebar.button(run_label, key="run_bt")
+
+    def run_backtest(df, strategy_names, params, num_games_per_draw, num_draws_to_test):
+        if len(df) < num_draws_to_test + 1:
+            st.error(f"Não há dados suficientes. Necessário pelo menos {num_draws_to_test + 1} concursos.")
+            return {}, 0, 0
+        st.info(f"Executando backtest para os últimos {num_draws_to_test} concursos...")
+        progress_bar = st.progress(0.0)
+        small_pools = 0
+
+        def on_contest(step, total, pool):
+            nonlocal small_pools
+            small_pools += len(pool) < 15
+            progress_bar.progress(step / total)
+
+        hit_counts, total_cost, prize = backtest_history(df, strategy_names, params, num_games_per_draw, num_draws_to_test,
+                                                         pool_store=get_pool_store(), progress=on_contest)
+        progress_bar.empty()
+        if small_pools:
+            st.error(f"Em {small_pools} concurso(s) o pool teve menos de 15 dezenas e nenhum jogo foi gerado.")
+        results = {f"{points} Pontos": int(hit_counts[points]) for points in PREMIOS}
+        return results, total_cost, prize
+
+    if run_backtest_btn and selected_strategy_names_bt and optimizer_mode:
+        if len(df_bt) < num_draws_to_test + 1:
+            st.error(f"Não há dados suficientes. Necessário pelo menos {num_draws_to_test + 1} concursos.")
+        else:
+            param_ranges = {key: range(low, high + 1, int(sweep_step)) for key, (low, high) in params_bt.items()}
+            configs = build_optimizer_candidates(selected_strategy_names_bt, param_ranges, int(opt_max_strategies), int(opt_max_candidates), seed=int(sweep_seed))
+            windows = optimizer_windows(int(opt_min_draws), num_draws_to_test, int(opt_eta))
+            with st.spinner(f"Otimizando {len(configs)} candidatos em {len(windows)} etapa(s) ({' → '.join(map(str, windows))} concursos)..."):
+                leaderboard, ranked_configs = successive_halving(df_bt, configs, num_games_per_draw, int(opt_min_draws), num_draws_to_test,
+                                                                 eta=int(opt_eta), seed=int(sweep_seed), max_workers=int(sweep_workers))
+            st.session_state.bt_optimizer = {'leaderboard': leaderboard, 'configs': ranked_configs, 'windows': windows}
+
+    if optimizer_mode and 'bt_optimizer' in st.session_state:
+        st.header("🏁 Ranking da Otimização")
+        optimizer = st.session_state.bt_optimizer
+        leaderboard = optimizer['leaderboard']
+        finalists = leaderboard[leaderboard['Etapa'] == leaderboard['Etapa'].max()]
+        st.success(f"{len(leaderboard)} candidatos avaliados; {len(finalists)} chegaram à etapa final ({optimizer['windows'][-1]} concursos).")
+        st.dataframe(leaderboard, use_container_width=True, hide_index=True)
+        fig_opt = px.bar(finalists.head(20), x='Posição', y='Retorno por R$', hover_data=list(leaderboard.columns), title='Finalistas por Retorno por Real Gasto')
+        show_chart(fig_opt, use_container_width=True)
+
+        st.subheader("💾 Salvar Candidato como Estratégia")
+        col_pos, col_name = st.columns(2)
+        position = col_pos.selectbox("Posição no ranking:", list(leaderboard['Posição'].head(20)), key="bt_opt_position")
+        chosen = optimizer['configs'][position - 1]
+        default_name = f"Otimizada #{position}: {', '.join(chosen['strategies'])}"
+        strategy_name = col_name.text_input("Nome para Salvar:", value=default_name, key="bt_opt_save_name")
+        st.json(chosen)
+        if st.button("💾 Salvar Estratégia", key="bt_opt_save") and strategy_name:
+            save_strategy(strategy_name, chosen)
+            st.success(f"Estratégia '{strategy_name}' salva! Ela aparece em Gerar Jogos > Minhas Estratégias.")
+
+    if run_backtest_btn and selected_strategy_names_bt and sweep_mode and not optimizer_mode:
+        st.header("🧮 Resultados da Varredura de Parâmetros")
+        if len(df_bt) < num_draws_to_test + 1:
+            st.error(f"Não há dados suficientes. Necessário pelo menos {num_draws_to_test + 1} concursos.")
+        else:
+            if sweep_subsets:
+                strategy_subsets = [list(subset) for size in range(1, len(selected_strategy_names_bt) + 1) for subset in combinations(selected_strategy_names_bt, size)]
+            else:
+                strategy_subsets = [selected_strategy_names_bt]
+            param_ranges = {key: range(low, high + 1, int(sweep_step)) for key, (low, high) in params_bt.items()}
+            configs = build_sweep_grid(strategy_subsets, param_ranges)
+            with st.spinner(f"Executando {len(configs)} configurações em {int(sweep_workers)} processo(s)..."):
+                sweep_df = run_parameter_sweep(df_bt, configs, num_games_per_draw, num_draws_to_test, seed=int(sweep_seed), max_workers=int(sweep_workers))
+            sweep_df = sweep_df.sort_values(by='Lucro (R$)', ascending=False).reset_index(drop=True)
+            st.success(f"{len(sweep_df)} configurações avaliadas em {num_draws_to_test} concursos cada.")
+            st.dataframe(sweep_df, use_container_width=True)
+            st.download_button(
+                label="📥 Baixar Resultados da Varredura (CSV)",
+                data=sweep_df.to_csv(index=False).encode('utf-8'),
+                file_name='varredura_backtest.csv',
+                mime='text/csv',
+            )
+            top_df = sweep_df.head(20).copy()
+            top_df['Configuração'] = top_df.index.map(lambda i: f"#{i + 1}")
+            fig_sweep = px.bar(top_df, x='Configuração', y='Lucro (R$)', hover_data=list(sweep_df.columns), title='Top 20 Configurações por Resultado Líquido')
+            show_chart(fig_sweep, use_container_width=True)
+
+    if run_backtest_btn and selected_strategy_names_bt and expected_mode:
+        st.header("🎯 Backtest por Valor Esperado")
+        if len(df_bt) < num_draws_to_test + 1:
+            st.error(f"Não há dados suficientes. Necessário pelo menos {num_draws_to_test + 1} concursos.")
+        else:
+            expected_hits, cost, prize, details = expected_value_backtest(df_bt, selected_strategy_names_bt, params_bt, num_games_per_draw, num_draws_to_test,
+                                                                    pool_store=get_pool_store())
+            small_pools = int((details['jogos'] == 0).sum())
+            if small_pools:
+                st.error(f"Em {small_pools} concurso(s) o pool teve menos de 15 dezenas e nenhum jogo foi considerado.")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Custo Total (R$)", f"R$ {cost:.2f}")
+            col2.metric("Prêmio Esperado (R$)", f"R$ {prize:.2f}")
+            col3.metric("Resultado Líquido Esperado (R$)", f"R$ {prize - cost:.2f}", delta=f"R$ {prize - cost:.2f}")
+
+            st.subheader("Prêmios Esperados por Faixa")
+            tiers_df = pd.DataFrame({'Faixa de Acerto': [f"{points} Pontos" for points in PREMIOS],
+                                     'Vezes (esperado)': [expected_hits[points] for points in PREMIOS]})
+            fig_expected = px.bar(tiers_df, x='Faixa de Acerto', y='Vezes (esperado)', log_y=True, title='Quantidade Esperada de Prêmios por Faixa')
+            show_chart(fig_expected, use_container_width=True)
+
+            st.subheader("Detalhe por Concurso")
+            contests_df = pd.DataFrame({
+                'Concurso': df_bt['Concurso'].to_numpy()[details['posicao']],
+                'Dezenas no Pool': details['tamanho_pool'],
+                'Sorteadas no Pool': details['acertos_pool'],
+                'Jogos': details['jogos'],
+                **{f"P({points} pts)": details['probabilidades'][:, points] for points in PREMIOS},
+                'Prêmio Esperado (R$)': details['premio_esperado'],
+                'Lucro Esperado (R$)': details['premio_esperado'] - details['jogos'] * CUSTO_JOGO,
+            })
+            st.dataframe(contests_df, use_container_width=True, hide_index=True)
+
+    if run_backtest_btn and selected_strategy_names_bt and not sweep_mode and not expected_mode:
+        st.header("📈 Resultados do Backtest")
+        results, cost, prize = run_backtest(df_bt, selected_strategy_names_bt, params_bt, num_games_per_draw, num_draws_to_test)
+        if results:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Custo Total (R$)", f"R$ {cost:.2f}")
+            col2.metric("Prêmio Estimado (R$)", f"R$ {prize:.2f}")
+            col3.metric("Resultado Líquido (R$)", f"R$ {prize - cost:.2f}", delta=f"R$ {prize - cost:.2f}")
+            st.subheader("Distribuição de Acertos")
+            if not any(results.values()):
+                st.warning("Nenhuma premiação encontrada no período testado.")
+            else:
+                results_df = pd.DataFrame(list(results.items()), columns=['Faixa de Acerto', 'Vezes'])
+                fig_results = px.bar(results_df, x='Faixa de Acerto', y='Vezes', title='Quantidade de Prêmios por Faixa')
+                show_chart(fig_results, use_container_width=True)
\ No newline at end of file
@@ -2,49 +2,18 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-import time
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import (
-    fetch_data_from_api, estrategia_frequencia, estrategia_atraso,
-    estrategia_finais, estrategia_primos, estrategia_fibonacci,
-    estrategia_linhas_colunas, estrategia_alpha_envolve,
-    generate_games
-)
+from utils import fetch_data_from_api, ESTRATEGIAS, compare_strategies, get_pool_store, show_chart
 
 st.set_page_config(page_title="Comparador de Estratégias", page_icon="🔍", layout="wide")
 
 st.title("🔍 Comparador de Estratégias")
-st.markdown("Compare o desempenho de duas estratégias lado a lado no mesmo período.")
-
-# --- FUNÇÃO DE BACKTEST SIMPLIFICADA E ROBUSTA ---
-def run_simple_backtest(df, strategy_func, num_games_per_draw, num_draws_to_test):
-    if len(df) < num_draws_to_test + 1:
-        return None, None, None # Retorna None se não houver dados suficientes
-        
-    prizes = {11: 10, 12: 25, 13: 100, 14: 2000, 15: 2000000}
-    total_cost, total_prize = 0, 0
-    
-    for i in range(num_draws_to_test):
-        historical_df = df.iloc[:-(num_draws_to_test - i)]
-        target_draw = df.iloc[-(num_draws_to_test - i)]
-        target_numbers = set(target_draw[[f'Bola{j}' for j in range(1, 16)]].values)
-        
-        pool = strategy_func(historical_df.copy())
-        generated_games = generate_games(pool, num_games_per_draw)
-        
-        if not generated_games: # Se a estratégia não gerar jogos, pula
-            continue
-            
-        total_cost += len(generated_games) * 2.5
-        for game in generated_games:
-            hits = len(set(game) & target_numbers)
-            if hits >= 11:
-                total_prize += prizes.get(hits, 0)
-                
-    return total_cost, total_prize, total_prize - total_cost
+st.markdown("Compare o desempenho de várias estratégias lado a lado no mesmo período. Todas usam o mesmo "
+            "histórico e os mesmos números aleatórios, então a diferença entre elas reflete a estratégia, não a sorte do sorteio dos jogos.")
 
 # --- CONTROLES NA SIDEBAR ---
 st.sidebar.header("⚙️ Configurações da Comparação")
@@ -55,76 +24,86 @@ start_concurso = st.sidebar.number_input("Concurso Inicial", min_value=1, value=
 end_concurso = st.sidebar.number_input("Concurso Final", min_value=1, value=2400, key="comp_end")
 df_comp = fetch_data_from_api(start_concurso, end_concurso)
 num_games_per_draw = st.sidebar.number_input("Jogos por Concurso:", min_value=1, max_value=100, value=10)
-num_draws_to_test = st.sidebar.slider("Concursos para a Comparação:", 10, 200, 50)
-
-# Configurações da Estratégia A
-st.sidebar.markdown("---")
-st.sidebar.markdown("🔵 **Estratégia A**")
-strategy_map = {
-    "Frequência": lambda df: estrategia_frequencia(df, top_n=st.session_state.get('top_n_a', 20)),
-    "Atraso": lambda df: estrategia_atraso(df, top_n=st.session_state.get('top_n_a_atraso', 15)),
-    "Alpha Envolve": lambda df: estrategia_alpha_envolve(df, freq_n=st.session_state.get('alpha_freq_n_a', 15), atraso_n=st.session_state.get('alpha_atraso_n_a', 10))
-}
-selected_strategy_a = st.sidebar.selectbox("Escolha a Estratégia A:", list(strategy_map.keys()))
-if selected_strategy_a == "Frequência": st.session_state.top_n_a = st.sidebar.slider("Top N Frequência A:", 10, 25, 20)
-if selected_strategy_a == "Atraso": st.session_state.top_n_a_atraso = st.sidebar.slider("Top N Atraso A:", 5, 25, 15)
-if selected_strategy_a == "Alpha Envolve": st.session_state.alpha_freq_n_a = st.sidebar.slider("Alpha Freq N A:", 5, 20, 15); st.session_state.alpha_atraso_n_a = st.sidebar.slider("Alpha Atraso N A:", 5, 20, 10)
-strategy_func_a = strategy_map[selected_strategy_a]
-
-# Configurações da Estratégia B
-st.sidebar.markdown("---")
-st.sidebar.markdown("🔴 **Estratégia B**")
-selected_strategy_b = st.sidebar.selectbox("Escolha a Estratégia B:", list(strategy_map.keys()))
-if selected_strategy_b == "Frequência": st.session_state.top_n_b = st.sidebar.slider("Top N Frequência B:", 10, 25, 20)
-if selected_strategy_b == "Atraso": st.session_state.top_n_b_atraso = st.sidebar.slider("Top N Atraso B:", 5, 25, 15)
-if selected_strategy_b == "Alpha Envolve": st.session_state.alpha_freq_n_b = st.sidebar.slider("Alpha Freq N B:", 5, 20, 15); st.session_state.alpha_atraso_n_b = st.sidebar.slider("Alpha Atraso N B:", 5, 20, 10)
-strategy_func_b = strategy_map[selected_strategy_b]
+max_draws_for_test = max(len(df_comp) - 1, 11)
+num_draws_to_test = st.sidebar.slider("Concursos para a Comparação:", 10, max_draws_for_test, min(50, max_draws_for_test))
+comparison_seed = st.sidebar.number_input("Semente aleatória:", min_value=0, value=42, key="comp_seed")
+num_entries = st.sidebar.number_input("Quantidade de estratégias:", min_value=2, max_value=8, value=2, key="comp_num_entries")
+
+# Configurações de cada estratégia (letra -> estratégias combinadas e parâmetros)
+LETRAS = "ABCDEFGH"
+PADROES = [["Frequência"], ["Atraso"], ["Alpha Envolve (Híbrido)"], ["Finais (Último Dígito)"],
+           ["Números Primos"], ["Sequência de Fibonacci"], ["Linhas do Cartão"], ["Colunas do Cartão"]]
+
+def strategy_entry(index):
+    letter = LETRAS[index]
+    st.sidebar.markdown("---")
+    st.sidebar.markdown(f"**Estratégia {letter}**")
+    names = st.sidebar.multiselect(f"Estratégias combinadas em {letter}:", list(ESTRATEGIAS.keys()), default=PADROES[index], key=f"comp_names_{letter}")
+    params = {}
+    if "Frequência" in names:
+        params['top_n_freq'] = st.sidebar.slider(f"Top N Frequência {letter}:", 10, 25, 20, key=f"comp_freq_{letter}")
+    if "Atraso" in names:
+        params['top_n_atraso'] = st.sidebar.slider(f"Top N Atraso {letter}:", 5, 25, 15, key=f"comp_atraso_{letter}")
+    if "Finais (Último Dígito)" in names:
+        params['top_n_finais'] = st.sidebar.slider(f"Top N Finais {letter}:", 1, 9, 5, key=f"comp_finais_{letter}")
+    if "Alpha Envolve (Híbrido)" in names:
+        params['alpha_freq_n'] = st.sidebar.slider(f"Alpha Freq N {letter}:", 5, 20, 15, key=f"comp_alpha_freq_{letter}")
+        params['alpha_atraso_n'] = st.sidebar.slider(f"Alpha Atraso N {letter}:", 5, 20, 10, key=f"comp_alpha_atraso_{letter}")
+    return f"{letter}: {', '.join(names) or '(vazia)'}", names, params
+
+entries = [strategy_entry(i) for i in range(int(num_entries))]
 
 run_comparison_btn = st.sidebar.button("▶️ Executar Comparação")
 
 # --- EXIBIÇÃO DOS RESULTADOS ---
 if run_comparison_btn and not df_comp.empty:
     st.header("📈 Resultado da Comparação")
-    
-    with st.spinner("Executando backtest para a Estratégia A..."):
-        cost_a, prize_a, profit_a = run_simple_backtest(df_comp, strategy_func_a, num_games_per_draw, num_draws_to_test)
-    with st.spinner("Executando backtest para a Estratégia B..."):
-        cost_b, prize_b, profit_b = run_simple_backtest(df_comp, strategy_func_b, num_games_per_draw, num_draws_to_test)
-
-    # Verifica se ambos os backtests foram executados com sucesso
-    if None not in (cost_a, profit_a, cost_b, profit_b):
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader(f"🔵 Estratégia A: {selected_strategy_a}")
-            st.metric("Custo Total (R$)", f"R$ {cost_a:.2f}")
-            st.metric("Prêmio Estimado (R$)", f"R$ {prize_a:.2f}")
-            st.metric("Resultado Líquido (R$)", f"R$ {profit_a:.2f}", delta=f"R$ {profit_a:.2f}")
-
-        with col2:
-            st.subheader(f"🔴 Estratégia B: {selected_strategy_b}")
-            st.metric("Custo Total (R$)", f"R$ {cost_b:.2f}")
-            st.metric("Prêmio Estimado (R$)", f"R$ {prize_b:.2f}")
-            st.metric("Resultado Líquido (R$)", f"R$ {profit_b:.2f}", delta=f"R$ {profit_b:.2f}")
-        
-        # Gráfico comparativo
+
+    if len(df_comp) < num_draws_to_test + 1:
+        st.error(f"Não há dados suficientes. Necessário pelo menos {num_draws_to_test + 1} concursos.")
+    elif any(not names for _, names, _ in entries):
+        st.error("Escolha ao menos uma estratégia em cada posição.")
+    else:
+        with st.spinner(f"Executando backtest simultâneo de {len(entries)} estratégias..."):
+            hit_counts, costs, prizes, profits = compare_strategies(
+                df_comp, [(names, params) for _, names, params in entries], num_games_per_draw, num_draws_to_test,
+                rng=np.random.default_rng(int(comparison_seed)), pool_store=get_pool_store())
+
+        labels = [label for label, _, _ in entries]
+        num_contests = len(profits)
+        leader = int(np.argmax(prizes - costs))
+        # Diferença pareada contra a líder: com números aleatórios comuns, o erro padrão é bem menor
+        diffs = profits[:, [leader]] - profits
+        diff_se = diffs.std(axis=0, ddof=1) * np.sqrt(num_contests) if num_contests > 1 else np.zeros(len(entries))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = np.where(diff_se > 0, diffs.sum(axis=0) / diff_se, np.where(diffs.sum(axis=0) > 0, np.inf, 0.0))
+
         comparison_df = pd.DataFrame({
-            'Estratégia': [f'Estratégia A ({selected_strategy_a})', f'Estratégia B ({selected_strategy_b})'],
-            'Resultado Líquido (R$)': [profit_a, profit_b]
-        })
+            'Estratégia': labels,
+            'Custo Total (R$)': costs,
+            'Prêmio Estimado (R$)': prizes,
+            'Resultado Líquido (R$)': prizes - costs,
+            'Diferença para a Líder (R$)': (prizes - costs) - (prizes - costs)[leader],
+            'Erro Padrão da Diferença (R$)': diff_se,
+            **{f"{points} Pontos": hit_counts[:, points] for points in range(11, 16)},
+        }).sort_values('Resultado Líquido (R$)', ascending=False)
+        st.dataframe(comparison_df.round(2), use_container_width=True, hide_index=True)
+
+        # Gráfico comparativo
         fig = px.bar(comparison_df, x='Estratégia', y='Resultado Líquido (R$)', title='Comparação de Resultado Líquido', barmode='group')
         fig.update_layout(yaxis_tickprefix='R$ ')
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig, use_container_width=True)
 
         # Veredito final
         st.markdown("---")
-        if profit_a > profit_b:
-            st.success("🔵 **A Estratégia A teve um desempenho superior neste período.**")
-        elif profit_b > profit_a:
-            st.success("🔴 **A Estratégia B teve um desempenho superior neste período.**")
+        rivals = [i for i in range(len(entries)) if i != leader]
+        close_rivals = [labels[i] for i in rivals if z_scores[i] < 2]
+        if not close_rivals:
+            st.success(f"🏆 **{labels[leader]} teve o melhor desempenho, com diferença de pelo menos 2 erros padrão para todas as outras.**")
+        elif len(close_rivals) == len(rivals) and np.all(diffs == 0):
+            st.info("As estratégias tiveram exatamente o mesmo desempenho neste período.")
         else:
-            st.info("As estratégias tiveram um desempenho muito similar neste período.")
-    else:
-        st.error("Não foi possível executar um ou ambos os backtests. Verifique os parâmetros e tente novamente.")
+            st.info(f"**{labels[leader]}** ficou à frente, mas a diferença para {', '.join(close_rivals)} ainda está dentro do ruído "
+                    f"(menos de 2 erros padrão em {num_contests} concursos). Aumente o número de concursos para um veredito mais firme.")
 
 # FIM DO ARQUIVO pages/5_🔍_Comparador.py
\ No newline at end of file
@@ -1,88 +1,105 @@
-# pages/6_⚠️_Alertas.py
-
-import streamlit as st
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import fetch_latest_contest, fetch_all_results
-
-st.set_page_config(page_title="Alertas Inteligentes", page_icon="⚠️", layout="wide")
-
-st.title("⚠️ Alertas Inteligentes")
-st.markdown("Crie alertas que serão disparados quando uma condição for atendida nos resultados mais recentes.")
-
-# Inicializa alertas no session_state se não existirem
-if 'alerts' not in st.session_state:
-    st.session_state.alerts = []
-
-# --- FORMULÁRIO PARA CRIAR ALERTA ---
-with st.expander("➕ Criar Novo Alerta"):
-    alert_name = st.text_input("Nome do Alerta (ex: Meu número da sorte)")
-    alert_type = st.selectbox("Tipo de Condição", ["Número específico", "Atraso de um número"])
-    
-    if alert_type == "Número específico":
-        alert_number = st.number_input("Número para monitorar:", 1, 25)
-        condition = st.selectbox("Condição", ["Foi sorteado", "Não foi sorteado"])
-    else: # Atraso
-        alert_number = st.number_input("Número para monitorar o atraso:", 1, 25)
-        min_delay = st.number_input("Atraso mínimo em concursos:", 1, 100)
-
-    if st.button("Criar Alerta"):
-        new_alert = {
-            'name': alert_name,
-            'type': alert_type,
-            'number': alert_number,
-            'condition': condition if alert_type == "Número específico" else min_delay
-        }
-        st.session_state.alerts.append(new_alert)
-        st.success(f"Alerta '{alert_name}' criado!")
-        st.rerun()
-
-# --- VERIFICAÇÃO DE ALERTAS ---
-st.subheader("🔍 Verificação de Alertas")
-latest_result = fetch_latest_contest()
-
-if not latest_result.empty:
-    latest_draw_numbers = set([latest_result[f'Bola{i}'] for i in range(1, 16)])
-    df_all = fetch_all_results()
-    
-    if st.session_state.alerts:
-        for alert in st.session_state.alerts:
-            triggered = False
-            message = ""
-            
-            if alert['type'] == "Número específico":
-                was_drawn = alert['number'] in latest_draw_numbers
-                if (alert['condition'] == "Foi sorteado" and was_drawn) or \
-                   (alert['condition'] == "Não foi sorteado" and not was_drawn):
-                    triggered = True
-                    message = f"O número {alert['number']} {alert['condition'].lower()} no concurso {latest_result['Concurso']}."
-            else: # Atraso
-                # Lógica para calcular atraso
-                last_occurrence_idx = df_all[df_all.isin([alert['number']]).any(axis=1)].index
-                if not last_occurrence_idx.empty:
-                    delay = len(df_all) - last_occurrence_idx[-1] - 1
-                    if delay >= alert['condition']:
-                        triggered = True
-                        message = f"O número {alert['number']} está atrasado em {delay} concursos (meta: {alert['condition']})."
-                else: # Nunca foi sorteado
-                    if len(df_all) >= alert['condition']:
-                        triggered = True
-                        message = f"O número {alert['number']} nunca foi sorteado e está atrasado em {len(df_all)} concursos (meta: {alert['condition']})."
-
-            
-            if triggered:
-                st.error(f"🚨 **Alerta Disparado: {alert['name']}** - {message}")
-            else:
-                st.success(f"✅ **{alert['name']}** - Nenhuma condição atendida.")
-    else:
-        st.info("Nenhum alerta criado ainda.")
-else:
-    st.error("Não foi possível carregar o último resultado para verificar os alertas.")
-
-# --- LISTA DE ALERTAS SALVOS ---
-st.subheader("📋 Seus Alertas Ativos")
-if st.session_state.alerts:
-    st.dataframe(pd.DataFrame(st.session_state.alerts))
-else:
+# pages/6_⚠️_Alertas.py
+
+import streamlit as st
+import pandas as pd
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import (
+    get_alert_index, get_pool_store, session_owner, load_alert_registry, store_alert, delete_stored_alerts,
+    evaluate_alerts, mask_to_numbers
+)
+
+st.set_page_config(page_title="Alertas Inteligentes", page_icon="⚠️", layout="wide")
+
+st.title("⚠️ Alertas Inteligentes")
+st.markdown("Crie alertas que serão disparados quando uma condição for atendida nos resultados mais recentes. "
+            "Os alertas são só seus e ficam salvos: guarde o link desta página para reencontrá-los.")
+
+# Rótulo exibido -> tipo de condição do engine
+TIPOS = {
+    "Número sorteado": 'sorteada',
+    "Número não sorteado": 'nao_sorteada',
+    "Atraso de um número": 'atraso',
+    "Soma das dezenas": 'soma',
+    "Quantidade de pares": 'pares',
+    "Quantidade de ímpares": 'impares',
+    "Repetidas do concurso anterior": 'repetidas',
+}
+
+def describe(tipo, dezena, minimo, maximo):
+    if tipo == 'sorteada':
+        return f"Número {dezena} sorteado"
+    if tipo == 'nao_sorteada':
+        return f"Número {dezena} não sorteado"
+    if tipo == 'atraso':
+        return f"Número {dezena} com atraso ≥ {minimo}"
+    label = {'soma': "Soma", 'pares': "Pares", 'impares': "Ímpares", 'repetidas': "Repetidas"}[tipo]
+    return f"{label} entre {minimo} e {maximo}"
+
+owner = session_owner()
+registry = load_alert_registry(get_pool_store(), owner)
+
+# --- FORMULÁRIO PARA CRIAR ALERTA ---
+with st.expander("➕ Criar Novo Alerta"):
+    alert_name = st.text_input("Nome do Alerta (ex: Meu número da sorte)")
+    alert_type = TIPOS[st.selectbox("Tipo de Condição", list(TIPOS))]
+    alert_number, min_value, max_value = None, None, None
+
+    if alert_type in ('sorteada', 'nao_sorteada'):
+        alert_number = st.number_input("Número para monitorar:", 1, 25)
+    elif alert_type == 'atraso':
+        alert_number = st.number_input("Número para monitorar o atraso:", 1, 25)
+        min_value = st.number_input("Atraso mínimo em concursos:", 1, 100)
+    elif alert_type == 'soma':
+        min_value, max_value = st.slider("Faixa da soma:", 120, 270, (170, 220))
+    else:
+        min_value, max_value = st.slider("Faixa da quantidade:", 0, 15, (5, 9) if alert_type == 'repetidas' else (6, 9))
+
+    if st.button("Criar Alerta"):
+        if not alert_name.strip():
+            st.error("Dê um nome ao alerta.")
+        else:
+            store_alert(get_pool_store(), owner, alert_name, alert_type, alert_number, min_value, max_value)
+            st.success(f"Alerta '{alert_name}' criado!")
+            st.rerun()
+
+# --- VERIFICAÇÃO DE ALERTAS ---
+st.subheader("🔍 Verificação de Alertas")
+index = get_alert_index()
+
+if index['num_concursos']:
+    st.caption(f"Concurso {index['concurso']}: {', '.join(f'{num:02d}' for num in mask_to_numbers(index['mascara']))}")
+    if len(registry['coluna']):
+        # Todos os alertas avaliados de uma vez contra o índice do último concurso
+        triggered, values = evaluate_alerts(index, registry)
+        for position in triggered.nonzero()[0][:50]:
+            st.error(f"🚨 **Alerta Disparado: {registry['nome'][position]}** - "
+                     f"{describe(registry['tipo'][position], registry['dezena'][position], registry['minimo'][position], registry['maximo'][position])} "
+                     f"(valor no concurso {index['concurso']}: {values[position]}).")
+        if triggered.sum() > 50:
+            st.warning(f"Mais {int(triggered.sum()) - 50} alerta(s) disparado(s); veja a tabela abaixo.")
+        if not triggered.any():
+            st.success("✅ Nenhuma condição atendida no último concurso.")
+    else:
+        st.info("Nenhum alerta criado ainda.")
+else:
+    st.error("Não foi possível carregar o último resultado para verificar os alertas.")
+
+# --- LISTA DE ALERTAS SALVOS ---
+st.subheader("📋 Seus Alertas Ativos")
+if len(registry['coluna']):
+    alerts_df = pd.DataFrame({
+        'Nome': registry['nome'],
+        'Condição': [describe(*row) for row in zip(registry['tipo'], registry['dezena'], registry['minimo'], registry['maximo'])],
+    })
+    if index['num_concursos']:
+        alerts_df['Valor Atual'] = values
+        alerts_df['Disparado'] = triggered
+    st.dataframe(alerts_df, use_container_width=True)
+    to_remove = st.multiselect("Remover alertas:", alerts_df.index, format_func=lambda i: f"{i}: {registry['nome'][i]}")
+    if st.button("🗑️ Remover Selecionados") and to_remove:
+        delete_stored_alerts(get_pool_store(), owner, registry['id'][to_remove])
+        st.rerun()
+else:
     st.write("Você não possui alertas ativos.")
\ No newline at end of file
@@ -5,43 +5,93 @@ import pandas as pd
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import fetch_data_from_api
+from utils import fetch_data_from_api, get_draw_masks, numbers_to_mask, mask_to_numbers, score_hits, parse_tickets, verify_tickets, PREMIOS, CUSTO_JOGO
 
 st.set_page_config(page_title="Verificador de Jogos", page_icon="🎰", layout="wide")
 
 st.title("🎰 Verificador de Jogos")
-st.markdown("Insira os números do seu bilhete e compare com o resultado de qualquer concurso.")
+st.markdown("Insira os números do seu bilhete (ou envie um arquivo com vários bilhetes) e compare com o resultado de qualquer concurso.")
 
 df_all = fetch_data_from_api(1, 3000)
 
 if not df_all.empty:
-    st.subheader("Seu Jogo")
-    user_input = st.text_area("Digite seus 15 números (separados por vírgula, espaço ou quebra de linha):", "01, 02, 03, 04, 05, 06, 07, 08, 09, 10, 11, 12, 13, 14, 15")
-    st.subheader("Concurso para Comparação")
+    mode = st.radio("Modo de verificação:", ["Bilhete Único", "Arquivo de Bilhetes (Em Massa)"], horizontal=True)
     concursos_map = df_all.set_index('Concurso')['Data'].dt.strftime('%d/%m/%Y').to_dict()
-    selected_concurso = st.selectbox("Escolha o concurso:", sorted(concursos_map.keys(), reverse=True), format_func=lambda x: f"Concurso {x} ({concursos_map[x]})")
-
-    if st.button("Verificar Jogo"):
-        try:
-            user_numbers_str = user_input.replace('\n', ',').replace(' ', ',')
-            user_numbers = {int(num.strip()) for num in user_numbers_str.split(',') if num.strip().isdigit()}
-            if len(user_numbers) != 15:
-                st.error("Por favor, insira exatamente 15 números válidos.")
+
+    if mode == "Bilhete Único":
+        st.subheader("Seu Jogo")
+        user_input = st.text_area("Digite seus 15 números (separados por vírgula, espaço ou quebra de linha):", "01, 02, 03, 04, 05, 06, 07, 08, 09, 10, 11, 12, 13, 14, 15")
+        st.subheader("Concurso para Comparação")
+        selected_concurso = st.selectbox("Escolha o concurso:", sorted(concursos_map.keys(), reverse=True), format_func=lambda x: f"Concurso {x} ({concursos_map[x]})")
+
+        if st.button("Verificar Jogo"):
+            try:
+                user_numbers_str = user_input.replace('\n', ',').replace(' ', ',')
+                user_numbers = {int(num.strip()) for num in user_numbers_str.split(',') if num.strip().isdigit()}
+                if len(user_numbers) != 15 or not all(1 <= num <= 25 for num in user_numbers):
+                    st.error("Por favor, insira exatamente 15 números válidos (de 1 a 25).")
+                else:
+                    user_mask = numbers_to_mask(user_numbers)
+                    drawn_mask = int(get_draw_masks(df_all[df_all['Concurso'] == selected_concurso])[0])
+                    drawn_numbers = mask_to_numbers(drawn_mask)
+                    num_hits = int(score_hits([user_mask], [drawn_mask])[0, 0])
+                    hits = mask_to_numbers(user_mask & drawn_mask)
+                    st.markdown("---")
+                    st.subheader("📊 Resultado da Verificação")
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Seus Números", len(user_numbers))
+                    col2.metric("Números Sorteados", len(drawn_numbers))
+                    col3.metric("Seus Acertos", num_hits)
+                    st.markdown(f"**Você acertou {num_hits} ponto(s)!**")
+                    if num_hits > 10:
+                        st.success(f"Parabéns! Os números acertados foram: {', '.join(map(str, hits))}")
+                    else:
+                        st.info(f"Os números acertados foram: {', '.join(map(str, hits))}")
+            except Exception as e:
+                st.error(f"Ocorreu um erro ao processar seu jogo: {e}")
+    else:
+        st.subheader("Arquivo de Bilhetes")
+        st.markdown("Envie um arquivo CSV ou TXT com um bilhete por linha (15 dezenas separadas por vírgula, ponto e vírgula ou espaço). Linhas sem números, como cabeçalhos, são ignoradas.")
+        uploaded_file = st.file_uploader("Arquivo de bilhetes:", type=['csv', 'txt'])
+
+        st.subheader("Concursos para Comparação")
+        concursos = sorted(concursos_map.keys())
+        range_mode = st.radio("Conferir contra:", ["Um concurso", "Intervalo de concursos"], horizontal=True)
+        if range_mode == "Um concurso":
+            selected = st.selectbox("Escolha o concurso:", concursos[::-1], format_func=lambda x: f"Concurso {x} ({concursos_map[x]})", key="bulk_concurso")
+            start_concurso, end_concurso = selected, selected
+        else:
+            start_concurso, end_concurso = st.select_slider("Intervalo de concursos:", options=concursos, value=(concursos[max(0, len(concursos) - 100)], concursos[-1]))
+
+        if st.button("Verificar Bilhetes"):
+            if uploaded_file is None:
+                st.warning("Envie um arquivo de bilhetes para continuar.")
             else:
-                result_row = df_all[df_all['Concurso'] == selected_concurso].iloc[0]
-                drawn_numbers = set(result_row[[f'Bola{i}' for i in range(1, 16)]].values)
-                hits = sorted(list(user_numbers & drawn_numbers))
-                num_hits = len(hits)
-                st.markdown("---")
-                st.subheader("📊 Resultado da Verificação")
-                col1, col2, col3 = st.columns(3)
-                col1.metric("Seus Números", len(user_numbers))
-                col2.metric("Números Sorteados", len(drawn_numbers))
-                col3.metric("Seus Acertos", num_hits)
-                st.markdown(f"**Você acertou {num_hits} ponto(s)!**")
-                if num_hits > 10:
-                    st.success(f"Parabéns! Os números acertados foram: {', '.join(map(str, hits))}")
+                ticket_masks, line_numbers, invalid = parse_tickets(uploaded_file.getvalue())
+                if invalid:
+                    with st.expander(f"⚠️ {len(invalid)} linha(s) inválida(s) ignorada(s)"):
+                        st.dataframe(pd.DataFrame(invalid, columns=['Linha', 'Motivo']), use_container_width=True, hide_index=True)
+                if len(ticket_masks) == 0:
+                    st.error("Nenhum bilhete válido encontrado no arquivo.")
                 else:
-                    st.info(f"Os números acertados foram: {', '.join(map(str, hits))}")
-        except Exception as e:
-            st.error(f"Ocorreu um erro ao processar seu jogo: {e}")
\ No newline at end of file
+                    contest_df = df_all[(df_all['Concurso'] >= start_concurso) & (df_all['Concurso'] <= end_concurso)]
+                    with st.spinner(f"Conferindo {len(ticket_masks)} bilhete(s) em {len(contest_df)} concurso(s)..."):
+                        results, tier_totals = verify_tickets(ticket_masks, get_draw_masks(contest_df), line_numbers)
+
+                    st.markdown("---")
+                    st.subheader("📊 Resultado da Verificação")
+                    total_cost = len(ticket_masks) * len(contest_df) * CUSTO_JOGO
+                    total_prize = results['Prêmio (R$)'].sum()
+                    col1, col2, col3, col4 = st.columns(4)
+                    col1.metric("Bilhetes Válidos", len(ticket_masks))
+                    col2.metric("Concursos", len(contest_df))
+                    col3.metric("Prêmio Total", f"R$ {total_prize:,.2f}")
+                    col4.metric("Lucro/Prejuízo", f"R$ {total_prize - total_cost:,.2f}", delta=f"{total_prize - total_cost:,.2f}")
+
+                    st.markdown("**Total de Acertos por Faixa:**")
+                    tier_cols = st.columns(len(PREMIOS))
+                    for col, points in zip(tier_cols, PREMIOS):
+                        col.metric(f"{points} Pontos", int(tier_totals[points]))
+
+                    st.dataframe(results, use_container_width=True, hide_index=True)
+                    st.download_button("📥 Baixar Resultado (CSV)", results.to_csv(index=False).encode('utf-8'), file_name=f"verificacao_{start_concurso}_{end_concurso}.csv", mime='text/csv')
\ No newline at end of file
@@ -7,7 +7,11 @@ import plotly.express as px
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils import fetch_data_from_api
+from utils import (
+    fetch_data_from_api, backtest_history, hit_rates_from_histogram, simulate_prize_histogram,
+    summarize_profit_distribution, hypergeometric_hit_rates, exact_prize_distribution,
+    ESTRATEGIAS, PREMIOS, CUSTO_JOGO, get_pool_store, show_chart
+)
 
 st.set_page_config(page_title="Simulação Monte Carlo", page_icon="🎲", layout="wide")
 
@@ -20,41 +24,68 @@ start_concurso_mc = st.sidebar.number_input("Concurso Inicial", min_value=1, val
 end_concurso_mc = st.sidebar.number_input("Concurso Final", min_value=1, value=2300)
 df_mc = fetch_data_from_api(start_concurso_mc, end_concurso_mc)
 
+st.sidebar.subheader("Taxas de Acerto")
+rate_source = st.sidebar.radio("Origem das taxas:", ["Ilustrativas", "Teóricas (Hipergeométrica)", "Backtest da Estratégia"])
+if rate_source == "Backtest da Estratégia":
+    selected_strategies = st.sidebar.multiselect("Estratégias:", list(ESTRATEGIAS.keys()), default=["Frequência"])
+    params = {}
+    for strategy_name in selected_strategies:
+        for key, arg, default in ESTRATEGIAS[strategy_name][1]:
+            params[key] = st.sidebar.slider(f"{strategy_name} - {arg}:", 1, 25, default, key=f"mc_{key}")
+    bt_games_per_draw = st.sidebar.number_input("Jogos por Concurso no Backtest:", min_value=1, max_value=1000, value=50)
+    max_bt_draws = max(len(df_mc) - 1, 2)
+    bt_draws = st.sidebar.slider("Concursos Testados no Backtest:", 1, max_bt_draws, min(50, max_bt_draws))
+
 st.sidebar.subheader("Parâmetros da Simulação")
-num_simulations = st.sidebar.number_input("Número de Simulações (Cenários):", min_value=100, max_value=10000, value=1000, step=100)
+calc_mode = st.sidebar.radio("Modo de Cálculo:", ["Simulação (Monte Carlo)", "Exato (Analítico)"])
+if calc_mode == "Simulação (Monte Carlo)":
+    num_simulations = st.sidebar.number_input("Número de Simulações (Cenários):", min_value=100, max_value=1_000_000, value=1000, step=100)
 games_per_simulation = st.sidebar.number_input("Jogos por Simulação:", min_value=10, max_value=200, value=50)
-prizes = {11: 10, 12: 25, 13: 100, 14: 2000, 15: 2000000}
+seed = st.sidebar.number_input("Semente Aleatória:", min_value=0, value=42)
+prizes = PREMIOS
 
 if st.sidebar.button("Executar Simulação de Monte Carlo") and not df_mc.empty:
-    st.info("Executando simulação... Isso pode levar um momento.")
-    # Taxas de acerto ilustrativas. Em um modelo real, isso seria calculado a partir de um backtest prévio.
-    hit_rates = {11: 0.02, 12: 0.008, 13: 0.001, 14: 0.00005, 15: 0.0000001}
-    simulation_results = []
-    cost_per_simulation = games_per_simulation * 2.5
-    for _ in range(num_simulations):
-        total_prize = 0
-        for _ in range(games_per_simulation):
-            roll = np.random.random()
-            cumulative_prob = 0
-            prize_won = 0
-            for points, rate in hit_rates.items():
-                cumulative_prob += rate
-                if roll < cumulative_prob:
-                    prize_won = prizes[points]
-                    break
-            total_prize += prize_won
-        net_profit = total_prize - cost_per_simulation
-        simulation_results.append(net_profit)
-        
-    st.header("📈 Resultados da Simulação")
-    results_df = pd.DataFrame(simulation_results, columns=["Lucro/Prejuízo (R$)"])
+    rng = np.random.default_rng(int(seed))
+    if rate_source == "Backtest da Estratégia":
+        if not selected_strategies:
+            st.warning("Selecione ao menos uma estratégia para o backtest.")
+            st.stop()
+        with st.spinner("Calculando taxas de acerto com o backtest da estratégia..."):
+            hit_counts, _, _ = backtest_history(df_mc, selected_strategies, params, bt_games_per_draw, bt_draws, rng=rng,
+                                                pool_store=get_pool_store())
+        if hit_counts.sum() == 0:
+            st.warning("O backtest não gerou jogos (pool com menos de 15 dezenas). Ajuste os parâmetros.")
+            st.stop()
+        hit_rates = hit_rates_from_histogram(hit_counts)
+    elif rate_source == "Teóricas (Hipergeométrica)":
+        hit_rates = hypergeometric_hit_rates()
+    else:
+        # Taxas de acerto ilustrativas; use "Backtest da Estratégia" para taxas reais do período.
+        hit_rates = {11: 0.02, 12: 0.008, 13: 0.001, 14: 0.00005, 15: 0.0000001}
+
+    if calc_mode == "Exato (Analítico)":
+        # Distribuição exata por convolução: sem ruído de amostragem
+        prize_values, scenario_weights = exact_prize_distribution(hit_rates, int(games_per_simulation), prizes=prizes)
+    else:
+        with st.spinner("Executando simulação..."):
+            prize_values, scenario_weights = simulate_prize_histogram(hit_rates, int(num_simulations), int(games_per_simulation), rng=rng)
+    cost_per_simulation = games_per_simulation * CUSTO_JOGO
+    summary = summarize_profit_distribution(prize_values, scenario_weights, cost_per_simulation)
+
+    st.header("📈 Resultados da Simulação" if calc_mode == "Simulação (Monte Carlo)" else "📈 Distribuição Exata dos Resultados")
+    st.dataframe(pd.DataFrame({'Faixa': [f"{points} Pontos" for points in prizes], 'Taxa de Acerto': [f"{hit_rates[points]:.6%}" for points in prizes]}).set_index('Faixa').T, use_container_width=True)
     col1, col2, col3 = st.columns(3)
-    col1.metric("Pior Cenário (5º percentil)", f"R$ {results_df.quantile(0.05).iloc[0]:.2f}")
-    col2.metric("Cenário Mediano", f"R$ {results_df.median().iloc[0]:.2f}")
-    col3.metric("Melhor Cenário (95º percentil)", f"R$ {results_df.quantile(0.95).iloc[0]:.2f}")
-    prob_profit = (results_df > 0).sum() / len(results_df)
-    st.metric(f"Probabilidade de Lucro em {games_per_simulation} jogos", f"{float(prob_profit):.2%}")
+    col1.metric("Pior Cenário (5º percentil)", f"R$ {summary['p5']:.2f}")
+    col2.metric("Cenário Mediano", f"R$ {summary['mediana']:.2f}")
+    col3.metric("Melhor Cenário (95º percentil)", f"R$ {summary['p95']:.2f}")
+    col4, col5, col6 = st.columns(3)
+    col4.metric(f"Probabilidade de Lucro em {games_per_simulation} jogos", f"{summary['prob_lucro']:.2%}")
+    col5.metric("Valor Esperado", f"R$ {summary['media']:.2f}")
+    col6.metric("Desvio Padrão", f"R$ {summary['desvio']:.2f}")
     st.subheader("Distribuição de Resultados")
-    fig = px.histogram(results_df, nbins=50, title="Distribuição dos Lucros/Prejuízos Simulados")
+    y_label = "Cenários" if calc_mode == "Simulação (Monte Carlo)" else "Probabilidade"
+    bin_counts, bin_edges = np.histogram(prize_values - cost_per_simulation, bins=50, weights=scenario_weights)
+    hist_df = pd.DataFrame({"Lucro/Prejuízo (R$)": (bin_edges[:-1] + bin_edges[1:]) / 2, y_label: bin_counts})
+    fig = px.bar(hist_df, x="Lucro/Prejuízo (R$)", y=y_label, title="Distribuição dos Lucros/Prejuízos")
     fig.add_vline(x=0, line_dash="dash", line_color="red", annotation_text="Ponto de Equilíbrio")
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    show_chart(fig, use_container_width=True)
\ No newline at end of file
@@ -0,0 +1,55 @@
+# pages/9_⏱️_Diagnostico.py
+# Página de diagnóstico: só funciona com a instrumentação ligada (LOTOFACIL_TRACE=1 streamlit run app.py).
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import json
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import tracing_enabled, trace_records, stage_summary, export_traces, clear_traces, TRACE_CAPACITY
+
+st.set_page_config(page_title="Diagnóstico", page_icon="⏱️", layout="wide")
+
+if not tracing_enabled():
+    st.info("Página indisponível.")
+    st.stop()
+
+st.title("⏱️ Diagnóstico de Desempenho")
+st.markdown("Tempo por etapa (API, cache, filtro, pools, geração, pontuação e gráficos) das chamadas recentes deste processo, de todas as sessões.")
+
+records = trace_records()
+col1, col2, col3 = st.columns(3)
+col1.metric("Registros no buffer", f"{len(records)} / {TRACE_CAPACITY}")
+col2.metric("Etapas", len({record['etapa'] for record in records}))
+col3.metric("Tempo total medido", f"{sum(record['ms'] for record in records) / 1000:.2f} s")
+
+if not records:
+    st.write("Nenhuma medição ainda. Use as outras páginas e volte aqui.")
+else:
+    summary_df = pd.DataFrame(stage_summary(records)).sort_values('total_ms', ascending=False)
+    st.subheader("Percentis por Etapa (ms)")
+    st.dataframe(summary_df.round(3), use_container_width=True, hide_index=True)
+
+    percentiles_df = summary_df.melt(id_vars='etapa', value_vars=['p50_ms', 'p90_ms', 'p99_ms'], var_name='Percentil', value_name='ms')
+    fig = px.bar(percentiles_df, x='etapa', y='ms', color='Percentil', barmode='group', log_y=True, title='Percentis de Duração por Etapa')
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Chamadas Recentes")
+    recent_df = pd.DataFrame(records[-200:][::-1])
+    recent_df['inicio'] = pd.to_datetime(recent_df['inicio'], unit='s')
+    st.dataframe(recent_df, use_container_width=True, hide_index=True)
+
+col_export, col_clear = st.columns(2)
+with col_export:
+    st.download_button(
+        label="📥 Exportar Medições (JSON)",
+        data=json.dumps(export_traces(), ensure_ascii=False, indent=2).encode('utf-8'),
+        file_name='diagnostico_desempenho.json',
+        mime='application/json',
+    )
+with col_clear:
+    if st.button("🗑️ Limpar Medições"):
+        clear_traces()
+        st.rerun()
\ No newline at end of file
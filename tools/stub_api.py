@@ -0,0 +1,135 @@
+# tools/stub_api.py
+# Servidor HTTP local que imita os endpoints /api/lotofacil da API pública, com histórico sintético.
+# Uso:
+#   python tools/stub_api.py --contests 3500 --port 8765
+#   LOTOFACIL_API_URL=http://127.0.0.1:8765/api streamlit run app.py
+#   python tools/stub_api.py --contests 3500 --bench   (mede o preenchimento de lacunas do sync)
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.synthetic import synthetic_store, store_to_results  # mesmo gerador dos benchmarks
+
+
+class StubState:
+    """Estado compartilhado do servidor: histórico, concurso mais recente visível e falhas simuladas."""
+
+    def __init__(self, history, latest=None, latency=0.0, fail_rate=0.0):
+        self.history = history
+        self.latest = len(history) if latest is None else latest
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def publish(self, count=1):
+        """Torna visíveis mais `count` concursos (simula novos sorteios)."""
+        with self.lock:
+            self.latest = min(len(self.history), self.latest + count)
+
+
+def make_handler(state):
+    class LotofacilHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=None):
+            payload = json.dumps(body).encode('utf-8') if body is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            with state.lock:
+                state.requests += 1
+                latest = state.latest
+            if state.latency:
+                time.sleep(state.latency)
+            if state.fail_rate and random.random() < state.fail_rate:
+                return self._send(503, {'erro': 'falha simulada'})
+
+            parts = self.path.rstrip('/').split('/')
+            if parts[1:3] != ['api', 'lotofacil']:
+                return self._send(404, {'erro': 'rota não encontrada'})
+            if len(parts) == 3:
+                return self._send(200, state.history[:latest])
+            if len(parts) == 4 and parts[3] == 'latest':
+                return self._send(200, state.history[latest - 1])
+            if len(parts) == 4 and parts[3].isdigit() and 1 <= int(parts[3]) <= latest:
+                return self._send(200, state.history[int(parts[3]) - 1])
+            return self._send(404, {'erro': 'concurso não encontrado'})
+
+    return LotofacilHandler
+
+
+class StubServer(ThreadingHTTPServer):
+    # A fila padrão (5 conexões) é menor que as requisições simultâneas do sync: conexões
+    # recusadas só voltam após a retransmissão do SYN (~1 s), o que distorce as medições
+    request_queue_size = 128
+
+
+def start_stub_server(history, host='127.0.0.1', port=0, latency=0.0, fail_rate=0.0, latest=None):
+    """Inicia o servidor em uma thread de fundo; retorna (servidor, estado, URL base da API)."""
+    state = StubState(history, latest=latest, latency=latency, fail_rate=fail_rate)
+    server = StubServer((host, port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://{host}:{server.server_address[1]}/api"
+
+
+def run_benchmark(history, latency, fail_rate, workers, stored_fraction):
+    """Mede o sync preenchendo as lacunas de um histórico local parcial a partir do stub."""
+    from engine import data
+
+    server, state, data.API_URL = start_stub_server(history, latency=latency, fail_rate=fail_rate)
+    with tempfile.TemporaryDirectory() as data_dir:
+        keep = np.random.default_rng(1).random(len(history)) < stored_fraction
+        data.save_history_store(data.results_to_store([result for result, kept in zip(history, keep) if kept]), data_dir)
+        _, metrics = data.sync_history_store(data_dir, max_workers=workers, bulk_threshold=None)
+    server.shutdown()
+    print(json.dumps(dict(metrics, requisicoes_no_servidor=state.requests), indent=2, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API da Lotofácil.")
+    parser.add_argument('--contests', type=int, default=3500, help="Quantidade de concursos sintéticos.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Atraso por requisição, em segundos.")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Fração de respostas 503 simuladas.")
+    parser.add_argument('--latest', type=int, default=None, help="Último concurso visível no início (padrão: todos).")
+    parser.add_argument('--publish-every', type=float, default=0.0, help="Publica um concurso novo a cada N segundos (0 = nunca).")
+    parser.add_argument('--bench', action='store_true', help="Mede o preenchimento de lacunas e encerra.")
+    parser.add_argument('--workers', type=int, default=8, help="Requisições simultâneas no benchmark.")
+    parser.add_argument('--stored-fraction', type=float, default=0.0, help="Fração do histórico já presente localmente no benchmark.")
+    args = parser.parse_args()
+
+    history = store_to_results(synthetic_store(args.contests, args.seed))
+    if args.bench:
+        run_benchmark(history, args.latency, args.fail_rate, args.workers, args.stored_fraction)
+        return
+    server, state, base_url = start_stub_server(history, args.host, args.port, args.latency, args.fail_rate, args.latest)
+    print(f"API simulada em {base_url} ({state.latest} de {args.contests} concursos visíveis). Ctrl+C para encerrar.")
+    try:
+        while True:
+            time.sleep(args.publish_every or 3600)
+            if args.publish_every:
+                state.publish(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,215 +1,249 @@
-# INÍCIO DO ARQUIVO utils.py
-
-import streamlit as st
-import pandas as pd
-import numpy as np
-import requests
-from datetime import datetime
-import json
-import time
-from itertools import combinations
-
-# --- CONSTANTES ---
-NUM_DEZENAS = 25
-DEZENAS_POR_JOGO = 15
-API_URL = "https://loteriascaixa-api.herokuapp.com/api"
-
-# --- FUNÇÕES DE API E CARREGAMENTO DE DADOS (OTIMIZADAS) ---
-@st.cache_data(ttl=3600) # Cache por 1 hora
-def fetch_all_results():
-    """Busca TODOS os resultados da API de uma vez e os cacheia."""
-    try:
-        with st.spinner("Buscando todos os resultados da Lotofácil..."):
-            response = requests.get(f"{API_URL}/lotofacil")
-            response.raise_for_status()
-            data = response.json()
-            
-            all_results = []
-            for result in data:
-                sorted_dezenas = sorted(result['dezenas'])
-                row = {
-                    'Concurso': int(result['concurso']),
-                    'Data': pd.to_datetime(result['data'], format='%d/%m/%Y'),
-                }
-                for i in range(15):
-                    row[f'Bola{i+1}'] = int(sorted_dezenas[i])
-                all_results.append(row)
-        
-            if not all_results:
-                st.warning("Nenhum concurso encontrado.")
-                return pd.DataFrame()
-
-            df = pd.DataFrame(all_results)
-            df.sort_values(by='Concurso', inplace=True)
-            return df
-    except requests.exceptions.RequestException as e:
-        st.error(f"Erro ao conectar com a API: {e}")
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Ocorreu um erro ao processar os dados: {e}")
-        return pd.DataFrame()
-
-@st.cache_data(ttl=600) # Cache por 10 minutos
-def fetch_latest_contest():
-    """Busca APENAS o concurso mais recente de forma rápida."""
-    df_all = fetch_all_results()
-    if not df_all.empty:
-        return df_all.iloc[-1]
-    return pd.DataFrame()
-
-def fetch_data_from_api(start_concurso, end_concurso):
-    """Filtra o DataFrame completo para o intervalo desejado."""
-    df_all = fetch_all_results()
-    if df_all.empty:
-        return pd.DataFrame()
-    mask = (df_all['Concurso'] >= start_concurso) & (df_all['Concurso'] <= end_concurso)
-    return df_all.loc[mask].copy()
-
-# --- FUNÇÕES AUXILIARES ---
-def get_all_numbers(df):
-    """Retorna uma lista com todas as dezenas sorteadas em um DataFrame."""
-    if df.empty:
-        return []
-    all_numbers = []
-    for i in range(1, 16):
-        all_numbers.extend(df[f'Bola{i}'].tolist())
-    return sorted(all_numbers)
-
-# --- ESTRATÉGIAS / PROTOCOLOS DE ANÁLISE ---
-def estrategia_frequencia(df, top_n=25):
-    all_numbers = get_all_numbers(df)
-    if not all_numbers: return []
-    freq = pd.Series(all_numbers).value_counts().nlargest(top_n)
-    return sorted(freq.index.tolist())
-
-def estrategia_atraso(df, top_n=25):
-    if df.empty:
-        return list(range(1, NUM_DEZENAS + 1))
-    delays = {num: 0 for num in range(1, NUM_DEZENAS + 1)}
-    for index, row in df.iterrows():
-        current_draw = set(row[[f'Bola{i}' for i in range(1, 16)]].values)
-        for num in range(1, NUM_DEZENAS + 1):
-            if num not in current_draw:
-                delays[num] += 1
-            else:
-                delays[num] = 0
-    sorted_by_delay = sorted(delays.items(), key=lambda item: item[1], reverse=True)
-    return [num for num, delay in sorted_by_delay[:top_n]]
-
-def estrategia_finais(df, top_n_finais=5):
-    all_numbers = get_all_numbers(df)
-    if not all_numbers: return []
-    finais = [num % 10 for num in all_numbers]
-    freq_finais = pd.Series(finais).value_counts().nlargest(top_n_finais)
-    selected_finais = freq_finais.index.tolist()
-    pool = [num for num in range(1, NUM_DEZENAS + 1) if num % 10 in selected_finais]
-    return sorted(pool)
-
-def estrategia_primos(df):
-    primos = [2, 3, 5, 7, 11, 13, 17, 19, 23]
-    outros = estrategia_frequencia(df, top_n=25 - len(primos))
-    return sorted(list(set(primos + outros)))
-
-def estrategia_fibonacci(df):
-    fib = [1, 2, 3, 5, 8, 13, 21]
-    outros = estrategia_frequencia(df, top_n=25 - len(fib))
-    return sorted(list(set(fib + outros)))
-
-def estrategia_linhas_colunas(df, mode='row'):
-    grid = {i: [] for i in range(1, 6)}
-    for num in range(1, 26):
-        row = (num - 1) // 5 + 1
-        grid[row].append(num)
-    
-    all_numbers = get_all_numbers(df)
-    if not all_numbers: return []
-    freq_grid = {i: 0 for i in range(1, 6)}
-    for num in all_numbers:
-        row = (num - 1) // 5 + 1
-        freq_grid[row] += 1
-        
-    if mode == 'row':
-        most_frequent_row = max(freq_grid, key=freq_grid.get)
-        return grid[most_frequent_row]
-    else:
-        col_grid = {i: [] for i in range(1, 6)}
-        for num in range(1, 26):
-            col = (num - 1) % 5 + 1
-            col_grid[col].append(num)
-        freq_col = {i: 0 for i in range(1, 6)}
-        for num in all_numbers:
-            col = (num - 1) % 5 + 1
-            freq_col[col] += 1
-        most_frequent_col = max(freq_col, key=freq_col.get)
-        return col_grid[most_frequent_col]
-
-def estrategia_alpha_envolve(df, freq_n=15, atraso_n=10):
-    freq_nums = set(estrategia_frequencia(df, top_n=freq_n))
-    atraso_nums = set(estrategia_atraso(df, top_n=atraso_n))
-    final_pool = list(freq_nums.union(atraso_nums))
-    return sorted(list(set(final_pool)))[:25]
-
-# --- GERAÇÃO DE JOGOS ---
-def generate_games(pool, num_games):
-    if len(pool) < 15:
-        st.error(f"O pool de números tem apenas {len(pool)} dezenas. Não é possível gerar um jogo de 15.")
-        return []
-    games = set()
-    while len(games) < num_games:
-        game = tuple(sorted(np.random.choice(pool, 15, replace=False)))
-        games.add(game)
-    return [list(game) for game in games]
-
-# --- FUNÇÕES DE SALVAMENTO/CARREGAMENTO DE ESTRATÉGIAS ---
-def save_strategy(name, strategy_config):
-    if 'saved_strategies' not in st.session_state:
-        st.session_state.saved_strategies = {}
-    st.session_state.saved_strategies[name] = {
-        'config': strategy_config,
-        'saved_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-
-def load_strategies():
-    return st.session_state.get('saved_strategies', {})
-
-def delete_strategy(name):
-    if 'saved_strategies' in st.session_state and name in st.session_state.saved_strategies:
-        del st.session_state.saved_strategies[name]
-
-# --- FUNÇÕES DE ANÁLISE AVANÇADA ---
-def analyze_positional_frequencies(df):
-    pos_freq = {}
-    for i in range(1, 16):
-        freq = df[f'Bola{i}'].value_counts().sort_index()
-        pos_freq[f'Posição {i}'] = {num: freq.get(num, 0) for num in range(1, 26)}
-    return pd.DataFrame(pos_freq).fillna(0).astype(int)
-
-def analyze_sum_and_range(df):
-    df_analysis = df.copy()
-    df_analysis['Soma'] = df_analysis[[f'Bola{i}' for i in range(1, 16)]].sum(axis=1)
-    df_analysis['Faixa'] = df_analysis[[f'Bola{i}' for i in range(1, 16)]].max(axis=1) - df_analysis[[f'Bola{i}' for i in range(1, 16)]].min(axis=1)
-    return df_analysis[['Soma', 'Faixa']]
-
-def analyze_triplets(df, top_n=20):
-    """Analisa as trincas mais frequentes (CUSTOSO)."""
-    st.info("Analisando trincas... Isso pode levar um momento.")
-    triplet_counts = {}
-    for index, row in df.iterrows():
-        draw_numbers = sorted(row[[f'Bola{i}' for i in range(1, 16)]].values)
-        for triplet in combinations(draw_numbers, 3):
-            triplet_counts[triplet] = triplet_counts.get(triplet, 0) + 1
-    sorted_triplets = sorted(triplet_counts.items(), key=lambda item: item[1], reverse=True)
-    return sorted_triplets[:top_n]
-
-def analyze_quads(df, top_n=20):
-    """Analisa as quadras mais frequentes (MUITO CUSTOSO)."""
-    st.warning("Analisando quadras... Isso pode levar bastante tempo.")
-    quad_counts = {}
-    for index, row in df.iterrows():
-        draw_numbers = sorted(row[[f'Bola{i}' for i in range(1, 16)]].values)
-        for quad in combinations(draw_numbers, 4):
-            quad_counts[quad] = quad_counts.get(quad, 0) + 1
-    sorted_quads = sorted(quad_counts.items(), key=lambda item: item[1], reverse=True)
-    return sorted_quads[:top_n]
-
+# INÍCIO DO ARQUIVO utils.py
+# Camada Streamlit sobre o pacote `engine`: cache por processo, mensagens na tela e session_state.
+# Os cálculos ficam em `engine` (sem Streamlit); os nomes são reexportados aqui para as páginas.
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import requests
+import secrets
+
+from engine.core import (
+    NUM_DEZENAS, DEZENAS_POR_JOGO, PREMIOS, CUSTO_JOGO, BOLAS, BITS_DEZENAS, SCORE_CHUNK_CELLS,
+    popcount, numbers_to_mask, mask_to_numbers, draws_to_masks, masks_to_incidence, get_draws_array,
+    get_draw_masks, as_draw_masks, get_incidence_matrix, count_numbers, count_hits, masks_to_draws,
+    score_hits, score_histogram, score_tiers_per_game, prize_from_histogram,
+    rank_combinations, unrank_combinations, _concurso_bounds
+)
+from engine.data import (
+    API_URL, DATA_DIR, Historico, load_history, load_history_store, save_history_store, sync_history_store,
+    results_to_store, store_to_dataframe
+)
+from engine.stats import (
+    build_delay_table, delays_at, get_delays, get_all_numbers, GRUPOS_FREQUENCIA, summarize_counts,
+    build_frequency_index, window_counts, frequency_counts
+)
+from engine.strategies import (
+    ESTRATEGIAS, PRIMOS, FIBONACCI, build_pool, pool_frequencia, pool_atraso, pool_finais, pool_primos,
+    pool_fibonacci, pool_linhas_colunas, pool_alpha_envolve, estrategia_frequencia, estrategia_atraso,
+    estrategia_finais, estrategia_primos, estrategia_fibonacci, estrategia_linhas_colunas, estrategia_alpha_envolve
+)
+from engine.backtest import (
+    walk_forward_states, walk_forward, stored_walk_forward_pools, count_distinct_games, generate_game_masks, backtest_history,
+    common_random_games, compare_strategies, pool_hit_table, expected_value_backtest,
+    build_sweep_grid, run_parameter_sweep, build_optimizer_candidates, optimizer_windows, successive_halving
+)
+from engine.montecarlo import (
+    MC_CHUNK_SCENARIOS, hit_rates_from_histogram, simulate_prize_histogram, hypergeometric_hit_rates,
+    exact_prize_distribution, histogram_quantile, summarize_profit_distribution
+)
+from engine.tickets import parse_tickets, verify_tickets
+from engine.analysis import (
+    analyze_positional_frequencies, analyze_sum_and_range, analyze_number_trend, pair_cooccurrence, combination_counts,
+    MINER_MEMORY_CAP, mine_top_tuples, top_combinations, analyze_pairs, analyze_triplets, analyze_quads
+)
+from engine.alerts import (
+    build_alert_index, update_alert_index, advance_alert_index, alert_condition, alert_features, new_alert_registry,
+    evaluate_alerts, store_alert, delete_stored_alerts, load_alert_registry
+)
+from engine.poolstore import (
+    POOL_STORE_FILE, open_pool_store, strategy_params_key, read_pool_masks, write_pool_masks, save_strategy_config,
+    load_strategy_configs, delete_strategy_config
+)
+from engine.watcher import WATCH_INTERVAL, HistoryWatcher
+from engine.tracing import (
+    TRACE_CAPACITY, trace, traced, cache_miss, tracing_enabled, set_tracing, trace_records, clear_traces,
+    stage_summary, export_traces
+)
+
+# --- CARREGAMENTO DE DADOS ---
+def load_results():
+    """Carrega o histórico local (funciona offline) e o completa com os concursos novos da API."""
+    try:
+        with st.spinner("Sincronizando resultados da Lotofácil..."):
+            with trace('api') as span:
+                history, _, error = load_history()
+                span.rows = len(history)
+            if error is not None:
+                st.warning(f"API indisponível ({error}); usando o histórico local.")
+            if len(history) == 0:
+                st.warning("Nenhum concurso encontrado.")
+            return history.df
+    except requests.exceptions.RequestException as e:
+        st.error(f"Erro ao conectar com a API: {e}")
+        return pd.DataFrame()
+    except Exception as e:
+        st.error(f"Ocorreu um erro ao processar os dados: {e}")
+        return pd.DataFrame()
+
+# --- HISTÓRICO COMPARTILHADO (ÚNICO POR PROCESSO, SOMENTE LEITURA) ---
+@st.cache_resource
+def _history_watcher():
+    """Vigia do processo: serve o histórico local na hora e o revalida em segundo plano."""
+    cache_miss()
+    watcher = HistoryWatcher(DATA_DIR, WATCH_INTERVAL)
+    if len(watcher.history) == 0: # Primeira execução: não há histórico anterior para servir
+        watcher.history = Historico(load_results())
+    return watcher.start()
+
+def get_history():
+    """Histórico compartilhado do processo, sem esperar a verificação de concursos novos.
+
+    Quando o vigia incorpora um concurso, o objeto devolvido muda (e sua `versao`), o que
+    invalida os caches indexados por ela; uma carga vazia (falha) antecipa a próxima tentativa.
+    """
+    with trace('historico', cached=True) as span:
+        watcher = _history_watcher()
+        history = watcher.history
+        span.rows = len(history)
+    if len(history) == 0:
+        watcher.refresh()
+    return history
+
+def fetch_all_results():
+    """DataFrame completo do histórico compartilhado (visão rasa, sem cópia dos dados)."""
+    return get_history().df.iloc[:]
+
+def fetch_latest_contest():
+    """Busca APENAS o concurso mais recente de forma rápida."""
+    df_all = fetch_all_results()
+    if not df_all.empty:
+        return df_all.iloc[-1]
+    return pd.DataFrame()
+
+def fetch_data_from_api(start_concurso, end_concurso):
+    """Intervalo de concursos do histórico compartilhado, por busca binária e sem cópia."""
+    with trace('filtro') as span:
+        history = get_history()
+        if len(history) == 0:
+            return pd.DataFrame()
+        df = history.range(start_concurso, end_concurso)
+        span.rows = len(df)
+    return df
+
+# --- ATRASOS E FREQUÊNCIAS DO HISTÓRICO COMPLETO (CACHE POR PROCESSO) ---
+@st.cache_resource(max_entries=2)
+def _history_delay_table(_df_all, last_concurso, num_concursos):
+    """Tabela de atrasos do histórico completo, compartilhada entre sessões."""
+    cache_miss()
+    return build_delay_table(_df_all)
+
+def get_history_delay_table():
+    """Retorna (concursos, last_seen, delays) do histórico completo, calculados uma única vez."""
+    history = get_history()
+    if len(history) == 0:
+        empty = np.zeros((0, NUM_DEZENAS), dtype=np.int32)
+        return history.concursos, empty, empty
+    with trace('indice_atrasos', cached=True):
+        last_seen, delays = _history_delay_table(history.df, *history.versao)
+    return history.concursos, last_seen, delays
+
+def get_window_delays(start_concurso, end_concurso):
+    """Atrasos ao final do intervalo [start_concurso, end_concurso], consultados na tabela global."""
+    concursos, _, delays = get_history_delay_table()
+    lo, hi = _concurso_bounds(concursos, start_concurso, end_concurso)
+    return delays_at(delays, hi - 1, lo)
+
+@st.cache_resource(max_entries=2)
+def _history_frequency_index(_df_all, last_concurso, num_concursos):
+    """Índice de frequências do histórico completo, compartilhado entre sessões."""
+    cache_miss()
+    return build_frequency_index(_df_all)
+
+def get_history_frequency_index():
+    """Retorna (concursos, índice de frequências) do histórico completo, calculados uma única vez."""
+    history = get_history()
+    if len(history) == 0:
+        return history.concursos, build_frequency_index(history.df)
+    with trace('indice_frequencias', cached=True):
+        return history.concursos, _history_frequency_index(history.df, *history.versao)
+
+def get_window_counts(start_concurso, end_concurso):
+    """Contagens do intervalo [start_concurso, end_concurso], consultadas no índice global."""
+    concursos, index = get_history_frequency_index()
+    lo, hi = _concurso_bounds(concursos, start_concurso, end_concurso)
+    return window_counts(index, lo, hi)
+
+# --- ÍNDICE DE ALERTAS (INCREMENTAL, POR PROCESSO) ---
+@st.cache_resource
+def _alert_index_holder():
+    return {'indice': None}
+
+def get_alert_index():
+    """Índice de alertas do último concurso; concursos novos avançam o índice em O(25) cada."""
+    history = get_history()
+    holder = _alert_index_holder()
+    index = holder['indice']
+    if index is not None and index['concurso'] <= history.versao[0]:
+        index = advance_alert_index(index, history.concursos, history.mascaras)
+    # Histórico refeito ou lacunas antigas preenchidas: o índice é reconstruído do zero
+    if index is None or index['num_concursos'] != len(history):
+        index = build_alert_index(history.concursos, history.mascaras)
+    holder['indice'] = index
+    return index
+
+def session_owner():
+    """Dono dos alertas e das estratégias salvas desta sessão: um identificador aleatório guardado
+    na sessão e na URL (?dono=...), então cada usuário só vê os próprios e o link os recupera depois."""
+    owner = st.session_state.get('dono') or st.query_params.get('dono') or secrets.token_urlsafe(9)
+    st.session_state.dono = owner
+    if st.query_params.get('dono') != owner:
+        st.query_params['dono'] = owner
+    return owner
+
+# --- CACHE DE RESULTADOS DAS ANÁLISES (POR ANÁLISE, INTERVALO E PARÂMETROS) ---
+# Nome da análise -> função(df, **params) do engine
+ANALISES = {
+    'tendencia': analyze_number_trend,
+    'soma_faixa': analyze_sum_and_range,
+    'posicoes': analyze_positional_frequencies,
+    'pares': analyze_pairs,
+    'trincas': analyze_triplets,
+    'quadras': analyze_quads,
+    'kuplas': mine_top_tuples,
+}
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _cached_analysis(analysis, start_concurso, end_concurso, params, data_version):
+    """Resultado de uma análise; a versão dos dados invalida o cache quando chegam concursos novos."""
+    cache_miss()
+    return ANALISES[analysis](fetch_data_from_api(start_concurso, end_concurso), **dict(params))
+
+def get_analysis(analysis, start_concurso, end_concurso, **params):
+    """Executa (ou reaproveita do cache) a análise `analysis` no intervalo, com os parâmetros dados."""
+    data_version = get_history().versao
+    with trace(f'analise:{analysis}', cached=True):
+        return _cached_analysis(analysis, start_concurso, end_concurso, tuple(sorted(params.items())), data_version)
+
+# --- GRÁFICOS ---
+def show_chart(fig, **kwargs):
+    """`st.plotly_chart` com o tempo de serialização/envio do gráfico registrado na etapa 'grafico'."""
+    with trace('grafico'):
+        st.plotly_chart(fig, **kwargs)
+
+# --- GERAÇÃO DE JOGOS ---
+def generate_games(pool, num_games, rng=None):
+    if len(pool) < 15:
+        st.error(f"O pool de números tem apenas {len(pool)} dezenas. Não é possível gerar um jogo de 15.")
+        return []
+    max_games = count_distinct_games(pool)
+    if num_games > max_games:
+        st.warning(f"O pool permite apenas {max_games} jogo(s) distinto(s); todos foram gerados.")
+    return masks_to_draws(generate_game_masks(pool, num_games, rng=rng)).tolist()
+
+# --- FUNÇÕES DE SALVAMENTO/CARREGAMENTO DE ESTRATÉGIAS ---
+@st.cache_resource
+def get_pool_store():
+    """Armazenamento persistente de pools e estratégias salvas, junto do histórico local."""
+    return open_pool_store(DATA_DIR)
+
+def save_strategy(name, strategy_config):
+    save_strategy_config(get_pool_store(), session_owner(), name, strategy_config)
+
+def load_strategies():
+    return load_strategy_configs(get_pool_store(), session_owner())
+
+def delete_strategy(name):
+    delete_strategy_config(get_pool_store(), session_owner(), name)
+
 # FIM DO ARQUIVO utils.py
\ No newline at end of file